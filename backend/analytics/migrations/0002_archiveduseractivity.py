@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-18 10:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('issues', '0012_issue_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedUserActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(choices=[('LOGIN', 'User Login'), ('LOGOUT', 'User Logout'), ('ISSUE_CREATE', 'Issue Created'), ('ISSUE_UPDATE', 'Issue Updated'), ('ISSUE_VIEW', 'Issue Viewed'), ('COMMENT_ADD', 'Comment Added'), ('STATUS_CHANGE', 'Status Changed'), ('ASSIGNMENT', 'Issue Assigned')], max_length=20)),
+                ('timestamp', models.DateTimeField()),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('user_agent', models.TextField(blank=True, null=True)),
+                ('additional_data', models.JSONField(blank=True, null=True)),
+                ('related_issue', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='activities', to='issues.archivedissue')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived User Activities',
+                'ordering': ['-timestamp'],
+            },
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
-from issues.models import Issue
+from issues.models import Issue, ArchivedIssue
 
 
 class UserActivity(models.Model):
@@ -42,6 +42,36 @@ class UserActivity(models.Model):
         return f"{self.user.email} - {self.activity_type} - {self.timestamp}"
 
 
+class ArchivedUserActivity(models.Model):
+    """Activity about an archived issue, moved here by issues.archiving."""
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    activity_type = models.CharField(
+        max_length=20, choices=UserActivity.ACTIVITY_TYPES
+    )
+    timestamp = models.DateTimeField()
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+    user_agent = models.TextField(null=True, blank=True)
+    related_issue = models.ForeignKey(
+        ArchivedIssue,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="activities",
+    )
+    additional_data = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-timestamp"]
+        verbose_name_plural = "Archived User Activities"
+
+    def __str__(self):
+        return f"{self.user.email} - {self.activity_type} - {self.timestamp}"
+
+
 class IssueMetrics(models.Model):
     """Model to store aggregated metrics about issues."""
 
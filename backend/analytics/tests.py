@@ -1,3 +1,34 @@
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from issues.models import Issue
+
+User = get_user_model()
+
+
+class DashboardStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        student = User.objects.create_user(email="student@example.com")
+        cls.issues = [
+            Issue.objects.create(
+                title=f"Issue {i}", description="Counted", submitted_by=student
+            )
+            for i in range(3)
+        ]
+
+    def test_resolved_today_counts_current_resolutions(self):
+        for issue in self.issues:
+            issue.set_status("RESOLVED", self.admin)
+            issue.save()
+        reopened = self.issues[0]
+        reopened.set_status("IN_PROGRESS", self.admin)
+        reopened.save()
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/analytics/analytics/dashboard_stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["resolved_today"], 2)
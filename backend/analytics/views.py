@@ -14,7 +14,7 @@ from .serializers import (
     UserMetricsSerializer,
     DashboardStatSerializer,
 )
-from issues.models import Issue, IssueStatus
+from issues.models import Issue
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -92,12 +92,7 @@ class AnalyticsViewSet(viewsets.ViewSet):
         new_issues_today = Issue.objects.filter(created_at__date=today).count()
 
         # Resolved issues today
-        resolved_today = (
-            IssueStatus.objects.filter(status="RESOLVED", created_at__date=today)
-            .values("issue")
-            .distinct()
-            .count()
-        )
+        resolved_today = Issue.objects.filter(resolved_at__date=today).count()
 
         # Active users today
         active_users_today = (
@@ -186,50 +181,19 @@ class AnalyticsViewSet(viewsets.ViewSet):
             ).count()
             new_issues = Issue.objects.filter(created_at__date=current_date).count()
 
-            # Resolved issues on this date
-            resolved_issues = (
-                IssueStatus.objects.filter(
-                    status="RESOLVED", created_at__date=current_date
-                )
-                .values("issue")
-                .distinct()
-                .count()
-            )
-
-            # Average resolution time for issues resolved on this date
-            resolved_issues_ids = (
-                IssueStatus.objects.filter(
-                    status="RESOLVED", created_at__date=current_date
-                )
-                .values_list("issue_id", flat=True)
-                .distinct()
+            # Resolved issues and their average resolution time on this date
+            resolved = Issue.objects.filter(resolved_at__date=current_date).aggregate(
+                count=Count("id"),
+                avg_resolution=Avg(F("resolved_at") - F("created_at")),
             )
+            resolved_issues = resolved["count"]
 
             avg_resolution_time = None
-            if resolved_issues_ids:
-                # For each resolved issue, find the time between creation and resolution
-                resolution_times = []
-                for issue_id in resolved_issues_ids:
-                    try:
-                        issue = Issue.objects.get(id=issue_id)
-                        resolution_status = (
-                            IssueStatus.objects.filter(
-                                issue_id=issue_id, status="RESOLVED"
-                            )
-                            .order_by("created_at")
-                            .first()
-                        )
-
-                        if resolution_status:
-                            time_diff = resolution_status.created_at - issue.created_at
-                            resolution_times.append(
-                                time_diff.total_seconds() / 3600
-                            )  # Convert to hours
-                    except Issue.DoesNotExist:
-                        continue
-
-                if resolution_times:
-                    avg_resolution_time = sum(resolution_times) / len(resolution_times)
+            if resolved["avg_resolution"] is not None:
+                # Convert to hours
+                avg_resolution_time = (
+                    resolved["avg_resolution"].total_seconds() / 3600
+                )
 
             # Issues by category
             issues_by_category = (
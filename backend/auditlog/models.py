@@ -49,7 +49,7 @@ class AuditLog(models.Model):
         verbose_name = "Audit Log"
         verbose_name_plural = "Audit Logs"
         indexes = [
-            models.Index(fields=["timestamp"]),
+            models.Index(fields=["timestamp", "id"]),
             models.Index(fields=["action"]),
             models.Index(fields=["content_type", "object_id"]),
         ]
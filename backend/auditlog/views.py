@@ -6,12 +6,14 @@ from django_filters.rest_framework import DjangoFilterBackend
 from .models import AuditLog
 from .serializers import AuditLogSerializer
 from .filters import AuditLogFilter
+from utils.pagination import TimestampCursorPagination
 
 
 class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = AuditLog.objects.all()
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TimestampCursorPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -20,7 +22,7 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = AuditLogFilter
     search_fields = ["action", "object_repr", "content_type_name", "details"]
     ordering_fields = ["timestamp", "action"]
-    ordering = ["-timestamp"]
+    ordering = ["-timestamp", "-id"]
 
     def get_permissions(self):
         # Allow both admin and registrar users to access audit logs
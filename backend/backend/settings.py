@@ -79,6 +79,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "channels",
@@ -242,6 +243,38 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5 MB
+# Resumable attachment uploads: partial files live here until finalized
+ATTACHMENT_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, "partial_uploads")
+ATTACHMENT_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # 8 MB, largest accepted chunk
+ATTACHMENT_UPLOAD_MAX_SIZE = 200 * 1024 * 1024  # 200 MB
+# Background threads generating thumbnails/previews for image attachments
+ATTACHMENT_RENDITION_WORKERS = int(os.getenv("ATTACHMENT_RENDITION_WORKERS", "2"))
+# Attachment downloads: "" streams the file from Django (sendfile() under
+# gunicorn), "nginx" answers with X-Accel-Redirect to an internal location
+# serving MEDIA_ROOT at ATTACHMENT_SENDFILE_PREFIX, "xsendfile" answers with
+# X-Sendfile (Apache mod_xsendfile, lighttpd)
+ATTACHMENT_SENDFILE_BACKEND = os.getenv("ATTACHMENT_SENDFILE_BACKEND", "")
+ATTACHMENT_SENDFILE_PREFIX = os.getenv(
+    "ATTACHMENT_SENDFILE_PREFIX", "/protected-media/"
+)
+# Closed issues older than this move to the archive tables (archive_issues)
+ISSUE_ARCHIVE_AFTER_DAYS = int(os.getenv("ISSUE_ARCHIVE_AFTER_DAYS", "365"))
+# Hours an issue may wait on staff, per priority, before escalate_overdue_issues
+# escalates it
+ISSUE_SLA_HOURS = {
+    "URGENT": int(os.getenv("ISSUE_SLA_HOURS_URGENT", "24")),
+    "HIGH": int(os.getenv("ISSUE_SLA_HOURS_HIGH", "72")),
+    "MEDIUM": int(os.getenv("ISSUE_SLA_HOURS_MEDIUM", "168")),
+    "LOW": int(os.getenv("ISSUE_SLA_HOURS_LOW", "336")),
+}
+# Email of the registrar recorded as escalating overdue issues
+ISSUE_SLA_ESCALATED_BY = os.getenv("ISSUE_SLA_ESCALATED_BY", "")
+# Seconds during which further notifications of the same type about the same
+# issue are merged into the recipient's unread one; 0 disables coalescing
+NOTIFICATION_COALESCE_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_SECONDS", "900"))
+# Seconds an event's dedupe keys are kept, during which reporting it again does
+# not renotify anyone; prune_notification_dedupe_keys deletes older ones
+NOTIFICATION_DEDUPE_SECONDS = int(os.getenv("NOTIFICATION_DEDUPE_SECONDS", "86400"))
 # Frontend URL for WebSocket connections
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:5173")
 # Frontend API settings
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Issue, IssueStatus, Comment, Attachment
+from .models import Issue, IssueStatus, Comment, Attachment, FacultyWorkload
 from rest_framework.permissions import BasePermission
 from django import forms
 
@@ -86,3 +86,16 @@ class AttachmentAdmin(admin.ModelAdmin):
     list_display = ("issue", "filename", "uploaded_by", "created_at", "size")
     list_filter = ("created_at",)
     search_fields = ("issue__title", "filename", "uploaded_by__email")
+
+
+@admin.register(FacultyWorkload)
+class FacultyWorkloadAdmin(admin.ModelAdmin):
+    list_display = (
+        "faculty",
+        "open_issues",
+        "max_open_issues",
+        "accepts_auto_assignment",
+    )
+    list_filter = ("accepts_auto_assignment", "faculty__department")
+    search_fields = ("faculty__email", "faculty__first_name", "faculty__last_name")
+    readonly_fields = ("open_issues",)
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from analytics.models import ArchivedUserActivity, DashboardStat, UserActivity
+from notifications.models import Notification
+from realtime.models import ArchivedIssueActivity, IssueActivity
+from .models import (
+    ArchivedAttachment,
+    ArchivedComment,
+    ArchivedIssue,
+    ArchivedIssueStatus,
+    Attachment,
+    AttachmentUpload,
+    Comment,
+    Issue,
+    IssueStatus,
+)
+from .uploads import discard_upload
+
+
+def _move_rows(queryset, archive_model, delete=True):
+    """
+    Copy the rows of ``queryset`` into ``archive_model``, matching columns by
+    name, then delete them from the hot table.
+    """
+    fields = [
+        field.attname
+        for field in archive_model._meta.concrete_fields
+        if field.name != "archived_at"
+    ]
+    rows = queryset.order_by().values(*fields).iterator(chunk_size=2000)
+    archive_model.objects.bulk_create(
+        (archive_model(**row) for row in rows), batch_size=1000
+    )
+    if delete:
+        # A raw DELETE skips the per-row post_delete handlers: the counters,
+        # search vectors and blob references they maintain move with the rows,
+        # and the archived attachments release the blobs when deleted.
+        queryset._raw_delete(queryset.db)
+
+
+def _archive_batch(issue_ids):
+    issues = Issue.objects.filter(id__in=issue_ids)
+    _move_rows(issues, ArchivedIssue, delete=False)
+    _move_rows(IssueStatus.objects.filter(issue_id__in=issue_ids), ArchivedIssueStatus)
+    _move_rows(Comment.objects.filter(issue_id__in=issue_ids), ArchivedComment)
+    _move_rows(Attachment.objects.filter(issue_id__in=issue_ids), ArchivedAttachment)
+    _move_rows(
+        UserActivity.objects.filter(related_issue_id__in=issue_ids),
+        ArchivedUserActivity,
+    )
+    _move_rows(
+        IssueActivity.objects.filter(issue_id__in=issue_ids), ArchivedIssueActivity
+    )
+    # Notifications keep pointing at the issue, under its archived id
+    Notification.objects.filter(
+        content_type=ContentType.objects.get_for_model(Issue), object_id__in=issue_ids
+    ).update(content_type=ContentType.objects.get_for_model(ArchivedIssue))
+    for upload in AttachmentUpload.objects.filter(issue_id__in=issue_ids):
+        discard_upload(upload)
+    # Cascades to the typing indicators, which are not worth keeping
+    issues.delete()
+
+
+def archive_closed_issues(older_than_days, batch_size=500):
+    """
+    Move issues closed more than ``older_than_days`` ago, with their status
+    history, comments, attachments and user and timeline activity, into the
+    archive tables, and point their notifications at the archived issues.
+    ``closed_at`` is cleared when an issue reopens, so it dates the latest
+    closure. Each batch is one transaction. Returns the number of archived
+    issues.
+    """
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    archived = 0
+    while True:
+        with transaction.atomic():
+            issue_ids = list(
+                Issue.objects.select_for_update(skip_locked=True)
+                .filter(current_status="CLOSED", closed_at__lt=cutoff)
+                .order_by("closed_at", "id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not issue_ids:
+                break
+            _archive_batch(issue_ids)
+        archived += len(issue_ids)
+
+    if archived:
+        DashboardStat.objects.filter(key="dashboard_stats").delete()
+    return archived
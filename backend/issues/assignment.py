@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from analytics.models import DashboardStat, UserActivity
+from notifications.models import Notification
+from notifications.services import create_notifications
+from .models import Issue, IssueStatus
+from .sla import sla_deadline
+from .workload import adjust_workloads, workload_changes
+
+
+def bulk_assign_issues(issue_ids, faculty, assigned_by):
+    """
+    Assign many issues to one faculty member in a single transaction.
+    Returns the list of assigned issues.
+    """
+    return assign_issues({issue_id: faculty for issue_id in issue_ids}, assigned_by)
+
+
+def assign_issues(assignments, assigned_by):
+    """
+    Apply ``{issue_id: faculty}`` assignments in a single transaction.
+
+    Rows are written with queryset updates and bulk_create, so the per-row
+    signal handlers do not run; their side effects (status history, activity
+    log, workload counters, dashboard cache invalidation and notifications)
+    are performed here once per batch instead. Returns the list of assigned
+    issues.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        issues = list(
+            Issue.objects.select_for_update()
+            .filter(id__in=assignments)
+            .only(
+                "id",
+                "title",
+                "submitted_by_id",
+                "assigned_to_id",
+                "current_status",
+                "priority",
+                "assigned_at",
+                "resolved_at",
+                "closed_at",
+                "first_response_at",
+                "due_at",
+            )
+        )
+        if not issues:
+            return []
+
+        owners = []
+        by_faculty = defaultdict(list)
+        for issue in issues:
+            before = issue.workload_owner()
+            issue.assigned_to = assignments[issue.id]
+            issue.set_status("ASSIGNED", assigned_by, when=now)
+            issue.updated_at = now
+            owners.append((before, issue.assigned_to_id))
+            by_faculty[issue.assigned_to].append(issue)
+
+        # The same values for every issue of an assignee, so one UPDATE each
+        # instead of a per-row CASE; the timestamps mirror set_status()
+        for faculty, assigned in by_faculty.items():
+            Issue.objects.filter(id__in=[issue.id for issue in assigned]).update(
+                assigned_to=faculty,
+                current_status="ASSIGNED",
+                assigned_at=Coalesce(F("assigned_at"), Value(now)),
+                resolved_at=None,
+                closed_at=None,
+                first_response_at=Case(
+                    When(submitted_by=assigned_by, then=F("first_response_at")),
+                    default=Coalesce(F("first_response_at"), Value(now)),
+                ),
+                due_at=Coalesce(F("due_at"), sla_deadline(now)),
+                updated_at=now,
+                status_count=F("status_count") + 1,
+            )
+        adjust_workloads(workload_changes(owners))
+
+        IssueStatus.objects.bulk_create(
+            [
+                IssueStatus(
+                    issue=issue,
+                    status="ASSIGNED",
+                    notes=(
+                        f"Assigned to {issue.assigned_to.first_name} "
+                        f"{issue.assigned_to.last_name}"
+                    ),
+                    updated_by=assigned_by,
+                )
+                for issue in issues
+            ],
+            batch_size=500,
+        )
+
+        UserActivity.objects.bulk_create(
+            [
+                UserActivity(
+                    user=assigned_by,
+                    activity_type="ASSIGNMENT",
+                    related_issue=issue,
+                    additional_data={"assigned_to": issue.assigned_to_id},
+                )
+                for issue in issues
+            ],
+            batch_size=500,
+        )
+        DashboardStat.objects.filter(key="dashboard_stats").delete()
+
+        issue_content_type = ContentType.objects.get_for_model(Issue)
+        notifications = []
+        for faculty, assigned in by_faculty.items():
+            if len(assigned) == 1:
+                message = f"You have been assigned to issue: {assigned[0].title}"
+            else:
+                message = f"You have been assigned {len(assigned)} issues"
+            notifications.append(
+                Notification(
+                    user=faculty,
+                    content_type=issue_content_type,
+                    object_id=assigned[0].id if len(assigned) == 1 else None,
+                    message=message,
+                    notification_type="ISSUE_ASSIGNED",
+                )
+            )
+        notifications += [
+            Notification(
+                user_id=issue.submitted_by_id,
+                content_type=issue_content_type,
+                object_id=issue.id,
+                message=f"Status updated to Assigned for your issue: {issue.title}",
+                notification_type="STATUS_UPDATED",
+            )
+            for issue in issues
+            if issue.submitted_by_id != assigned_by.id
+        ]
+        create_notifications(notifications)
+
+    return issues
@@ -0,0 +1,124 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .assignment import assign_issues
+from .models import FacultyWorkload, Issue
+from .workload import ensure_faculty_workloads
+
+# Backlog order: most urgent first, then oldest first; issue_backlog_idx
+BACKLOG_ORDER = ("priority_rank", "created_at", "id")
+
+
+class WorkloadRouter:
+    """
+    Picks the least loaded faculty member for an issue: one in the student's
+    department who handles its category and has capacity, otherwise one from
+    any department.
+
+    Works on an in-memory copy of the workload counters, bumped as issues are
+    routed, so a whole batch is decided without further queries. The
+    counters are locked until the end of the transaction, so concurrent runs
+    route one after the other and cannot both fill the same capacity.
+    """
+
+    def __init__(self, workloads):
+        self.workloads = workloads
+        self._pools = {}
+
+    @classmethod
+    def load(cls):
+        ensure_faculty_workloads()
+        return cls(
+            list(
+                FacultyWorkload.objects.select_for_update(of=("self",))
+                .filter(
+                    faculty__role="FACULTY",
+                    faculty__is_active=True,
+                    accepts_auto_assignment=True,
+                )
+                .select_related("faculty")
+                .order_by("faculty_id")
+            )
+        )
+
+    def _pool(self, department, category):
+        key = (department, category)
+        if key not in self._pools:
+            handlers = [w for w in self.workloads if w.handles(category)]
+            self._pools[key] = (
+                [w for w in handlers if w.faculty.department.casefold() == department],
+                handlers,
+            )
+        return self._pools[key]
+
+    def route(self, issue):
+        """Return the faculty member to assign ``issue`` to, or None."""
+        department = issue.submitted_by.department.casefold()
+        for pool in self._pool(department, issue.category):
+            available = [w for w in pool if w.has_capacity()]
+            if available:
+                workload = min(available, key=lambda w: w.open_issues)
+                workload.open_issues += 1
+                return workload.faculty
+        return None
+
+
+def auto_assign_issues(assigned_by, issue_ids=None, batch_size=500, limit=None):
+    """
+    Route unassigned SUBMITTED issues (all of them, or those in ``issue_ids``)
+    to faculty members by department, category and open workload, most
+    urgent first. Each batch is locked, routed and written in one
+    transaction; rows locked by another run are skipped.
+
+    Returns ``(assigned, unrouted)``: the assigned issues and the ids of the
+    issues no faculty member was available for.
+    """
+    assigned, unrouted = [], []
+    after = None
+
+    while limit is None or len(assigned) < limit:
+        size = batch_size if limit is None else min(batch_size, limit - len(assigned))
+        with transaction.atomic():
+            queryset = Issue.objects.filter(
+                current_status="SUBMITTED", assigned_to__isnull=True
+            )
+            if issue_ids is not None:
+                queryset = queryset.filter(id__in=issue_ids)
+            if after is not None:
+                # Resume past the previous batch instead of excluding the
+                # issues left unrouted, which would grow the query each batch
+                rank, created_at, issue_id = after
+                queryset = queryset.filter(
+                    Q(priority_rank__gt=rank)
+                    | Q(priority_rank=rank, created_at__gt=created_at)
+                    | Q(priority_rank=rank, created_at=created_at, id__gt=issue_id)
+                )
+            batch = list(
+                queryset.select_for_update(skip_locked=True, of=("self",))
+                .select_related("submitted_by")
+                .only(
+                    "id",
+                    "category",
+                    "priority_rank",
+                    "created_at",
+                    "submitted_by__department",
+                )
+                .order_by(*BACKLOG_ORDER)[:size]
+            )
+            if not batch:
+                break
+            last = batch[-1]
+            after = (last.priority_rank, last.created_at, last.id)
+
+            router = WorkloadRouter.load()
+            assignments = {}
+            for issue in batch:
+                faculty = router.route(issue)
+                if faculty is None:
+                    unrouted.append(issue.id)
+                else:
+                    assignments[issue.id] = faculty
+            if assignments:
+                assigned += assign_issues(assignments, assigned_by)
+
+    return assigned, unrouted
@@ -0,0 +1,106 @@
+import hashlib
+
+from django.db.models import Count, Max, OuterRef, Subquery, Sum
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import Comment, IssueStatus, Attachment
+
+# Child collections embedded by IssueSerializer, the columns that change
+# whenever one of their rows is written (or, for attachments, when the shared
+# content's renditions land) and the Issue counter that changes whenever one
+# is inserted or deleted.
+CHILD_TIMESTAMPS = (
+    (Comment, ("updated_at",), "comment_count"),
+    (IssueStatus, ("created_at",), "status_count"),
+    (Attachment, ("created_at", "blob__rendered_at"), "attachment_count"),
+)
+
+
+def _make_validators(parts, timestamps):
+    timestamps = [ts for ts in timestamps if ts is not None]
+    last_modified = max(timestamps) if timestamps else None
+    raw = "|".join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest()), last_modified
+
+
+def issue_detail_validators(queryset, pk):
+    """
+    Return ``(etag, last_modified)`` for one issue and its embedded children,
+    computed in a single query, or None if the issue is not in ``queryset``.
+    """
+    annotations = {}
+    for model, fields, _ in CHILD_TIMESTAMPS:
+        children = model.objects.filter(issue=OuterRef("pk")).order_by().values("issue")
+        for field in fields:
+            annotations[f"{model._meta.model_name}_{field}_latest"] = Subquery(
+                children.annotate(latest=Max(field)).values("latest")
+            )
+    counters = [counter for _, _, counter in CHILD_TIMESTAMPS]
+
+    try:
+        row = (
+            queryset.filter(pk=pk)
+            .prefetch_related(None)
+            .order_by()
+            .annotate(**annotations)
+            .values("id", "updated_at", *counters, *annotations)
+            .first()
+        )
+    except (TypeError, ValueError):
+        # Malformed pk; let the regular lookup produce the 404
+        return None
+    if row is None:
+        return None
+
+    timestamps = [row["updated_at"]] + [row[name] for name in annotations]
+    return _make_validators(row.values(), timestamps)
+
+
+def issue_list_validators(queryset, user):
+    """
+    Return ``(etag, None)`` for a list of issues rendered with their embedded
+    children, using one aggregate query per table.
+
+    Lists get no Last-Modified: an issue leaving the list (deleted, archived
+    or reassigned) does not raise any timestamp left in it, so a client
+    revalidating with If-Modified-Since alone would keep the stale list. The
+    ETag covers membership through the count and sum of the ids.
+    """
+    issue_ids = queryset.order_by().values("id")
+    stats = queryset.order_by().aggregate(
+        count=Count("id"),
+        id_sum=Sum("id"),
+        latest=Max("updated_at"),
+        **{counter: Sum(counter) for _, _, counter in CHILD_TIMESTAMPS},
+    )
+    parts = list(stats.values()) + [user.pk]
+
+    for model, fields, _ in CHILD_TIMESTAMPS:
+        latest = model.objects.filter(issue__in=issue_ids).aggregate(
+            *[Max(field) for field in fields]
+        )
+        parts += latest.values()
+
+    return _make_validators(parts, [])
+
+
+def conditional_response(request, validators, render):
+    """
+    Answer 304 Not Modified when the client's ETag/Last-Modified is current,
+    otherwise call ``render()`` and attach the validators to its response.
+    """
+    etag, last_modified = validators
+    last_modified_ts = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified_ts
+    )
+    if response is None:
+        response = render()
+
+    response["ETag"] = etag
+    if last_modified_ts is not None:
+        response["Last-Modified"] = http_date(last_modified_ts)
+    patch_vary_headers(response, ("Authorization",))
+    return response
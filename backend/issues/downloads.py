@@ -0,0 +1,147 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import content_disposition_header, http_date, quote_etag
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _RangeFile:
+    """
+    Read-only view of the next ``length`` bytes of an open file. Keeps
+    fileno() and tell() so gunicorn can still sendfile() the range.
+    """
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def tell(self):
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Return the inclusive ``(start, end)`` of a single byte range, or None to
+    serve the whole file (no, malformed or multi-range header). Raises
+    ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+
+    if first:
+        start = int(first)
+        end = size - 1 if not last else min(int(last), size - 1)
+        if last and int(last) < start:
+            return None
+    else:
+        suffix = int(last)
+        if suffix == 0:
+            raise ValueError("Empty suffix range")
+        start, end = max(size - suffix, 0), size - 1
+
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    return start, end
+
+
+def _offload_response(file, filename):
+    content_type = mimetypes.guess_type(filename)[0]
+    response = HttpResponse(content_type=content_type or "application/octet-stream")
+    if settings.ATTACHMENT_SENDFILE_BACKEND == "nginx":
+        response["X-Accel-Redirect"] = settings.ATTACHMENT_SENDFILE_PREFIX + quote(
+            file.name
+        )
+    else:
+        response["X-Sendfile"] = file.path
+    return response
+
+
+def attachment_response(request, attachment, rendition=None):
+    """
+    Serve an attachment, or one of its image renditions, that the caller has
+    already been authorized to read.
+
+    Handles If-None-Match/If-Modified-Since and single byte ranges (with
+    If-Range). With ATTACHMENT_SENDFILE_BACKEND set, the proxy transfers the
+    bytes (and handles ranges itself); otherwise the file object is handed to
+    the WSGI server, which can sendfile() it without copying through Python.
+    """
+    if rendition:
+        file = getattr(attachment.blob, rendition)
+        filename = f"{os.path.splitext(attachment.filename)[0]}_{rendition}.webp"
+        etag = quote_etag(f"{attachment.sha256}-{rendition}")
+    else:
+        file = attachment.file
+        filename = attachment.filename
+        etag = quote_etag(attachment.sha256 or f"{attachment.id}-{attachment.size}")
+    last_modified = int(attachment.created_at.timestamp())
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        if settings.ATTACHMENT_SENDFILE_BACKEND:
+            response = _offload_response(file, filename)
+        else:
+            response = _file_response(request, file, filename, etag)
+
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified)
+    response["Accept-Ranges"] = "bytes"
+    if response.status_code < 300:
+        # Renditions are meant for <img> tags, originals for saving
+        response["Content-Disposition"] = content_disposition_header(
+            not rendition, filename
+        )
+    patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+    return response
+
+
+def _file_response(request, file, filename, etag):
+    file = file.open("rb")
+    size = file.size
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if range_header and (not if_range or if_range == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if byte_range is None:
+        return FileResponse(file, filename=filename)
+
+    start, end = byte_range
+    file.seek(start)
+    response = FileResponse(
+        _RangeFile(file, end - start + 1), status=206, filename=filename
+    )
+    response["Content-Length"] = end - start + 1
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return response
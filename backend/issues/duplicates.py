@@ -0,0 +1,245 @@
+import hashlib
+import re
+import zlib
+from array import array
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count
+
+from .models import IssueSignature, IssueSignatureBand
+
+SHINGLE_SIZE = 4  # Characters per shingle
+MAX_TEXT_LENGTH = 2000  # Characters of title and description fingerprinted
+BANDS = 20
+ROWS_PER_BAND = 3
+NUM_HASHES = BANDS * ROWS_PER_BAND
+# Estimated Jaccard similarity of the shingle sets above which two issues are
+# reported as duplicates. With 20 bands of 3 rows, pairs at 0.4 share a band
+# 73% of the time, pairs at 0.5 93% and pairs at 0.6 99%.
+DUPLICATE_THRESHOLD = 0.4
+MAX_CANDIDATES = 200  # Candidates verified per lookup, most shared bands first
+# Band buckets larger than this are skipped when clustering, as verifying one
+# compares every pair of its members. Such buckets come from boilerplate text
+# shared by many issues; true duplicates still meet in their other bands.
+MAX_BUCKET_SIZE = 50
+
+WORD_RE = re.compile(r"\w+")
+_MIX = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+_MASK32 = (1 << 32) - 1
+
+
+def _shingles(title, description):
+    text = f"{title} {description}"[:MAX_TEXT_LENGTH].lower()
+    text = " ".join(WORD_RE.findall(text))
+    if len(text) <= SHINGLE_SIZE:
+        shingles = {text} if text else set()
+    else:
+        shingles = {
+            text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)
+        }
+    # crc32 is stable across processes; the multiply spreads it over 64 bits
+    return {(zlib.crc32(shingle.encode()) * _MIX) & _MASK64 for shingle in shingles}
+
+
+def text_signature(title, description):
+    """
+    MinHash signature of the character shingles of an issue's text, or None
+    when there is no text.
+
+    Uses one-permutation hashing: each shingle hash lands in one of
+    NUM_HASHES bins and each bin keeps its minimum, so the cost is one pass
+    over the shingles rather than one per hash function. Empty bins borrow
+    the next filled bin's value, offset by the distance, so that short texts
+    still compare correctly.
+    """
+    bins = [None] * NUM_HASHES
+    for value in _shingles(title, description):
+        index, rank = value % NUM_HASHES, value // NUM_HASHES
+        if bins[index] is None or rank < bins[index]:
+            bins[index] = rank
+    if all(rank is None for rank in bins):
+        return None
+
+    signature = array("I", bytes(4 * NUM_HASHES))
+    for index in range(NUM_HASHES):
+        distance = 0
+        while bins[(index + distance) % NUM_HASHES] is None:
+            distance += 1
+        rank = bins[(index + distance) % NUM_HASHES]
+        signature[index] = (rank + distance * _MIX) & _MASK32
+    return signature
+
+
+def band_keys(signature):
+    """One 64-bit key per LSH band of a signature."""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(
+            bytes([band]) + rows.tobytes(), digest_size=8
+        ).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def similarity(signature, other):
+    """Estimated Jaccard similarity of the texts behind two signatures."""
+    return sum(x == y for x, y in zip(signature, other)) / NUM_HASHES
+
+
+def _load(minhash):
+    signature = array("I")
+    signature.frombytes(minhash)
+    return signature
+
+
+def index_issues(issues, check_unchanged=False):
+    """
+    Store the signatures and band keys of ``issues``. With
+    ``check_unchanged``, an issue whose stored signature already matches its
+    text is left alone.
+    """
+    signatures = {
+        issue.id: text_signature(issue.title, issue.description) for issue in issues
+    }
+    if check_unchanged:
+        stored = dict(
+            IssueSignature.objects.filter(issue_id__in=signatures).values_list(
+                "issue_id", "minhash"
+            )
+        )
+        changed = {}
+        for issue_id, signature in signatures.items():
+            minhash = signature.tobytes() if signature is not None else None
+            if minhash != (bytes(stored[issue_id]) if issue_id in stored else None):
+                changed[issue_id] = signature
+        signatures = changed
+        if not signatures:
+            return
+
+    with transaction.atomic():
+        IssueSignatureBand.objects.filter(issue_id__in=signatures).delete()
+        IssueSignature.objects.filter(issue_id__in=signatures).delete()
+        indexed = {
+            issue_id: signature
+            for issue_id, signature in signatures.items()
+            if signature is not None
+        }
+        IssueSignature.objects.bulk_create(
+            [
+                IssueSignature(issue_id=issue_id, minhash=signature.tobytes())
+                for issue_id, signature in indexed.items()
+            ],
+            batch_size=1000,
+        )
+        IssueSignatureBand.objects.bulk_create(
+            [
+                IssueSignatureBand(issue_id=issue_id, key=key)
+                for issue_id, signature in indexed.items()
+                for key in band_keys(signature)
+            ],
+            batch_size=2000,
+        )
+
+
+def find_duplicates(queryset, title, description, limit=10, exclude_id=None):
+    """
+    Issues in ``queryset`` whose text is a near duplicate of ``title`` and
+    ``description``, most similar first, each annotated with ``similarity``.
+
+    Candidates come from one indexed lookup of the text's band keys, and are
+    verified against their stored signatures; the table is never scanned.
+    """
+    signature = text_signature(title, description)
+    if signature is None:
+        return []
+
+    bands = IssueSignatureBand.objects.filter(
+        key__in=band_keys(signature), issue__in=queryset.values("id")
+    )
+    if exclude_id is not None:
+        bands = bands.exclude(issue_id=exclude_id)
+    candidates = (
+        bands.values("issue_id")
+        .annotate(shared=Count("id"))
+        .order_by("-shared")
+        .values_list("issue_id", flat=True)[:MAX_CANDIDATES]
+    )
+    scores = {
+        issue_id: similarity(signature, _load(minhash))
+        for issue_id, minhash in IssueSignature.objects.filter(
+            issue_id__in=list(candidates)
+        ).values_list("issue_id", "minhash")
+    }
+    matches = [
+        issue_id for issue_id, score in scores.items() if score >= DUPLICATE_THRESHOLD
+    ]
+    best = sorted(matches, key=lambda issue_id: -scores[issue_id])[:limit]
+
+    issues = queryset.in_bulk(best)
+    for issue_id in best:
+        issues[issue_id].similarity = scores[issue_id]
+    return [issues[issue_id] for issue_id in best]
+
+
+def duplicate_clusters(queryset, min_size=2):
+    """
+    Group the issues of ``queryset`` into clusters of near duplicates.
+    Returns lists of issue ids, largest cluster first.
+
+    Only buckets of 2 to MAX_BUCKET_SIZE issues sharing a band key are
+    verified, so the pairwise comparisons stay bounded however many issues
+    share some boilerplate.
+    """
+    bands = IssueSignatureBand.objects.filter(issue__in=queryset.values("id"))
+    shared_keys = (
+        bands.order_by()
+        .values("key")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1, count__lte=MAX_BUCKET_SIZE)
+        .values("key")
+    )
+    buckets = defaultdict(list)
+    for key, issue_id in bands.filter(key__in=shared_keys).values_list(
+        "key", "issue_id"
+    ):
+        buckets[key].append(issue_id)
+    if not buckets:
+        return []
+
+    members = {issue_id for bucket in buckets.values() for issue_id in bucket}
+    signatures = {
+        issue_id: _load(minhash)
+        for issue_id, minhash in IssueSignature.objects.filter(
+            issue_id__in=members
+        ).values_list("issue_id", "minhash")
+    }
+
+    parent = {issue_id: issue_id for issue_id in members}
+
+    def find(issue_id):
+        while parent[issue_id] != issue_id:
+            parent[issue_id] = parent[parent[issue_id]]
+            issue_id = parent[issue_id]
+        return issue_id
+
+    for bucket in buckets.values():
+        for i, first in enumerate(bucket):
+            for second in bucket[i + 1 :]:
+                a, b = find(first), find(second)
+                if a != b and (
+                    similarity(signatures[first], signatures[second])
+                    >= DUPLICATE_THRESHOLD
+                ):
+                    parent[b] = a
+
+    clusters = defaultdict(list)
+    for issue_id in members:
+        clusters[find(issue_id)].append(issue_id)
+    return sorted(
+        (sorted(cluster) for cluster in clusters.values() if len(cluster) >= min_size),
+        key=len,
+        reverse=True,
+    )
@@ -0,0 +1,234 @@
+import csv
+import io
+import json
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from analytics.models import DashboardStat, UserActivity
+from notifications.models import Notification
+from notifications.services import create_notifications
+from .models import (
+    Issue,
+    IssueStatus,
+    LIFECYCLE_TIMESTAMPS,
+    OPEN_STATUSES,
+    RESOLUTION_TIMESTAMPS,
+)
+from .duplicates import index_issues
+from .search import issue_search_vector
+from .workload import adjust_workloads
+
+User = get_user_model()
+
+IMPORT_FORMATS = ("csv", "ndjson")
+MAX_REPORTED_ERRORS = 100
+LIFECYCLE_FIELDS = (*LIFECYCLE_TIMESTAMPS.values(), "first_response_at")
+
+
+class IssueImportSerializer(serializers.Serializer):
+    """
+    Validates a single imported row; users are referenced by email. Optional
+    columns accept null, as written by the NDJSON export.
+
+    Lifecycle timestamps are only taken from the row: an issue imported as
+    resolved without a ``resolved_at`` has no resolution time rather than
+    one of zero, which would skew the resolution analytics.
+    """
+
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField()
+    category = serializers.ChoiceField(Issue.CATEGORY_CHOICES, default="OTHER")
+    priority = serializers.ChoiceField(Issue.PRIORITY_CHOICES, default="MEDIUM")
+    status = serializers.ChoiceField(Issue.STATUS_CHOICES, default="SUBMITTED")
+    submitted_by = serializers.EmailField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    assigned_to = serializers.EmailField(
+        required=False, allow_blank=True, allow_null=True
+    )
+    external_reference = serializers.CharField(
+        max_length=255, required=False, allow_blank=True, allow_null=True
+    )
+    created_at = serializers.DateTimeField(required=False, allow_null=True)
+    assigned_at = serializers.DateTimeField(required=False, allow_null=True)
+    first_response_at = serializers.DateTimeField(required=False, allow_null=True)
+    resolved_at = serializers.DateTimeField(required=False, allow_null=True)
+    closed_at = serializers.DateTimeField(required=False, allow_null=True)
+
+
+def iter_records(stream, fmt):
+    """
+    Lazily yield ``(row_number, record)`` pairs from a binary stream of CSV
+    (with a header row) or newline-delimited JSON.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row_number, row in enumerate(csv.DictReader(text), start=2):
+            yield row_number, {key: value for key, value in row.items() if value}
+    else:
+        for row_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield row_number, json.loads(line)
+            except json.JSONDecodeError:
+                yield row_number, None
+
+
+def import_issues(records, default_submitter, chunk_size=500):
+    """
+    Create issues from ``(row_number, record)`` pairs, one transaction per
+    chunk. Returns a summary with the number of created issues and the first
+    validation errors.
+    """
+    summary = {"created": 0, "failed": 0, "errors": []}
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        created, errors = _import_chunk(chunk, default_submitter)
+        summary["created"] += created
+        summary["failed"] += len(errors)
+        room = MAX_REPORTED_ERRORS - len(summary["errors"])
+        summary["errors"] += errors[:room]
+    return summary
+
+
+def _import_chunk(chunk, default_submitter):
+    errors = []
+    rows = []
+    for row_number, record in chunk:
+        if not isinstance(record, dict):
+            errors.append({"row": row_number, "errors": "Invalid JSON object"})
+            continue
+        serializer = IssueImportSerializer(data=record)
+        if serializer.is_valid():
+            rows.append((row_number, serializer.validated_data))
+        else:
+            errors.append({"row": row_number, "errors": serializer.errors})
+
+    emails = {
+        data.get(field)
+        for _, data in rows
+        for field in ("submitted_by", "assigned_to")
+        if data.get(field)
+    }
+    users = {user.email: user for user in User.objects.filter(email__in=emails)}
+
+    now = timezone.now()
+    issues = []
+    for row_number, data in rows:
+        missing = [
+            field
+            for field in ("submitted_by", "assigned_to")
+            if data.get(field) and data[field] not in users
+        ]
+        if missing:
+            errors.append(
+                {
+                    "row": row_number,
+                    "errors": {field: "Unknown user email" for field in missing},
+                }
+            )
+            continue
+
+        issue = Issue(
+            title=data["title"],
+            description=data["description"],
+            category=data["category"],
+            priority=data["priority"],
+            current_status=data["status"],
+            submitted_by=users.get(data.get("submitted_by"), default_submitter),
+            assigned_to=users.get(data.get("assigned_to")),
+            external_reference=data.get("external_reference") or None,
+            # The "Imported" status row is bulk created with the chunk
+            status_count=1,
+        )
+        issue.imported_at = data.get("created_at")
+        for field in LIFECYCLE_FIELDS:
+            if issue.current_status in OPEN_STATUSES and field in RESOLUTION_TIMESTAMPS:
+                continue
+            setattr(issue, field, data.get(field))
+        # The SLA clock starts at import, as in migration 0014, so a backlog
+        # of old open tickets is not escalated wholesale on the next sweep
+        issue.update_due_at(now)
+        issues.append(issue)
+
+    if issues:
+        with transaction.atomic():
+            _create_chunk(issues)
+
+    return len(issues), errors
+
+
+def _create_chunk(issues):
+    issues = Issue.objects.bulk_create(issues)
+
+    # created_at is auto_now_add, so historical dates are restored afterwards
+    backdated = [issue for issue in issues if issue.imported_at]
+    for issue in backdated:
+        issue.created_at = issue.imported_at
+    if backdated:
+        Issue.objects.bulk_update(backdated, ["created_at"])
+
+    issue_ids = [issue.id for issue in issues]
+    Issue.objects.filter(id__in=issue_ids).update(search_vector=issue_search_vector())
+    index_issues(issues)
+
+    IssueStatus.objects.bulk_create(
+        [
+            IssueStatus(
+                issue=issue,
+                status=issue.current_status,
+                notes="Imported",
+                updated_by=issue.submitted_by,
+            )
+            for issue in issues
+        ]
+    )
+
+    # One batched analytics update instead of the per-row signal handlers
+    UserActivity.objects.bulk_create(
+        [
+            UserActivity(
+                user=issue.submitted_by,
+                activity_type="ISSUE_CREATE",
+                related_issue=issue,
+                additional_data={
+                    "title": issue.title,
+                    "category": issue.category,
+                    "priority": issue.priority,
+                    "imported": True,
+                },
+            )
+            for issue in issues
+        ]
+    )
+    DashboardStat.objects.filter(key="dashboard_stats").delete()
+
+    # One workload update and notification per assignee for the open issues
+    # in this chunk
+    open_counts = {}
+    for issue in issues:
+        if issue.assigned_to_id and issue.current_status in OPEN_STATUSES:
+            open_counts[issue.assigned_to_id] = (
+                open_counts.get(issue.assigned_to_id, 0) + 1
+            )
+    adjust_workloads(open_counts)
+    create_notifications(
+        [
+            Notification(
+                user_id=user_id,
+                content_type=ContentType.objects.get_for_model(Issue),
+                message=f"You have been assigned {count} imported issues",
+                notification_type="ISSUE_ASSIGNED",
+            )
+            for user_id, count in open_counts.items()
+        ]
+    )
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from issues.archiving import archive_closed_issues
+
+
+class Command(BaseCommand):
+    help = "Moves long-closed issues and their history into the archive tables"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ISSUE_ARCHIVE_AFTER_DAYS,
+            help="Archive issues closed more than this many days ago",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of issues moved per transaction",
+        )
+
+    def handle(self, *args, **options):
+        archived = archive_closed_issues(options["days"], options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} issues"))
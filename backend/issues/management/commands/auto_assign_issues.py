@@ -0,0 +1,41 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.autoassign import auto_assign_issues
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Assigns the unassigned submitted backlog to faculty by workload"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--assigned-by",
+            required=True,
+            help="Email of the registrar recorded as making the assignments",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of issues assigned per transaction",
+        )
+        parser.add_argument(
+            "--limit", type=int, help="Maximum number of issues to assign"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            registrar = User.objects.get(email=options["assigned_by"], role="ADMIN")
+        except User.DoesNotExist:
+            raise CommandError(f"Registrar {options['assigned_by']} does not exist")
+
+        assigned, unrouted = auto_assign_issues(
+            registrar, batch_size=options["batch_size"], limit=options["limit"]
+        )
+        if unrouted:
+            self.stderr.write(
+                f"No faculty member available for {len(unrouted)} issues"
+            )
+        self.stdout.write(self.style.SUCCESS(f"Assigned {len(assigned)} issues"))
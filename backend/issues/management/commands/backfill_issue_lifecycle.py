@@ -0,0 +1,87 @@
+from django.core.management.base import BaseCommand
+from django.db.models import (
+    Case,
+    DateTimeField,
+    F,
+    Max,
+    OuterRef,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Least
+
+from issues.models import (
+    Issue,
+    IssueStatus,
+    Comment,
+    LIFECYCLE_TIMESTAMPS,
+    OPEN_STATUSES,
+    RESOLUTION_TIMESTAMPS,
+)
+
+
+class Command(BaseCommand):
+    help = "Backfills issue lifecycle timestamps from status history and comments"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of issues updated per UPDATE statement",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        def status_at(status, order):
+            return Subquery(
+                IssueStatus.objects.filter(issue=OuterRef("pk"), status=status)
+                .order_by(order)
+                .values("created_at")[:1]
+            )
+
+        first_status_response = Subquery(
+            IssueStatus.objects.filter(issue=OuterRef("pk"))
+            .exclude(updated_by=OuterRef("submitted_by"))
+            .order_by("created_at")
+            .values("created_at")[:1]
+        )
+        first_comment_response = Subquery(
+            Comment.objects.filter(issue=OuterRef("pk"))
+            .exclude(user=OuterRef("submitted_by"))
+            .order_by("created_at")
+            .values("created_at")[:1]
+        )
+
+        updates = {}
+        for status, field in LIFECYCLE_TIMESTAMPS.items():
+            if field not in RESOLUTION_TIMESTAMPS:
+                updates[field] = Coalesce(field, status_at(status, "created_at"))
+                continue
+            # Resolution timestamps date the latest resolution, as set_status
+            # keeps them, and are empty while the issue is open
+            updates[field] = Case(
+                When(current_status__in=OPEN_STATUSES, then=Value(None)),
+                default=Coalesce(status_at(status, "-created_at"), F(field)),
+                output_field=DateTimeField(),
+            )
+        # LEAST() ignores NULLs on PostgreSQL only; fall back explicitly
+        updates["first_response_at"] = Coalesce(
+            "first_response_at",
+            Least(first_status_response, first_comment_response),
+            first_status_response,
+            first_comment_response,
+        )
+
+        max_id = Issue.objects.aggregate(max_id=Max("id"))["max_id"] or 0
+        updated = 0
+        for start in range(0, max_id + 1, batch_size):
+            updated += Issue.objects.filter(
+                id__gte=start, id__lt=start + batch_size
+            ).update(**updates)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Backfilled lifecycle timestamps on {updated} issues")
+        )
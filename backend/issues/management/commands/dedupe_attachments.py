@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+
+from issues.models import Attachment, AttachmentBlob
+from issues.uploads import file_sha256
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves attachments stored before deduplication onto shared blobs and "
+        "deletes their duplicate files"
+    )
+
+    def handle(self, *args, **options):
+        linked = removed = freed = 0
+        legacy = Attachment.objects.filter(blob__isnull=True).exclude(file="")
+
+        for attachment in legacy.iterator(chunk_size=500):
+            storage = attachment.file.storage
+            name = attachment.file.name
+            if not storage.exists(name):
+                self.stderr.write(f"Attachment {attachment.id}: missing file {name}")
+                continue
+            with attachment.file.open("rb"):
+                digest = file_sha256(attachment.file)
+
+            with transaction.atomic():
+                blob = (
+                    AttachmentBlob.objects.select_for_update()
+                    .filter(sha256=digest)
+                    .first()
+                )
+                if blob is None:
+                    # The first copy becomes the blob in place; nothing moves
+                    blob = AttachmentBlob.objects.create(
+                        sha256=digest,
+                        file=name,
+                        size=attachment.file.size,
+                        ref_count=1,
+                    )
+                else:
+                    AttachmentBlob.objects.filter(pk=blob.pk).update(
+                        ref_count=F("ref_count") + 1
+                    )
+
+                Attachment.objects.filter(pk=attachment.pk).update(
+                    blob=blob, file=blob.file.name, sha256=digest
+                )
+                duplicate = (
+                    name != blob.file.name
+                    and not Attachment.objects.filter(file=name).exists()
+                )
+            linked += 1
+
+            if duplicate:
+                freed += storage.size(name)
+                storage.delete(name)
+                removed += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Linked {linked} attachments, removed {removed} duplicate files "
+                f"({freed} bytes)"
+            )
+        )
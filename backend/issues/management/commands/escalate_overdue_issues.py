@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.sla import escalate_overdue_issues
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Escalates issues whose SLA deadline has passed; run it periodically"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--escalated-by",
+            default=settings.ISSUE_SLA_ESCALATED_BY,
+            help="Email of the registrar recorded as escalating the issues",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of issues escalated per transaction",
+        )
+
+    def handle(self, *args, **options):
+        email = options["escalated_by"]
+        if not email:
+            raise CommandError("Pass --escalated-by or set ISSUE_SLA_ESCALATED_BY")
+        try:
+            registrar = User.objects.get(email=email, role="ADMIN")
+        except User.DoesNotExist:
+            raise CommandError(f"Registrar {email} does not exist")
+
+        escalated = escalate_overdue_issues(registrar, options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Escalated {escalated} issues"))
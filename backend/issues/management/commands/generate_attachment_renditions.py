@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from issues.models import AttachmentBlob
+from issues.renditions import generate_renditions, is_image
+
+
+class Command(BaseCommand):
+    help = "Generates missing thumbnails and previews for image attachments"
+
+    def handle(self, *args, **options):
+        generated = failed = 0
+        pending = AttachmentBlob.objects.filter(thumbnail="", renderable=True).only(
+            "id", "file"
+        )
+        for blob in pending.iterator(chunk_size=500):
+            if not is_image(blob.file.name):
+                continue
+            try:
+                generate_renditions(blob.id)
+                generated += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Blob {blob.id}: {str(e)}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated renditions for {generated} blobs")
+        )
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{failed} blobs failed"))
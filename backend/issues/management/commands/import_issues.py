@@ -0,0 +1,46 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.importing import IMPORT_FORMATS, import_issues, iter_records
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Imports issues from a CSV or NDJSON file in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV (with header row) or NDJSON file")
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="File format; inferred from the extension when omitted",
+        )
+        parser.add_argument(
+            "--submitted-by",
+            required=True,
+            help="Email of the user recorded as submitter for rows without one",
+        )
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "ndjson")
+
+        try:
+            submitter = User.objects.get(email=options["submitted_by"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['submitted_by']} does not exist")
+
+        with open(path, "rb") as stream:
+            summary = import_issues(
+                iter_records(stream, fmt), submitter, options["chunk_size"]
+            )
+
+        for error in summary["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {summary['created']} issues, {summary['failed']} rows failed"
+            )
+        )
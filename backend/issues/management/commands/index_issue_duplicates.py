@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from issues.duplicates import index_issues
+from issues.models import Issue
+
+
+class Command(BaseCommand):
+    help = "Builds the near-duplicate signatures of existing issues"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of issues indexed per transaction",
+        )
+
+    def handle(self, *args, **options):
+        issues = (
+            Issue.objects.only("id", "title", "description")
+            .order_by("id")
+            .iterator(chunk_size=options["batch_size"])
+        )
+        indexed = 0
+        batch = []
+        for issue in issues:
+            batch.append(issue)
+            if len(batch) == options["batch_size"]:
+                index_issues(batch, check_unchanged=True)
+                indexed += len(batch)
+                batch = []
+        if batch:
+            index_issues(batch, check_unchanged=True)
+            indexed += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} issues"))
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from issues.models import AttachmentUpload
+from issues.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = "Deletes resumable attachment uploads that stopped receiving chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-hours",
+            type=int,
+            default=24,
+            help="Age of the last received chunk after which an upload is dropped",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["older_than_hours"])
+        purged = 0
+        for upload in AttachmentUpload.objects.filter(updated_at__lt=cutoff).iterator():
+            discard_upload(upload)
+            purged += 1
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} stale uploads"))
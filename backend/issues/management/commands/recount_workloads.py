@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from issues.workload import recount_workloads
+
+
+class Command(BaseCommand):
+    help = "Recomputes the faculty open issue counters from the issues table"
+
+    def handle(self, *args, **options):
+        corrected = recount_workloads()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} counters"))
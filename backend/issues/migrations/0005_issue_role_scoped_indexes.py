@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-18 09:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0004_comment_issues_comm_issue_i_dcd9aa_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assigned_to', 'current_status', '-created_at'], name='issues_issu_assigne_e298b2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['submitted_by', '-created_at'], name='issues_issu_submitt_ddc6af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('current_status__in', ('SUBMITTED', 'ASSIGNED', 'IN_PROGRESS', 'PENDING_INFO', 'ESCALATED'))), fields=['assigned_to', '-created_at'], name='issue_open_assigned_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('current_status__in', ('SUBMITTED', 'ASSIGNED', 'IN_PROGRESS', 'PENDING_INFO', 'ESCALATED'))), fields=['current_status', '-created_at'], name='issue_open_status_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-18 10:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_child_counts(apps, schema_editor):
+    Issue = apps.get_model("issues", "Issue")
+    for model_name, field in (
+        ("Comment", "comment_count"),
+        ("IssueStatus", "status_count"),
+        ("Attachment", "attachment_count"),
+    ):
+        model = apps.get_model("issues", model_name)
+        counts = (
+            model.objects.filter(issue=OuterRef("pk"))
+            .order_by()
+            .values("issue")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        Issue.objects.update(**{field: Coalesce(Subquery(counts), 0)})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0007_issue_lifecycle_timestamps'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='attachment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='status_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_child_counts, migrations.RunPython.noop),
+    ]
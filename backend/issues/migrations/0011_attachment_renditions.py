@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 10:16
+
+import issues.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0010_attachment_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentblob',
+            name='preview',
+            field=models.FileField(blank=True, max_length=255, upload_to=issues.models.attachment_rendition_path),
+        ),
+        migrations.AddField(
+            model_name='attachmentblob',
+            name='thumbnail',
+            field=models.FileField(blank=True, max_length=255, upload_to=issues.models.attachment_rendition_path),
+        ),
+    ]
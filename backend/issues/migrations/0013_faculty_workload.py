@@ -0,0 +1,52 @@
+# Generated by Django 5.2 on 2026-10-18 10:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+OPEN_STATUSES = ("SUBMITTED", "ASSIGNED", "IN_PROGRESS", "PENDING_INFO", "ESCALATED")
+
+
+def backfill_workloads(apps, schema_editor):
+    FacultyWorkload = apps.get_model("issues", "FacultyWorkload")
+    Issue = apps.get_model("issues", "Issue")
+    User = apps.get_model("users", "User")
+    counts = dict(
+        Issue.objects.filter(
+            current_status__in=OPEN_STATUSES, assigned_to__isnull=False
+        )
+        .order_by()
+        .values_list("assigned_to")
+        .annotate(count=Count("id"))
+    )
+    faculty_ids = set(User.objects.filter(role="FACULTY").values_list("id", flat=True))
+    FacultyWorkload.objects.bulk_create(
+        [
+            FacultyWorkload(faculty_id=user_id, open_issues=counts.get(user_id, 0))
+            for user_id in faculty_ids | counts.keys()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0012_issue_archive'),
+        ('users', '0003_user_directory_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyWorkload',
+            fields=[
+                ('faculty', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open_issues', models.PositiveIntegerField(default=0, editable=False)),
+                ('categories', models.JSONField(blank=True, default=list)),
+                ('max_open_issues', models.PositiveIntegerField(blank=True, null=True)),
+                ('accepts_auto_assignment', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_workloads, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2 on 2026-10-18 10:27
+
+from django.conf import settings
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+SLA_STATUSES = ("SUBMITTED", "ASSIGNED", "IN_PROGRESS")
+
+
+def backfill_due_at(apps, schema_editor):
+    # Open issues start their SLA clock now rather than at submission, so the
+    # first sweep does not escalate the whole existing backlog at once
+    Issue = apps.get_model("issues", "Issue")
+    now = timezone.now()
+    for priority, hours in settings.ISSUE_SLA_HOURS.items():
+        Issue.objects.filter(
+            current_status__in=SLA_STATUSES, priority=priority
+        ).update(due_at=now + timedelta(hours=hours))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0013_faculty_workload'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='due_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('due_at__isnull', False)), fields=['due_at'], name='issue_due_at_idx'),
+        ),
+        migrations.RunPython(backfill_due_at, migrations.RunPython.noop),
+    ]
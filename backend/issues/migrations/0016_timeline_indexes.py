@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-18 10:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0015_issue_signatures'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attachment',
+            index=models.Index(fields=['issue', 'created_at', 'id'], name='issues_atta_issue_i_8ddf45_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issuestatus',
+            index=models.Index(fields=['issue', 'created_at', 'id'], name='issues_issu_issue_i_0a9d07_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2 on 2026-10-18 10:49
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_rendered_at(apps, schema_editor):
+    AttachmentBlob = apps.get_model("issues", "AttachmentBlob")
+    AttachmentBlob.objects.exclude(thumbnail="").update(rendered_at=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0016_timeline_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentblob',
+            name='rendered_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_rendered_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-18 10:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0017_attachmentblob_rendered_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issues_issu_assigne_e298b2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issues_issu_submitt_ddc6af_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_open_assigned_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='issue',
+            name='issue_open_status_idx',
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='assigned_to',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assigned_issues', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='issue',
+            name='submitted_by',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='submitted_issues', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['assigned_to', '-created_at', '-id'], name='issue_assigned_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(fields=['submitted_by', '-created_at', '-id'], name='issue_submitted_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0018_role_scoped_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachmentblob',
+            name='renderable',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-18 11:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0019_attachmentblob_renderable'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='issue',
+            name='priority_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority='URGENT', then=models.Value(0)), models.When(priority='HIGH', then=models.Value(1)), models.When(priority='MEDIUM', then=models.Value(2)), models.When(priority='LOW', then=models.Value(3)), default=models.Value(4)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='issue',
+            index=models.Index(condition=models.Q(('assigned_to', None), ('current_status', 'SUBMITTED')), fields=['priority_rank', 'created_at', 'id'], name='issue_backlog_idx'),
+        ),
+    ]
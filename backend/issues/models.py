@@ -1,8 +1,55 @@
+import os
+import uuid
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import PermissionDenied
 
+# Statuses that still need action; role-scoped dashboards mostly query these.
+OPEN_STATUSES = ("SUBMITTED", "ASSIGNED", "IN_PROGRESS", "PENDING_INFO", "ESCALATED")
+
+# Lifecycle timestamp stamped the first time an issue enters each status
+# (since it last reopened, for RESOLUTION_TIMESTAMPS).
+LIFECYCLE_TIMESTAMPS = {
+    "ASSIGNED": "assigned_at",
+    "RESOLVED": "resolved_at",
+    "CLOSED": "closed_at",
+}
+# Lifecycle timestamps of the issue's current resolution, cleared when it
+# reopens so they are stamped again by the next resolution
+RESOLUTION_TIMESTAMPS = ("resolved_at", "closed_at")
+
+# Statuses in which an issue is waiting on staff, so its SLA clock runs;
+# ISSUE_SLA_HOURS gives the deadline per priority.
+SLA_STATUSES = ("SUBMITTED", "ASSIGNED", "IN_PROGRESS")
+
+# Columns written in SQL by concurrent writers (child counters, the first
+# response stamp, the search vector). Issue.save() never writes them back from
+# a possibly stale instance.
+SQL_MAINTAINED_FIELDS = {
+    "comment_count",
+    "status_count",
+    "attachment_count",
+    "first_response_at",
+    "search_vector",
+}
+
+
+# Backlog order of the priorities, most urgent first
+PRIORITY_RANKS = {"URGENT": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
+
+
+class IssueManager(models.Manager):
+    """Default manager that leaves the stored search vector out of SELECTs."""
+
+    def get_queryset(self):
+        return super().get_queryset().defer("search_vector")
+
 
 class Issue(models.Model):
     """Model for academic issues submitted by students."""
@@ -45,6 +92,7 @@ class Issue(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="submitted_issues",
+        db_index=False,  # Leads issue_submitted_created_idx
     )
     assigned_to = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -52,6 +100,7 @@ class Issue(models.Model):
         related_name="assigned_issues",
         null=True,
         blank=True,
+        db_index=False,  # Leads issue_assigned_created_idx
     )
     current_status = models.CharField(
         max_length=20, choices=STATUS_CHOICES, default="SUBMITTED"
@@ -59,19 +108,190 @@ class Issue(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     external_reference = models.CharField(max_length=255, null=True, blank=True)
+    # Lifecycle timestamps, maintained by set_status()
+    assigned_at = models.DateTimeField(null=True, blank=True, editable=False)
+    first_response_at = models.DateTimeField(null=True, blank=True, editable=False)
+    resolved_at = models.DateTimeField(null=True, blank=True, editable=False)
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # SLA deadline while the issue waits on staff, maintained by set_status()
+    due_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Stored so the auto-assignment backlog order can be read from an index
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            *[
+                models.When(priority=priority, then=models.Value(rank))
+                for priority, rank in PRIORITY_RANKS.items()
+            ],
+            default=models.Value(len(PRIORITY_RANKS)),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+    # Child row counts, maintained by issues.signals and the bulk writers
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    status_count = models.PositiveIntegerField(default=0, editable=False)
+    attachment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by issues.signals from the title, description and comments
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = IssueManager()
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            models.Index(fields=["created_at", "id"]),
+            # Role-scoped listings filter on the user and page newest first
+            # over (created_at, id); these also replace the FK indexes
+            models.Index(
+                fields=["assigned_to", "-created_at", "-id"],
+                name="issue_assigned_created_idx",
+            ),
+            models.Index(
+                fields=["submitted_by", "-created_at", "-id"],
+                name="issue_submitted_created_idx",
+            ),
+            models.Index(
+                fields=["closed_at", "id"],
+                condition=models.Q(current_status="CLOSED"),
+                name="issue_closed_at_idx",
+            ),
+            models.Index(
+                fields=["due_at"],
+                condition=models.Q(due_at__isnull=False),
+                name="issue_due_at_idx",
+            ),
+            # The unrouted backlog, in auto-assignment order
+            models.Index(
+                fields=["priority_rank", "created_at", "id"],
+                condition=models.Q(current_status="SUBMITTED", assigned_to=None),
+                name="issue_backlog_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None:
+            # Keep the clock's start when a registrar changes the priority
+            loaded = getattr(self, "_loaded_priority", self.priority)
+            if self.due_at is not None and loaded != self.priority:
+                self.due_at += self.sla_period(self.priority) - self.sla_period(
+                    loaded
+                )
+            self.update_due_at(timezone.now())
+
+        stamp_first_response = False
+        if not self._state.adding and not kwargs.get("force_insert"):
+            if update_fields is None:
+                deferred = self.get_deferred_fields()
+                update_fields = [
+                    field.name
+                    for field in self._meta.concrete_fields
+                    if not field.primary_key
+                    and not field.generated
+                    and field.attname not in deferred
+                ]
+            stamp_first_response = (
+                "first_response_at" in update_fields
+                and self.first_response_at is not None
+                and self.first_response_at
+                != getattr(self, "_loaded_first_response_at", None)
+            )
+            kwargs["update_fields"] = [
+                name for name in update_fields if name not in SQL_MAINTAINED_FIELDS
+            ]
+
+        super().save(*args, **kwargs)
+        if stamp_first_response:
+            # Only the first response wins, whichever writer gets there first
+            Issue.objects.filter(pk=self.pk, first_response_at__isnull=True).update(
+                first_response_at=self.first_response_at
+            )
+        self._loaded_priority = self.priority
+        self._loaded_first_response_at = self.first_response_at
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if "assigned_to_id" in field_names and "current_status" in field_names:
+            # Remembered so the workload handler can tell what a save changed
+            instance._loaded_workload_owner = instance.workload_owner()
+        if "priority" in field_names:
+            instance._loaded_priority = instance.priority
+        if "first_response_at" in field_names:
+            instance._loaded_first_response_at = instance.first_response_at
+        return instance
+
+    @staticmethod
+    def sla_period(priority):
+        return timedelta(hours=settings.ISSUE_SLA_HOURS[priority])
+
+    def update_due_at(self, when):
+        """
+        Start the SLA clock at ``when`` on entering an SLA status, or stop it
+        on leaving one. Returns whether ``due_at`` changed.
+        """
+        if self.current_status not in SLA_STATUSES:
+            due_at = None
+        else:
+            due_at = self.due_at or when + self.sla_period(self.priority)
+        changed = due_at != self.due_at
+        self.due_at = due_at
+        return changed
+
+    def workload_owner(self):
+        """
+        Id of the user whose open workload counts this issue, or None when it
+        is unassigned or no longer open.
+        """
+        if self.current_status not in OPEN_STATUSES:
+            return None
+        return self.assigned_to_id
+
+    def set_status(self, status, user, when=None):
+        """
+        Set ``current_status`` and stamp the lifecycle timestamps it implies.
+
+        Moving back to an open status clears ``resolved_at`` and
+        ``closed_at``, which therefore date the latest resolution.
+
+        ``first_response_at`` is stamped on the first status change made by
+        someone other than the submitter. Does not save; returns the names of
+        the fields that changed so callers can pass them to ``update_fields``.
+        """
+        when = when or timezone.now()
+        self.current_status = status
+        changed = ["current_status"]
+
+        if status in OPEN_STATUSES:
+            for field in RESOLUTION_TIMESTAMPS:
+                if getattr(self, field) is not None:
+                    setattr(self, field, None)
+                    changed.append(field)
+
+        field = LIFECYCLE_TIMESTAMPS.get(status)
+        if field and getattr(self, field) is None:
+            setattr(self, field, when)
+            changed.append(field)
+
+        if self.first_response_at is None and user.pk != self.submitted_by_id:
+            self.first_response_at = when
+            changed.append("first_response_at")
+
+        if self.update_due_at(when):
+            changed.append("due_at")
+
+        return changed
+
     def assign_to(self, faculty, registrar):
         """Assign the issue to a lecturer."""
         if not registrar.is_staff:  # Assuming registrars are staff users
             raise PermissionDenied("Only registrars can assign issues.")
         self.assigned_to = faculty
-        self.current_status = "ASSIGNED"
+        self.set_status("ASSIGNED", registrar)
         self.save()
         print(
             f"Issue {self.id} assigned to {faculty.email} with status {self.current_status}"
@@ -81,7 +301,7 @@ class Issue(models.Model):
         """Mark the issue as resolved by the assigned lecturer."""
         if self.assigned_to != lecturer:
             raise PermissionDenied("Only the assigned lecturer can resolve this issue.")
-        self.current_status = "RESOLVED"
+        self.set_status("RESOLVED", lecturer)
         self.save()
         IssueStatus.objects.create(
             issue=self,
@@ -107,6 +327,9 @@ class IssueStatus(models.Model):
     class Meta:
         ordering = ["-created_at"]
         verbose_name_plural = "Issue Statuses"
+        indexes = [
+            models.Index(fields=["issue", "created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"{self.issue.title} - {self.status}"
@@ -123,11 +346,52 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["issue", "created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"Comment by {self.user.email} on {self.issue.title}"
 
 
+def attachment_blob_path(instance, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f"attachments/blobs/{instance.sha256[:2]}/{instance.sha256}{extension}"
+
+
+def attachment_rendition_path(instance, filename):
+    return f"attachments/blobs/{instance.sha256[:2]}/{filename}"
+
+
+class AttachmentBlob(models.Model):
+    """
+    Stored attachment content, addressed by its SHA-256 and shared by every
+    Attachment with the same bytes. Deleted with its file when the last
+    referencing attachment is deleted.
+    """
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to=attachment_blob_path, max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    # Downscaled copies of image content, generated by issues.renditions
+    thumbnail = models.FileField(
+        upload_to=attachment_rendition_path, max_length=255, blank=True
+    )
+    preview = models.FileField(
+        upload_to=attachment_rendition_path, max_length=255, blank=True
+    )
+    # When the renditions were stored; part of the issue cache validators
+    rendered_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Cleared when the content failed to decode as an image, so it is not
+    # queued for renditions again
+    renderable = models.BooleanField(default=True, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} references)"
+
+
 class Attachment(models.Model):
     """Model for file attachments to issues."""
 
@@ -139,6 +403,213 @@ class Attachment(models.Model):
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     size = models.PositiveIntegerField(default=0)  # File size in bytes
+    sha256 = models.CharField(max_length=64, blank=True, editable=False)
+    # Shared content; ``file`` points at the blob's file. Null for attachments
+    # stored before deduplication until dedupe_attachments has run.
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        related_name="attachments",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["issue", "created_at", "id"]),
+        ]
+
+    def __str__(self):
+        return self.filename
+
+
+class AttachmentUpload(models.Model):
+    """
+    A resumable attachment upload in progress. Chunks are appended to a
+    partial file on disk; finalizing it creates the Attachment.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="uploads")
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()  # Declared total size in bytes
+    offset = models.PositiveBigIntegerField(default=0)  # Bytes received so far
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size} bytes)"
+
+    @property
+    def partial_path(self):
+        return os.path.join(settings.ATTACHMENT_UPLOAD_TEMP_DIR, str(self.id))
+
+
+class FacultyWorkload(models.Model):
+    """
+    A faculty member's open issue count and the rules the auto-assignment
+    engine routes by. ``open_issues`` is maintained by issues.signals and the
+    bulk writers.
+    """
+
+    faculty = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="workload",
+    )
+    open_issues = models.PositiveIntegerField(default=0, editable=False)
+    # Issue categories this faculty member handles; empty means all of them
+    categories = models.JSONField(default=list, blank=True)
+    # Open issues above which auto-assignment skips them; null means no limit
+    max_open_issues = models.PositiveIntegerField(null=True, blank=True)
+    accepts_auto_assignment = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"{self.faculty} ({self.open_issues} open)"
+
+    def handles(self, category):
+        return not self.categories or category in self.categories
+
+    def has_capacity(self):
+        return self.max_open_issues is None or self.open_issues < self.max_open_issues
+
+
+class IssueSignature(models.Model):
+    """
+    MinHash signature of an issue's title and description, maintained by
+    issues.duplicates for near-duplicate lookups.
+    """
+
+    issue = models.OneToOneField(
+        Issue, on_delete=models.CASCADE, primary_key=True, related_name="signature"
+    )
+    minhash = models.BinaryField()
+
+
+class IssueSignatureBand(models.Model):
+    """
+    One LSH band of an issue's signature. Issues sharing a band key are
+    candidate duplicates, found with a single index lookup.
+    """
+
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="+")
+    key = models.BigIntegerField(db_index=True)
+
+
+class ArchivedIssue(models.Model):
+    """
+    A closed issue moved out of the hot tables by issues.archiving. Keeps the
+    original id and is read-only.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    description = models.TextField()
+    category = models.CharField(max_length=50, choices=Issue.CATEGORY_CHOICES)
+    priority = models.CharField(max_length=20, choices=Issue.PRIORITY_CHOICES)
+    submitted_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    assigned_to = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+        blank=True,
+    )
+    current_status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    external_reference = models.CharField(max_length=255, null=True, blank=True)
+    assigned_at = models.DateTimeField(null=True, blank=True)
+    first_response_at = models.DateTimeField(null=True, blank=True)
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    closed_at = models.DateTimeField(null=True, blank=True)
+    comment_count = models.PositiveIntegerField(default=0)
+    status_count = models.PositiveIntegerField(default=0)
+    attachment_count = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at", "id"]),
+            models.Index(fields=["submitted_by", "-created_at"]),
+            models.Index(fields=["assigned_to", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedIssueStatus(models.Model):
+    """Status history of an archived issue."""
+
+    id = models.BigIntegerField(primary_key=True)
+    issue = models.ForeignKey(
+        ArchivedIssue, on_delete=models.CASCADE, related_name="statuses"
+    )
+    status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    notes = models.TextField(null=True, blank=True)
+    updated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name_plural = "Archived Issue Statuses"
+
+    def __str__(self):
+        return f"{self.issue.title} - {self.status}"
+
+
+class ArchivedComment(models.Model):
+    """Comment on an archived issue."""
+
+    id = models.BigIntegerField(primary_key=True)
+    issue = models.ForeignKey(
+        ArchivedIssue, on_delete=models.CASCADE, related_name="comments"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    content = models.TextField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["created_at"]
+
+    def __str__(self):
+        return f"Comment by {self.user.email} on {self.issue.title}"
+
+
+class ArchivedAttachment(models.Model):
+    """Attachment of an archived issue; keeps its reference to the blob."""
+
+    id = models.BigIntegerField(primary_key=True)
+    issue = models.ForeignKey(
+        ArchivedIssue, on_delete=models.CASCADE, related_name="attachments"
+    )
+    file = models.FileField(upload_to="attachments/")
+    filename = models.CharField(max_length=255)
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    created_at = models.DateTimeField()
+    size = models.PositiveIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    blob = models.ForeignKey(
+        AttachmentBlob,
+        on_delete=models.PROTECT,
+        related_name="archived_attachments",
+        null=True,
+        blank=True,
+    )
 
     def __str__(self):
         return self.filename
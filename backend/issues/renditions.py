@@ -0,0 +1,118 @@
+import io
+import logging
+import mimetypes
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import AttachmentBlob
+
+logger = logging.getLogger(__name__)
+
+# Rendition -> bounding box, largest first: each one is downscaled from the
+# previous, so only the preview is computed from the full-size original.
+RENDITIONS = {
+    "preview": (1600, 1600),
+    "thumbnail": (320, 320),
+}
+RENDITION_FORMAT = "WEBP"
+RENDITION_QUALITY = 80
+
+_executor = None
+_pending = set()  # Blob ids queued in this process
+
+
+def is_image(filename):
+    content_type = mimetypes.guess_type(filename)[0] or ""
+    return content_type.startswith("image/")
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ATTACHMENT_RENDITION_WORKERS,
+            thread_name_prefix="attachment-renditions",
+        )
+    return _executor
+
+
+def schedule_renditions(blob):
+    """
+    Generate the blob's renditions on the worker pool once the current
+    transaction commits.
+    """
+    if blob.thumbnail or not blob.renderable or not is_image(blob.file.name):
+        return
+
+    def submit():
+        if blob.pk not in _pending:
+            _pending.add(blob.pk)
+            _get_executor().submit(_run, blob.pk)
+
+    transaction.on_commit(submit)
+
+
+def _run(blob_id):
+    try:
+        generate_renditions(blob_id)
+    except Exception as e:
+        logger.error(f"Error generating renditions for blob {blob_id}: {str(e)}")
+    finally:
+        _pending.discard(blob_id)
+        connection.close()
+
+
+def _encode(image):
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+    buffer = io.BytesIO()
+    image.save(buffer, RENDITION_FORMAT, quality=RENDITION_QUALITY, method=4)
+    return ContentFile(buffer.getvalue())
+
+
+def _render(source):
+    """Rendition name -> encoded content, for an image file object."""
+    renditions = {}
+    with Image.open(source) as image:
+        # Lets the JPEG decoder downscale while decoding
+        image.draft("RGB", RENDITIONS["preview"])
+        image = ImageOps.exif_transpose(image)
+        for name, size in RENDITIONS.items():
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+            renditions[name] = _encode(image)
+    return renditions
+
+
+def generate_renditions(blob_id):
+    """
+    Create the missing renditions of an image blob. Content that does not
+    decode as an image marks the blob as not renderable, so it is not queued
+    again, and the decoding error is raised.
+    """
+    blob = AttachmentBlob.objects.filter(pk=blob_id).first()
+    if blob is None or blob.thumbnail or not blob.renderable:
+        return
+
+    with blob.file.open("rb") as source:
+        try:
+            renditions = _render(source)
+        except (Image.UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            AttachmentBlob.objects.filter(pk=blob.pk).update(renderable=False)
+            raise
+    for name, content in renditions.items():
+        getattr(blob, name).save(f"{blob.sha256}_{name}.webp", content, save=False)
+
+    updated = AttachmentBlob.objects.filter(pk=blob.pk, thumbnail="").update(
+        rendered_at=timezone.now(),
+        **{name: getattr(blob, name).name for name in RENDITIONS},
+    )
+    if not updated:
+        # Released, or rendered by another worker, while we worked
+        for name in RENDITIONS:
+            getattr(blob, name).delete(save=False)
@@ -0,0 +1,94 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, OuterRef, Subquery, TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils.html import escape
+
+from .models import Issue, Comment
+
+SEARCH_CONFIG = "english"
+# Delimiters PostgreSQL wraps matches in, control characters user text does
+# not contain; render_headline() turns them into <mark> after escaping
+HEADLINE_START = "\x02"
+HEADLINE_STOP = "\x03"
+
+
+def issue_search_vector():
+    """
+    Weighted tsvector expression for an issue: title (A), description (B)
+    and the concatenated content of its comments (C).
+    """
+    comments = (
+        Comment.objects.filter(issue=OuterRef("pk"))
+        .order_by()
+        .values("issue")
+        .annotate(text=StringAgg("content", delimiter=" "))
+        .values("text")
+    )
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        + SearchVector(
+            Coalesce(Subquery(comments), Value(""), output_field=TextField()),
+            weight="C",
+            config=SEARCH_CONFIG,
+        )
+    )
+
+
+def update_search_vector(issue_id):
+    """Recompute the stored search vector of a single issue."""
+    Issue.objects.filter(pk=issue_id).update(search_vector=issue_search_vector())
+
+
+def search_issues(queryset, text):
+    """
+    Filter ``queryset`` to issues matching ``text`` (web search syntax),
+    annotated with ``rank`` and ``title_headline`` / ``description_headline``
+    fragments, best matches first. The fragments are raw user text with
+    matches between HEADLINE_START and HEADLINE_STOP; pass them through
+    render_headline() before sending them to a client.
+    """
+    query = SearchQuery(text, search_type="websearch", config=SEARCH_CONFIG)
+    return (
+        queryset.filter(search_vector=query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), query),
+            title_headline=SearchHeadline(
+                "title",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=HEADLINE_START,
+                stop_sel=HEADLINE_STOP,
+                highlight_all=True,
+            ),
+            description_headline=SearchHeadline(
+                "description",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=HEADLINE_START,
+                stop_sel=HEADLINE_STOP,
+                max_fragments=2,
+            ),
+        )
+        .order_by("-rank", "-created_at")
+    )
+
+
+def render_headline(headline):
+    """
+    HTML for a search_issues() headline: the user text escaped, with its
+    matches wrapped in <mark>.
+    """
+    if headline is None:
+        return None
+    return (
+        escape(headline)
+        .replace(HEADLINE_START, "<mark>")
+        .replace(HEADLINE_STOP, "</mark>")
+    )
@@ -1,7 +1,31 @@
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
-from .models import Issue, IssueStatus, Comment, Attachment
+from .models import (
+    Issue,
+    IssueStatus,
+    Comment,
+    Attachment,
+    AttachmentUpload,
+    ArchivedIssue,
+    ArchivedIssueStatus,
+    ArchivedComment,
+    ArchivedAttachment,
+)
+from .search import render_headline
+from .uploads import file_sha256, store_blob
 from users.serializers import UserSerializer
 
+# Children embedded per collection in issue payloads; the complete
+# collections are served by the paginated child endpoints.
+EMBEDDED_CHILDREN_LIMIT = 20
+
+
+def parse_csv_param(request, name):
+    """Split a comma separated query parameter into a list of values."""
+    value = request.query_params.get(name, "")
+    return [item.strip() for item in value.split(",") if item.strip()]
+
 
 class CommentSerializer(serializers.ModelSerializer):
     user_details = UserSerializer(source="user", read_only=True)
@@ -46,6 +70,10 @@ class IssueStatusSerializer(serializers.ModelSerializer):
 
 
 class AttachmentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    preview_url = serializers.SerializerMethodField()
+
     class Meta:
         model = Attachment
         fields = [
@@ -56,22 +84,95 @@ class AttachmentSerializer(serializers.ModelSerializer):
             "uploaded_by",
             "created_at",
             "size",
+            "sha256",
+            "download_url",
+            "thumbnail_url",
+            "preview_url",
         ]
         read_only_fields = ["id", "uploaded_by", "created_at", "filename", "size"]
 
+    def get_download_url(self, obj):
+        url = reverse("issue_attachment_download", args=[obj.issue_id, obj.id])
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+    def rendition_url(self, obj, rendition):
+        if obj.blob_id is None or not getattr(obj.blob, rendition):
+            return None
+        return f"{self.get_download_url(obj)}?rendition={rendition}"
+
+    def get_thumbnail_url(self, obj):
+        return self.rendition_url(obj, "thumbnail")
+
+    def get_preview_url(self, obj):
+        return self.rendition_url(obj, "preview")
+
     def create(self, validated_data):
-        validated_data["uploaded_by"] = self.context["request"].user
-        validated_data["filename"] = validated_data["file"].name
-        validated_data["size"] = validated_data["file"].size
-        return super().create(validated_data)
+        upload = validated_data["file"]
+        digest = file_sha256(upload)
+        with transaction.atomic():
+            blob = store_blob(digest, upload.size, upload, upload.name)
+            validated_data["uploaded_by"] = self.context["request"].user
+            validated_data["filename"] = upload.name
+            validated_data["size"] = upload.size
+            validated_data["sha256"] = digest
+            validated_data["file"] = blob.file.name
+            validated_data["blob"] = blob
+            return super().create(validated_data)
+
+
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AttachmentUpload
+        fields = [
+            "id",
+            "issue",
+            "filename",
+            "size",
+            "offset",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = ["id", "issue", "offset", "created_at", "updated_at"]
+
+
+def latest_children(queryset):
+    """Limit a child queryset to the rows embedded in issue payloads."""
+    return queryset.order_by("-created_at", "-id")[:EMBEDDED_CHILDREN_LIMIT]
+
+
+class LatestChildrenListSerializer(serializers.ListSerializer):
+    """
+    Renders the newest ``EMBEDDED_CHILDREN_LIMIT`` children of an issue in the
+    child model's default order. Uses the ``latest_<field>`` attribute set by
+    issue_child_prefetches() when present.
+    """
+
+    def get_attribute(self, instance):
+        prefetched = getattr(instance, f"latest_{self.field_name}", None)
+        if prefetched is not None:
+            return prefetched
+        return latest_children(super().get_attribute(instance).all())
+
+    def to_representation(self, data):
+        items = list(data)
+        ordering = self.child.Meta.model._meta.ordering
+        if ordering and not ordering[0].startswith("-"):
+            items.reverse()
+        return [self.child.to_representation(item) for item in items]
+
+
+def embedded_children(serializer_class):
+    """Read-only field embedding the latest children of an issue."""
+    return LatestChildrenListSerializer(child=serializer_class(), read_only=True)
 
 
 class IssueSerializer(serializers.ModelSerializer):
     submitted_by_details = UserSerializer(source="submitted_by", read_only=True)
     assigned_to_details = UserSerializer(source="assigned_to", read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
-    statuses = IssueStatusSerializer(many=True, read_only=True)
-    attachments = AttachmentSerializer(many=True, read_only=True)
+    comments = embedded_children(CommentSerializer)
+    statuses = embedded_children(IssueStatusSerializer)
+    attachments = embedded_children(AttachmentSerializer)
 
     class Meta:
         model = Issue
@@ -87,6 +188,14 @@ class IssueSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "external_reference",
+            "assigned_at",
+            "first_response_at",
+            "resolved_at",
+            "closed_at",
+            "due_at",
+            "comment_count",
+            "status_count",
+            "attachment_count",
             "submitted_by_details",
             "assigned_to_details",
             "comments",
@@ -107,9 +216,47 @@ class IssueSerializer(serializers.ModelSerializer):
 
 
 class IssueListSerializer(serializers.ModelSerializer):
+    """
+    Slim projection of an issue for list endpoints.
+
+    Clients can narrow the payload with ``?fields=id,title,...`` and opt in to
+    nested children with ``?expand=comments,statuses``.
+    """
+
+    EXPANDABLE_FIELDS = {
+        "comments": CommentSerializer,
+        "statuses": IssueStatusSerializer,
+        "attachments": AttachmentSerializer,
+    }
+
     submitted_by_details = UserSerializer(source="submitted_by", read_only=True)
     assigned_to_details = UserSerializer(source="assigned_to", read_only=True)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+
+        for name in self.get_expand(request):
+            self.fields[name] = embedded_children(self.EXPANDABLE_FIELDS[name])
+
+        requested = parse_csv_param(request, "fields")
+        if requested:
+            for name in set(self.fields) - set(requested) - set(
+                self.get_expand(request)
+            ):
+                self.fields.pop(name)
+
+    @classmethod
+    def get_expand(cls, request):
+        """Return the requested nested collections that can be expanded."""
+        return [
+            name
+            for name in parse_csv_param(request, "expand")
+            if name in cls.EXPANDABLE_FIELDS
+        ]
+
     class Meta:
         model = Issue
         fields = [
@@ -118,9 +265,125 @@ class IssueListSerializer(serializers.ModelSerializer):
             "description",
             "category",
             "priority",
+            "submitted_by",
+            "assigned_to",
             "current_status",
             "created_at",
             "updated_at",
+            "external_reference",
+            "comment_count",
+            "status_count",
+            "attachment_count",
             "submitted_by_details",
             "assigned_to_details",
         ]
+
+
+class HeadlineField(serializers.CharField):
+    """A search headline as escaped HTML with <mark>-highlighted matches."""
+
+    def to_representation(self, value):
+        return render_headline(value)
+
+
+class IssueSearchSerializer(IssueListSerializer):
+    """Issue search hit with its rank and highlighted fragments."""
+
+    rank = serializers.FloatField(read_only=True)
+    title_headline = HeadlineField(read_only=True)
+    description_headline = HeadlineField(read_only=True)
+
+    class Meta(IssueListSerializer.Meta):
+        fields = IssueListSerializer.Meta.fields + [
+            "rank",
+            "title_headline",
+            "description_headline",
+        ]
+
+
+class IssueDuplicateSerializer(IssueListSerializer):
+    """Possible duplicate of an issue, with its estimated text similarity."""
+
+    similarity = serializers.FloatField(read_only=True)
+
+    class Meta(IssueListSerializer.Meta):
+        fields = IssueListSerializer.Meta.fields + ["similarity"]
+
+
+class ArchivedCommentSerializer(serializers.ModelSerializer):
+    user_details = UserSerializer(source="user", read_only=True)
+
+    class Meta:
+        model = ArchivedComment
+        fields = ["id", "content", "created_at", "updated_at", "user_details"]
+
+
+class ArchivedIssueStatusSerializer(serializers.ModelSerializer):
+    updated_by_details = UserSerializer(source="updated_by", read_only=True)
+
+    class Meta:
+        model = ArchivedIssueStatus
+        fields = ["id", "status", "notes", "created_at", "updated_by_details"]
+
+
+class ArchivedAttachmentSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ArchivedAttachment
+        fields = ["id", "filename", "size", "sha256", "created_at", "download_url"]
+
+    def get_download_url(self, obj):
+        url = reverse(
+            "archived-issues-attachment-download",
+            kwargs={"pk": obj.issue_id, "attachment_pk": obj.id},
+        )
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class ArchivedIssueListSerializer(serializers.ModelSerializer):
+    """Read-only projection of an archived issue for list endpoints."""
+
+    submitted_by_details = UserSerializer(source="submitted_by", read_only=True)
+    assigned_to_details = UserSerializer(source="assigned_to", read_only=True)
+
+    class Meta:
+        model = ArchivedIssue
+        fields = [
+            "id",
+            "title",
+            "description",
+            "category",
+            "priority",
+            "submitted_by",
+            "assigned_to",
+            "current_status",
+            "created_at",
+            "updated_at",
+            "external_reference",
+            "assigned_at",
+            "first_response_at",
+            "resolved_at",
+            "closed_at",
+            "archived_at",
+            "comment_count",
+            "status_count",
+            "attachment_count",
+            "submitted_by_details",
+            "assigned_to_details",
+        ]
+        read_only_fields = fields
+
+
+class ArchivedIssueSerializer(ArchivedIssueListSerializer):
+    comments = embedded_children(ArchivedCommentSerializer)
+    statuses = embedded_children(ArchivedIssueStatusSerializer)
+    attachments = embedded_children(ArchivedAttachmentSerializer)
+
+    class Meta(ArchivedIssueListSerializer.Meta):
+        fields = ArchivedIssueListSerializer.Meta.fields + [
+            "comments",
+            "statuses",
+            "attachments",
+        ]
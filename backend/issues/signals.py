@@ -0,0 +1,122 @@
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Issue, IssueStatus, Comment, Attachment, ArchivedAttachment
+from .duplicates import index_issues
+from .search import update_search_vector
+from .renditions import schedule_renditions
+from .uploads import release_blob
+from .workload import adjust_workloads, workload_changes
+
+SEARCHABLE_ISSUE_FIELDS = {"title", "description"}
+WORKLOAD_FIELDS = {"assigned_to", "current_status"}
+
+# Child model -> Issue counter column
+CHILD_COUNTERS = {
+    Comment: "comment_count",
+    IssueStatus: "status_count",
+    Attachment: "attachment_count",
+}
+
+
+@receiver(post_save, sender=Issue)
+def issue_search_vector_handler(sender, instance, update_fields=None, **kwargs):
+    """
+    Refresh the search vector when an issue's searchable text may have changed.
+    """
+    if update_fields and not SEARCHABLE_ISSUE_FIELDS & set(update_fields):
+        return
+    update_search_vector(instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+def issue_signature_handler(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Index a new issue for near-duplicate lookups, and re-index it when its
+    title or description changed.
+    """
+    if update_fields and not SEARCHABLE_ISSUE_FIELDS & set(update_fields):
+        return
+    index_issues([instance], check_unchanged=not created)
+
+
+@receiver(post_save, sender=Issue)
+def issue_workload_handler(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Move the issue between faculty open workload counters when a save changes
+    its assignee or takes it in or out of the open statuses.
+    """
+    if update_fields and not WORKLOAD_FIELDS & set(update_fields):
+        return
+    if created:
+        before = None
+    elif hasattr(instance, "_loaded_workload_owner"):
+        before = instance._loaded_workload_owner
+    else:
+        # Loaded without those fields; recount_workloads repairs the drift
+        return
+    after = instance.workload_owner()
+    adjust_workloads(workload_changes([(before, after)]))
+    instance._loaded_workload_owner = after
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted_workload_handler(sender, instance, **kwargs):
+    """
+    Drop a deleted open issue from its assignee's workload.
+    """
+    adjust_workloads(workload_changes([(instance.workload_owner(), None)]))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_search_vector_handler(sender, instance, **kwargs):
+    """
+    Refresh the parent issue's search vector when its comments change.
+    """
+    update_search_vector(instance.issue_id)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=IssueStatus)
+@receiver(post_save, sender=Attachment)
+def child_created_counter_handler(sender, instance, created, **kwargs):
+    """
+    Increment the parent issue's counter when a child row is inserted.
+    """
+    if created:
+        field = CHILD_COUNTERS[sender]
+        Issue.objects.filter(pk=instance.issue_id).update(**{field: F(field) + 1})
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=IssueStatus)
+@receiver(post_delete, sender=Attachment)
+def child_deleted_counter_handler(sender, instance, **kwargs):
+    """
+    Decrement the parent issue's counter when a child row is deleted.
+    """
+    field = CHILD_COUNTERS[sender]
+    Issue.objects.filter(pk=instance.issue_id, **{f"{field}__gt": 0}).update(
+        **{field: F(field) - 1}
+    )
+
+
+@receiver(post_delete, sender=Attachment)
+@receiver(post_delete, sender=ArchivedAttachment)
+def attachment_blob_release_handler(sender, instance, **kwargs):
+    """
+    Release the attachment's shared content; the last reference deletes it.
+    """
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+
+@receiver(post_save, sender=Attachment)
+def attachment_renditions_handler(sender, instance, created, **kwargs):
+    """
+    Queue thumbnail and preview generation for new image attachments.
+    """
+    if created and instance.blob_id:
+        schedule_renditions(instance.blob)
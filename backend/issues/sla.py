@@ -0,0 +1,124 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Value, When
+from django.utils import timezone
+
+from analytics.models import DashboardStat, UserActivity
+from notifications.models import Notification
+from notifications.services import ADMIN_GROUP, create_notifications
+from .models import Issue, IssueStatus
+
+User = get_user_model()
+
+
+def sla_deadline(start):
+    """SQL expression for the deadline of an SLA clock started at ``start``."""
+    return Case(
+        *[
+            When(priority=priority, then=Value(start + Issue.sla_period(priority)))
+            for priority in settings.ISSUE_SLA_HOURS
+        ],
+        output_field=DateTimeField(),
+    )
+
+
+def escalate_overdue_issues(escalated_by, batch_size=500):
+    """
+    Escalate every issue whose SLA deadline has passed, one transaction per
+    batch. Overdue issues are found with a range scan of the partial due_at
+    index; rows locked by another writer are left for the next run.
+
+    Status history, activity, submitter and registrar notifications are
+    bulk created, as the per-row signal handlers do not run; the registrars
+    are pushed one broadcast per batch. Returns the
+    number of escalated issues.
+    """
+    escalated = 0
+    issue_content_type = ContentType.objects.get_for_model(Issue)
+    admin_ids = list(User.objects.filter(role="ADMIN").values_list("id", flat=True))
+
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            issues = list(
+                Issue.objects.select_for_update(skip_locked=True)
+                .filter(due_at__lt=now)
+                .order_by("due_at")
+                .only("id", "title", "submitted_by_id", "due_at")[:batch_size]
+            )
+            if not issues:
+                break
+
+            Issue.objects.filter(id__in=[issue.id for issue in issues]).update(
+                current_status="ESCALATED",
+                due_at=None,
+                updated_at=now,
+                status_count=F("status_count") + 1,
+            )
+
+            IssueStatus.objects.bulk_create(
+                [
+                    IssueStatus(
+                        issue=issue,
+                        status="ESCALATED",
+                        notes=(
+                            "Escalated: SLA deadline "
+                            f"{issue.due_at:%Y-%m-%d %H:%M} passed"
+                        ),
+                        updated_by=escalated_by,
+                    )
+                    for issue in issues
+                ],
+                batch_size=500,
+            )
+            UserActivity.objects.bulk_create(
+                [
+                    UserActivity(
+                        user=escalated_by,
+                        activity_type="STATUS_CHANGE",
+                        related_issue=issue,
+                        additional_data={"status": "ESCALATED", "sla_breach": True},
+                    )
+                    for issue in issues
+                ],
+                batch_size=500,
+            )
+            DashboardStat.objects.filter(key="dashboard_stats").delete()
+
+            if len(issues) == 1:
+                admin_message = f"Issue escalated: {issues[0].title}"
+            else:
+                admin_message = f"{len(issues)} issues escalated past their SLA"
+            create_notifications(
+                [
+                    Notification(
+                        user_id=admin_id,
+                        content_type=issue_content_type,
+                        object_id=issues[0].id if len(issues) == 1 else None,
+                        message=admin_message,
+                        notification_type="ISSUE_ESCALATED",
+                    )
+                    for admin_id in admin_ids
+                ],
+                group=ADMIN_GROUP,
+            )
+            create_notifications(
+                [
+                    Notification(
+                        user_id=issue.submitted_by_id,
+                        content_type=issue_content_type,
+                        object_id=issue.id,
+                        message=(
+                            f"Status updated to Escalated for your issue: {issue.title}"
+                        ),
+                        notification_type="STATUS_UPDATED",
+                    )
+                    for issue in issues
+                    if issue.submitted_by_id != escalated_by.id
+                ]
+            )
+
+        escalated += len(issues)
+    return escalated
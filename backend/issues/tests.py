@@ -1,3 +1,1498 @@
-from django.test import TestCase
+import hashlib
+import importlib
+import io
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.http import http_date
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+from rest_framework.test import APIClient
+
+from analytics.models import UserActivity
+from notifications.models import Notification
+from realtime.models import ArchivedIssueActivity, IssueActivity
+from .archiving import archive_closed_issues
+from .autoassign import BACKLOG_ORDER, auto_assign_issues
+from . import duplicates, renditions, uploads
+from .models import (
+    ArchivedComment,
+    ArchivedIssue,
+    Attachment,
+    AttachmentBlob,
+    AttachmentUpload,
+    Comment,
+    FacultyWorkload,
+    Issue,
+    IssueSignatureBand,
+    IssueStatus,
+)
+from .serializers import EMBEDDED_CHILDREN_LIMIT
+from .sla import escalate_overdue_issues
+from .views import issues_visible_to
+
+User = get_user_model()
+
+
+class TemporaryMediaMixin:
+    """Stores the files a test case uploads in a directory removed after it."""
+
+    @classmethod
+    def setUpClass(cls):
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root,
+            ATTACHMENT_UPLOAD_TEMP_DIR=f"{media_root}/partial_uploads",
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        super().setUpClass()
+
+
+@skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL's")
+class RoleScopedIndexTests(TestCase):
+    """The role-scoped issue listings are answered from their indexes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        others = [
+            User.objects.create_user(email=f"user{i}@example.com") for i in range(20)
+        ]
+        Issue.objects.bulk_create(
+            [
+                Issue(
+                    title=f"Issue {i}",
+                    description="Seeded",
+                    submitted_by=others[i % len(others)] if i % 50 else cls.student,
+                    assigned_to=cls.faculty if i % 40 == 0 else None,
+                )
+                for i in range(2000)
+            ]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Issue._meta.db_table}")
+
+    def setUp(self):
+        # Penalise plans the indexes do not serve, so the small table still
+        # shows which plan they allow
+        with connection.cursor() as cursor:
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute("SET enable_sort = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+        self.assertNotIn("Sort", plan, "the index should provide the ordering")
+
+    def test_my_issues(self):
+        # my_issues and faculty_issues
+        self.assertUsesIndex(
+            Issue.objects.filter(assigned_to=self.faculty), "issue_assigned_created_idx"
+        )
+
+    def test_submitted_issues(self):
+        # MyIssuesAPIView
+        self.assertUsesIndex(
+            Issue.objects.filter(submitted_by=self.student),
+            "issue_submitted_created_idx",
+        )
+
+    def test_student_list_page(self):
+        queryset = issues_visible_to(self.student).order_by("-created_at", "-id")[:20]
+        self.assertUsesIndex(queryset, "issue_submitted_created_idx")
+
+    def test_assigned_list_page(self):
+        queryset = Issue.objects.filter(assigned_to=self.faculty).order_by(
+            "-created_at", "-id"
+        )[:20]
+        self.assertUsesIndex(queryset, "issue_assigned_created_idx")
+
+    def test_faculty_list_page_avoids_seq_scan(self):
+        # Assigned to or submitted by the faculty member: both indexes combine
+        queryset = issues_visible_to(self.faculty).order_by("-created_at", "-id")[:20]
+        plan = queryset.explain()
+        self.assertNotIn("Seq Scan", plan)
+
+
+class IssueListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        student = User.objects.create_user(email="student@example.com")
+        faculty = User.objects.create_user(email="faculty@example.com", role="FACULTY")
+        for i in range(30):
+            issue = Issue.objects.create(
+                title=f"Issue {i}",
+                description="Listed",
+                submitted_by=student,
+                assigned_to=faculty,
+                external_reference=f"REF-{i}",
+            )
+            Comment.objects.create(issue=issue, user=student, content="Comment")
+            IssueStatus.objects.create(
+                issue=issue, status="ASSIGNED", updated_by=faculty
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        for query in ("", "&expand=comments,statuses"):
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.count_queries(f"/api/issues/?page_size=5{query}"),
+                    self.count_queries(f"/api/issues/?page_size=30{query}"),
+                )
+
+    def test_list_rows_keep_the_dashboard_columns(self):
+        row = self.client.get("/api/issues/").data["results"][0]
+        for field in ("submitted_by", "assigned_to", "external_reference"):
+            self.assertIn(field, row)
+        self.assertNotIn("comments", row)
+
+    def test_sparse_fieldsets(self):
+        row = self.client.get("/api/issues/?fields=id,title").data["results"][0]
+        self.assertEqual(set(row), {"id", "title"})
+
+
+@skipUnless(connection.vendor == "postgresql", "Full-text search is PostgreSQL's")
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.other = User.objects.create_user(email="other@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        cls.in_title = Issue.objects.create(
+            title="Projector broken",
+            description="Room 12 is dark",
+            submitted_by=cls.student,
+            assigned_to=cls.faculty,
+        )
+        cls.in_description = Issue.objects.create(
+            title="Lecture room",
+            description="The projector flickers",
+            submitted_by=cls.other,
+        )
+
+    def search(self, user, text):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get("/api/issues/search/", {"q": text})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_title_matches_rank_first(self):
+        hits = self.search(self.admin, "projector")
+        self.assertEqual(
+            [hit["id"] for hit in hits],
+            [self.in_title.id, self.in_description.id],
+        )
+        self.assertGreater(hits[0]["rank"], hits[1]["rank"])
+        self.assertEqual(hits[0]["title_headline"], "<mark>Projector</mark> broken")
+
+    def test_headlines_escape_user_text(self):
+        issue = Issue.objects.create(
+            title="<script>alert(1)</script> Projector",
+            description='<img src=x onerror="alert(1)"> projector',
+            submitted_by=self.student,
+        )
+        hit = next(
+            hit
+            for hit in self.search(self.student, "projector")
+            if hit["id"] == issue.id
+        )
+        self.assertEqual(
+            hit["title_headline"],
+            "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Projector</mark>",
+        )
+        self.assertNotIn("<img", hit["description_headline"])
+        self.assertIn("<mark>projector</mark>", hit["description_headline"])
+
+    def test_vector_follows_issue_and_comment_edits(self):
+        self.assertEqual(self.search(self.admin, "whiteboard"), [])
+        self.in_description.title = "Whiteboard missing"
+        self.in_description.save()
+        self.assertEqual(
+            [hit["id"] for hit in self.search(self.admin, "whiteboard")],
+            [self.in_description.id],
+        )
+
+        comment = Comment.objects.create(
+            issue=self.in_title, user=self.faculty, content="Replaced the bulb"
+        )
+        self.assertEqual(
+            [hit["id"] for hit in self.search(self.admin, "bulb")], [self.in_title.id]
+        )
+        comment.delete()
+        self.assertEqual(self.search(self.admin, "bulb"), [])
+
+    def test_results_are_scoped_by_role(self):
+        self.assertEqual(
+            [hit["id"] for hit in self.search(self.student, "projector")],
+            [self.in_title.id],
+        )
+        self.assertEqual(
+            [hit["id"] for hit in self.search(self.faculty, "projector")],
+            [self.in_title.id],
+        )
+        self.assertEqual(
+            [hit["id"] for hit in self.search(self.other, "projector")],
+            [self.in_description.id],
+        )
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        # Runs of equal timestamps, so pages must break ties on id
+        created_at = timezone.now()
+        cls.issue_ids = []
+        for i in range(23):
+            issue = Issue.objects.create(
+                title=f"Issue {i}", description="Paged", submitted_by=cls.student
+            )
+            cls.issue_ids.append(issue.id)
+            Comment.objects.create(issue=issue, user=cls.student, content=f"c{i}")
+        Issue.objects.filter(id__in=cls.issue_ids[5:15]).update(created_at=created_at)
+        cls.issue = issue
+        Comment.objects.bulk_create(
+            [
+                Comment(issue=issue, user=cls.student, content=f"tied {i}")
+                for i in range(12)
+            ]
+        )
+        Comment.objects.filter(issue=issue).update(created_at=created_at)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    def test_issue_pages_have_no_gaps_or_duplicates(self):
+        expected = list(
+            Issue.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(self.walk("/api/issues/?page_size=4"), expected)
+
+    def test_issue_created_while_paging_is_not_repeated(self):
+        response = self.client.get("/api/issues/?page_size=10")
+        first_page = [row["id"] for row in response.data["results"]]
+        Issue.objects.create(
+            title="Late", description="Paged", submitted_by=self.student
+        )
+        rest = self.walk(response.data["next"])
+        self.assertEqual(sorted(first_page + rest), sorted(self.issue_ids))
+
+    def test_comment_pages_are_oldest_first(self):
+        expected = list(
+            Comment.objects.filter(issue=self.issue)
+            .order_by("created_at", "id")
+            .values_list("id", flat=True)
+        )
+        url = f"/api/issues/{self.issue.id}/comments/?page_size=5"
+        self.assertEqual(self.walk(url), expected)
+
+    def test_page_numbers_still_count(self):
+        response = self.client.get("/api/issues/?page=2&page_size=10")
+        self.assertEqual(response.data["count"], 23)
+        self.assertEqual(len(response.data["results"]), 10)
+
+
+class BulkAssignTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com",
+            role="FACULTY",
+            first_name="Ada",
+            last_name="Lovelace",
+        )
+        cls.issues = [
+            Issue.objects.create(
+                title=f"Issue {i}", description="Backlog", submitted_by=cls.student
+            )
+            for i in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def bulk_assign(self, issue_ids, faculty_id):
+        return self.client.post(
+            "/api/issues/bulk_assign/",
+            {"issue_ids": issue_ids, "faculty_id": faculty_id},
+            format="json",
+        )
+
+    def test_writes_status_activity_and_notifications(self):
+        ids = [issue.id for issue in self.issues]
+        response = self.bulk_assign(ids + [0], self.faculty.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["not_found"], [0])
+        for issue in Issue.objects.filter(id__in=ids):
+            self.assertEqual(issue.assigned_to, self.faculty)
+            self.assertEqual(issue.current_status, "ASSIGNED")
+            self.assertIsNotNone(issue.assigned_at)
+            self.assertEqual(issue.status_count, 1)
+        statuses = IssueStatus.objects.filter(issue_id__in=ids)
+        self.assertEqual(
+            sorted(statuses.values_list("issue_id", "status", "notes")),
+            [(issue_id, "ASSIGNED", "Assigned to Ada Lovelace") for issue_id in ids],
+        )
+        self.assertEqual(
+            UserActivity.objects.filter(
+                user=self.admin, activity_type="ASSIGNMENT", related_issue_id__in=ids
+            ).count(),
+            3,
+        )
+        # One summary for the assignee, one update per issue for the submitter
+        self.assertEqual(
+            list(
+                Notification.objects.filter(user=self.faculty).values_list(
+                    "notification_type", "message"
+                )
+            ),
+            [("ISSUE_ASSIGNED", "You have been assigned 3 issues")],
+        )
+        self.assertEqual(
+            Notification.objects.filter(
+                user=self.student, notification_type="STATUS_UPDATED"
+            ).count(),
+            3,
+        )
+
+    def test_rejects_non_faculty_assignee(self):
+        response = self.bulk_assign([self.issues[0].id], self.student.id)
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(IssueStatus.objects.exists())
+
+    def test_requires_registrar(self):
+        self.client.force_authenticate(self.faculty)
+        response = self.bulk_assign([self.issues[0].id], self.faculty.id)
+        self.assertEqual(response.status_code, 403)
+
+
+class LifecycleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+
+    def setUp(self):
+        self.issue = Issue.objects.create(
+            title="Lifecycle", description="Stamped", submitted_by=self.student
+        )
+
+    def move(self, status, user, when=None):
+        self.issue.set_status(status, user, when=when)
+        self.issue.save()
+        self.issue.refresh_from_db()
+
+    def test_assigned_at_is_stamped_on_the_first_assignment_only(self):
+        self.move("ASSIGNED", self.admin)
+        assigned_at = self.issue.assigned_at
+        self.assertIsNotNone(assigned_at)
+
+        self.move("IN_PROGRESS", self.faculty)
+        self.move("ASSIGNED", self.admin)
+        self.assertEqual(self.issue.assigned_at, assigned_at)
+
+    def test_first_response_ignores_the_submitter(self):
+        self.move("PENDING_INFO", self.student)
+        self.assertIsNone(self.issue.first_response_at)
+
+        client = APIClient()
+        client.force_authenticate(self.faculty)
+        client.post(
+            f"/api/issues/{self.issue.id}/comments/",
+            {"content": "On it", "issue": self.issue.id},
+            format="json",
+        )
+        self.issue.refresh_from_db()
+        comment = Comment.objects.get(issue=self.issue)
+        self.assertEqual(self.issue.first_response_at, comment.created_at)
+
+        self.move("IN_PROGRESS", self.faculty)
+        self.assertEqual(self.issue.first_response_at, comment.created_at)
+
+    def test_reopening_clears_the_resolution(self):
+        self.move("ASSIGNED", self.admin)
+        self.move("RESOLVED", self.faculty)
+        self.move("CLOSED", self.admin)
+        self.assertIsNotNone(self.issue.resolved_at)
+        self.assertIsNotNone(self.issue.closed_at)
+
+        self.move("IN_PROGRESS", self.faculty)
+        self.assertIsNone(self.issue.resolved_at)
+        self.assertIsNone(self.issue.closed_at)
+        self.assertIsNotNone(self.issue.assigned_at)
+
+        later = timezone.now() + timedelta(hours=1)
+        self.move("RESOLVED", self.faculty, when=later)
+        self.assertEqual(self.issue.resolved_at, later)
+
+    def test_backfill_from_status_history(self):
+        start = timezone.now() - timedelta(days=10)
+        history = [
+            ("ASSIGNED", self.admin),
+            ("RESOLVED", self.faculty),
+            ("IN_PROGRESS", self.faculty),
+            ("RESOLVED", self.faculty),
+            ("CLOSED", self.admin),
+        ]
+        for day, (status, user) in enumerate(history):
+            IssueStatus.objects.filter(
+                pk=IssueStatus.objects.create(
+                    issue=self.issue, status=status, updated_by=user
+                ).pk
+            ).update(created_at=start + timedelta(days=day))
+        reopened = Issue.objects.create(
+            title="Reopened", description="Open again", submitted_by=self.student
+        )
+        comment = Comment.objects.create(
+            issue=reopened, user=self.faculty, content="Looking"
+        )
+        IssueStatus.objects.create(
+            issue=reopened, status="RESOLVED", updated_by=self.faculty
+        )
+        Issue.objects.filter(pk=self.issue.pk).update(current_status="CLOSED")
+        Issue.objects.update(
+            assigned_at=None,
+            first_response_at=None,
+            resolved_at=timezone.now(),
+            closed_at=None,
+        )
+        Issue.objects.filter(pk=reopened.pk).update(current_status="IN_PROGRESS")
+
+        call_command("backfill_issue_lifecycle", stdout=io.StringIO())
+
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.assigned_at, start)
+        self.assertEqual(self.issue.first_response_at, start)
+        self.assertEqual(self.issue.resolved_at, start + timedelta(days=3))
+        self.assertEqual(self.issue.closed_at, start + timedelta(days=4))
+        reopened.refresh_from_db()
+        self.assertIsNone(reopened.resolved_at)
+        self.assertEqual(reopened.first_response_at, comment.created_at)
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        cls.issue = Issue.objects.create(
+            title="Cached",
+            description="Conditional",
+            submitted_by=cls.student,
+            assigned_to=cls.faculty,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.faculty)
+        self.url = f"/api/issues/{self.issue.id}/"
+
+    def test_detail_not_modified(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_if_modified_since(self):
+        response = self.client.get(self.url)
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_child_write_changes_the_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+        Comment.objects.create(issue=self.issue, user=self.student, content="New")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_comment_delete_changes_the_etag(self):
+        comment = Comment.objects.create(
+            issue=self.issue, user=self.student, content="Gone"
+        )
+        etag = self.client.get(self.url)["ETag"]
+        comment.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_stale_if_match_fails_the_precondition(self):
+        response = self.client.get(self.url, HTTP_IF_MATCH='"stale"')
+        self.assertEqual(response.status_code, 412)
+
+        etag = self.client.get(self.url)["ETag"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MATCH=etag).status_code, 200)
+
+    def test_faculty_list_not_modified(self):
+        url = "/api/issues/faculty_issues/"
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Issue.objects.create(
+            title="Another",
+            description="Conditional",
+            submitted_by=self.student,
+            assigned_to=self.faculty,
+        )
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_notices_rows_leaving_it(self):
+        url = "/api/issues/faculty_issues/"
+        leaving = [
+            Issue.objects.create(
+                title=f"Leaving {i}",
+                description="Conditional",
+                submitted_by=self.student,
+                assigned_to=self.faculty,
+            )
+            for i in range(2)
+        ]
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        etag = response["ETag"]
+
+        Issue.objects.filter(pk=leaving[0].pk).update(assigned_to=None)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+        leaving[1].delete()
+        response = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["id"] for row in response.data], [self.issue.id])
+
+    def test_validators_vary_by_user(self):
+        url = "/api/issues/faculty_issues/"
+        etag = self.client.get(url)["ETag"]
+        other = User.objects.create_user(email="other@example.com", role="FACULTY")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ImportExportTests(TestCase):
+    COLUMNS = (
+        "title",
+        "description",
+        "category",
+        "priority",
+        "current_status",
+        "submitted_by__email",
+        "assigned_to__email",
+        "external_reference",
+        "created_at",
+        "assigned_at",
+        "resolved_at",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        student = User.objects.create_user(email="student@example.com")
+        faculty = User.objects.create_user(email="faculty@example.com", role="FACULTY")
+        Issue.objects.create(
+            title="Grade dispute",
+            description="Exam, \"Paper 2\"\nsecond line",
+            category="GRADE_DISPUTE",
+            priority="HIGH",
+            submitted_by=student,
+            assigned_to=faculty,
+            current_status="ASSIGNED",
+            external_reference="REF-1",
+        )
+        Issue.objects.create(
+            title="Unassigned", description="Nobody yet", submitted_by=student
+        )
+        Issue.objects.filter(title="Unassigned").update(
+            created_at=timezone.now() - timedelta(days=400)
+        )
+        Issue.objects.filter(title="Grade dispute").update(
+            assigned_at=timezone.now() - timedelta(days=2)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def rows(self):
+        return sorted(Issue.objects.values_list(*self.COLUMNS))
+
+    def round_trip(self, fmt):
+        before = self.rows()
+        response = self.client.get(f"/api/issues/export/?format={fmt}")
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+
+        Issue.objects.all().delete()
+        response = self.client.post(
+            "/api/issues/import/",
+            {"file": SimpleUploadedFile(f"issues.{fmt}", content)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["errors"], [])
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(self.rows(), before)
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv")
+
+    def test_ndjson_round_trip(self):
+        self.round_trip("ndjson")
+
+    def test_import_reports_bad_rows(self):
+        content = (
+            b'{"title": "Good", "description": "Kept"}\n'
+            b"not json\n"
+            b'{"title": "Bad user", "description": "x", '
+            b'"submitted_by": "nobody@example.com"}\n'
+        )
+        response = self.client.post(
+            "/api/issues/import/",
+            {"file": SimpleUploadedFile("issues.ndjson", content)},
+            format="multipart",
+        )
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual([error["row"] for error in response.data["errors"]], [2, 3])
+        imported = Issue.objects.get(title="Good")
+        self.assertEqual(imported.submitted_by, self.admin)
+        self.assertGreater(imported.due_at, timezone.now())
+
+    def test_lifecycle_timestamps_come_from_the_row_only(self):
+        content = (
+            b'{"title": "Undated", "description": "x", "status": "RESOLVED"}\n'
+            b'{"title": "Dated", "description": "x", "status": "CLOSED", '
+            b'"resolved_at": "2025-01-02T10:00:00Z", '
+            b'"closed_at": "2025-01-03T10:00:00Z"}\n'
+            b'{"title": "Reopened", "description": "x", "status": "IN_PROGRESS", '
+            b'"resolved_at": "2025-01-02T10:00:00Z"}\n'
+        )
+        response = self.client.post(
+            "/api/issues/import/",
+            {"file": SimpleUploadedFile("issues.ndjson", content)},
+            format="multipart",
+        )
+        self.assertEqual(response.data["created"], 3)
+
+        stamps = {
+            title: (resolved_at, closed_at)
+            for title, resolved_at, closed_at in Issue.objects.filter(
+                title__in=["Undated", "Dated", "Reopened"]
+            ).values_list("title", "resolved_at", "closed_at")
+        }
+        self.assertEqual(stamps["Undated"], (None, None))
+        self.assertEqual(
+            [stamp.isoformat() for stamp in stamps["Dated"]],
+            ["2025-01-02T10:00:00+00:00", "2025-01-03T10:00:00+00:00"],
+        )
+        self.assertEqual(stamps["Reopened"], (None, None))
+
+
+class ChildCounterTests(TemporaryMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.issue = Issue.objects.create(
+            title="Counted", description="Children", submitted_by=cls.student
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def assertCounts(self, comments, statuses, attachments):
+        self.issue.refresh_from_db()
+        self.assertEqual(
+            (
+                self.issue.comment_count,
+                self.issue.status_count,
+                self.issue.attachment_count,
+            ),
+            (comments, statuses, attachments),
+        )
+        self.assertEqual(
+            (
+                self.issue.comments.count(),
+                self.issue.statuses.count(),
+                self.issue.attachments.count(),
+            ),
+            (comments, statuses, attachments),
+        )
+
+    def test_counters_follow_writes(self):
+        comments = [
+            Comment.objects.create(issue=self.issue, user=self.student, content=f"{i}")
+            for i in range(3)
+        ]
+        response = self.client.post(
+            f"/api/issues/{self.issue.id}/comments/",
+            {"content": "Through the API", "issue": self.issue.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        IssueStatus.objects.create(
+            issue=self.issue, status="SUBMITTED", updated_by=self.student
+        )
+        response = self.client.post(
+            f"/api/issues/{self.issue.id}/attachments/",
+            {
+                "issue": self.issue.id,
+                "file": SimpleUploadedFile("scan.pdf", b"%PDF scan"),
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertCounts(4, 1, 1)
+
+        comments[0].delete()
+        Comment.objects.filter(id=comments[1].id).delete()
+        Attachment.objects.get().delete()
+        self.assertCounts(2, 1, 0)
+
+    def test_stale_issue_save_keeps_the_counters(self):
+        stale = Issue.objects.get(pk=self.issue.pk)
+        Comment.objects.create(issue=self.issue, user=self.student, content="New")
+        stale.title = "Renamed"
+        stale.save()
+        self.assertCounts(1, 0, 0)
+
+    def test_detail_embeds_a_bounded_page_with_the_total(self):
+        for i in range(EMBEDDED_CHILDREN_LIMIT + 5):
+            Comment.objects.create(issue=self.issue, user=self.student, content=f"{i}")
+        data = self.client.get(f"/api/issues/{self.issue.id}/").data
+        self.assertEqual(len(data["comments"]), EMBEDDED_CHILDREN_LIMIT)
+        self.assertEqual(data["comment_count"], EMBEDDED_CHILDREN_LIMIT + 5)
+
+
+@override_settings(ATTACHMENT_UPLOAD_CHUNK_SIZE=1000)
+class ChunkedUploadTests(TemporaryMediaMixin, TestCase):
+    data = os.urandom(2500)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.issue = Issue.objects.create(
+            title="Uploaded", description="Chunks", submitted_by=cls.student
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        response = self.client.post(
+            f"/api/issues/{self.issue.id}/attachments/uploads/",
+            {"filename": "../scan.pdf", "size": len(self.data)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.url = (
+            f"/api/issues/{self.issue.id}/attachments/uploads/{response.data['id']}/"
+        )
+
+    def put_chunk(self, start, end):
+        return self.client.put(
+            self.url,
+            self.data[start:end],
+            content_type="application/octet-stream",
+            HTTP_UPLOAD_OFFSET=str(start),
+        )
+
+    def test_resumes_from_the_stored_offset(self):
+        self.assertEqual(self.put_chunk(0, 1000).data["offset"], 1000)
+        # A retried chunk is refused with the offset to resume from
+        response = self.put_chunk(0, 1000)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 1000)
+        # Another worker, without this one's running hash, continues
+        uploads._hashers.clear()
+        self.put_chunk(1000, 2000)
+        self.assertEqual(self.client.get(self.url).data["offset"], 2000)
+
+        response = self.client.post(self.url + "finalize/", {}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.put_chunk(2000, 2500)
+        response = self.client.post(
+            self.url + "finalize/",
+            {"checksum": hashlib.sha256(self.data).hexdigest()},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201, response.data)
+        attachment = Attachment.objects.get()
+        self.assertEqual(attachment.filename, "scan.pdf")
+        with attachment.file.open("rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(AttachmentUpload.objects.exists())
+
+    def test_oversized_chunk_is_refused(self):
+        response = self.put_chunk(0, 1001)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data["offset"], 0)
+
+    def test_checksum_mismatch_keeps_the_upload(self):
+        self.put_chunk(0, 1000)
+        self.put_chunk(1000, 2000)
+        self.put_chunk(2000, 2500)
+        response = self.client.post(
+            self.url + "finalize/", {"checksum": "0" * 64}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Attachment.objects.exists())
+        self.assertTrue(AttachmentUpload.objects.exists())
+
+    def test_failed_finalize_keeps_the_upload_and_stores_nothing(self):
+        self.put_chunk(0, 1000)
+        self.put_chunk(1000, 2000)
+        self.put_chunk(2000, 2500)
+        upload = AttachmentUpload.objects.get()
+        with mock.patch.object(
+            Attachment.objects, "create", side_effect=RuntimeError("insert failed")
+        ):
+            with self.assertRaises(RuntimeError):
+                uploads.finalize_upload(upload.pk)
+
+        self.assertFalse(AttachmentBlob.objects.exists())
+        blob_dir = os.path.join(settings.MEDIA_ROOT, "attachments")
+        stored = [name for _, _, names in os.walk(blob_dir) for name in names]
+        self.assertEqual(stored, [])
+        with open(upload.partial_path, "rb") as partial:
+            self.assertEqual(partial.read(), self.data)
+
+        # The client can finalize again, and only then is the partial dropped
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url + "finalize/", {}, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        with Attachment.objects.get().file.open("rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(upload.partial_path))
+
+    def test_other_users_cannot_see_the_upload(self):
+        other = User.objects.create_user(email="other@example.com")
+        self.client.force_authenticate(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        response = self.client.post(
+            f"/api/issues/{self.issue.id}/attachments/uploads/",
+            {"filename": "scan.pdf", "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class AttachmentBlobTests(TemporaryMediaMixin, TestCase):
+    data = os.urandom(5000)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.issues = [
+            Issue.objects.create(
+                title=f"Issue {i}", description="Attached", submitted_by=cls.student
+            )
+            for i in range(2)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def attach(self, issue, data, name="transcript.pdf"):
+        response = self.client.post(
+            f"/api/issues/{issue.id}/attachments/",
+            {"issue": issue.id, "file": SimpleUploadedFile(name, data)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 201)
+        return Attachment.objects.get(id=response.data["id"])
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.attach(self.issues[0], self.data)
+        second = self.attach(self.issues[1], self.data, "copy.pdf")
+
+        blob = AttachmentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.sha256, hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(second.filename, "copy.pdf")
+
+    def test_blob_is_deleted_with_its_last_reference(self):
+        first = self.attach(self.issues[0], self.data)
+        second = self.attach(self.issues[1], self.data)
+        path = first.file.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(AttachmentBlob.objects.get().ref_count, 1)
+        self.assertTrue(os.path.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(AttachmentBlob.objects.exists())
+        self.assertFalse(os.path.exists(path))
+
+    def test_dedupe_command_links_legacy_files(self):
+        for _ in range(2):
+            attachment = Attachment(
+                issue=self.issues[0],
+                uploaded_by=self.student,
+                filename="old.pdf",
+                size=len(self.data),
+            )
+            attachment.file.save("old.pdf", ContentFile(self.data))
+        legacy_paths = [a.file.path for a in Attachment.objects.all()]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("dedupe_attachments", stdout=io.StringIO())
+
+        blob = AttachmentBlob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(
+            set(Attachment.objects.values_list("blob", flat=True)), {blob.id}
+        )
+        self.assertEqual(sum(os.path.exists(p) for p in legacy_paths), 1)
+
+
+class RenditionTests(TemporaryMediaMixin, TestCase):
+    def store(self, data, filename):
+        return uploads.store_blob(
+            hashlib.sha256(data).hexdigest(), len(data), ContentFile(data), filename
+        )
+
+    def test_image_renditions(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (2000, 1000), "red").save(buffer, "PNG")
+        blob = self.store(buffer.getvalue(), "photo.png")
+
+        renditions.generate_renditions(blob.id)
+
+        blob.refresh_from_db()
+        self.assertIsNotNone(blob.rendered_at)
+        for name, box in renditions.RENDITIONS.items():
+            with getattr(blob, name).open("rb") as rendition:
+                with Image.open(rendition) as image:
+                    self.assertEqual(image.format, "WEBP")
+                    self.assertLessEqual(image.size, box)
+        with self.captureOnCommitCallbacks() as callbacks:
+            renditions.schedule_renditions(blob)
+        self.assertEqual(callbacks, [])
+
+    def test_undecodable_content_is_not_requeued(self):
+        blob = self.store(b"not really a picture", "broken.png")
+        with self.captureOnCommitCallbacks() as callbacks:
+            renditions.schedule_renditions(blob)
+        self.assertEqual(len(callbacks), 1)
+
+        with self.assertRaises(OSError):
+            renditions.generate_renditions(blob.id)
+
+        blob = self.store(b"not really a picture", "again.png")
+        self.assertFalse(blob.renderable)
+        self.assertFalse(blob.thumbnail)
+        with self.captureOnCommitCallbacks() as callbacks:
+            renditions.schedule_renditions(blob)
+        self.assertEqual(callbacks, [])
+
+
+class AttachmentDownloadTests(TemporaryMediaMixin, TestCase):
+    data = bytes(range(256)) * 40
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.issue = Issue.objects.create(
+            title="Downloaded", description="Ranges", submitted_by=cls.student
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+        response = self.client.post(
+            f"/api/issues/{self.issue.id}/attachments/",
+            {"issue": self.issue.id, "file": SimpleUploadedFile("a.pdf", self.data)},
+            format="multipart",
+        )
+        self.url = response.data["download_url"]
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        if response.streaming:
+            response.body = b"".join(response.streaming_content)
+        else:
+            response.body = response.content
+        return response
+
+    def test_full_download(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.data)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+    def test_ranges(self):
+        size = len(self.data)
+        for header, start, end in (
+            ("bytes=10-19", 10, 19),
+            ("bytes=-5", size - 5, size - 1),
+            ("bytes=10000-", 10000, size - 1),
+            ("bytes=0-999999", 0, size - 1),
+        ):
+            with self.subTest(header=header):
+                response = self.get(HTTP_RANGE=header)
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(
+                    response["Content-Range"], f"bytes {start}-{end}/{size}"
+                )
+                self.assertEqual(response.body, self.data[start : end + 1])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE=f"bytes={len(self.data)}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(self.data)}")
+
+    def test_if_range(self):
+        etag = self.get()["ETag"]
+        response = self.get(HTTP_RANGE="bytes=1-2", HTTP_IF_RANGE=etag)
+        self.assertEqual(response.status_code, 206)
+        # A stale validator gets the whole, current file
+        response = self.get(HTTP_RANGE="bytes=1-2", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, self.data)
+
+    def test_not_modified(self):
+        etag = self.get()["ETag"]
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.has_header("Content-Disposition"))
+
+    def test_only_readers_of_the_issue_can_download(self):
+        self.client.force_authenticate(
+            User.objects.create_user(email="other@example.com")
+        )
+        self.assertEqual(self.get().status_code, 404)
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        faculty = User.objects.create_user(email="faculty@example.com", role="FACULTY")
+        cls.issue = Issue.objects.create(
+            title="Busy", description="Timeline", submitted_by=cls.student
+        )
+        for i in range(12):
+            Comment.objects.create(issue=cls.issue, user=cls.student, content=f"{i}")
+            IssueActivity.objects.create(
+                issue=cls.issue, user=faculty, activity_type="VIEW"
+            )
+            if i % 4 == 0:
+                IssueStatus.objects.create(
+                    issue=cls.issue, status="IN_PROGRESS", updated_by=faculty
+                )
+        # Ties within and across sources
+        tied = timezone.now()
+        Comment.objects.filter(content__in=["1", "2", "3"]).update(created_at=tied)
+        IssueActivity.objects.filter(
+            id__in=IssueActivity.objects.order_by("id").values("id")[:3]
+        ).update(timestamp=tied)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.student)
+
+    def test_pages_merge_every_source_without_gaps_or_duplicates(self):
+        entries, url = [], f"/api/issues/{self.issue.id}/timeline/?page_size=5"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data["results"]), 5)
+            entries += response.data["results"]
+            url = response.data["next"]
+
+        keys = [(entry["type"], entry["data"]["id"]) for entry in entries]
+        self.assertEqual(len(keys), len(set(keys)))
+        self.assertEqual(len(keys), 12 + 12 + 3)
+        timestamps = [entry["timestamp"] for entry in entries]
+        self.assertEqual(timestamps, sorted(timestamps))
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"/api/issues/{self.issue.id}/timeline/?cursor=x")
+        self.assertEqual(response.status_code, 400)
+
+
+class AutoAssignTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        FacultyWorkload.objects.create(faculty=cls.faculty, max_open_issues=4)
+        cls.issues = [
+            Issue.objects.create(
+                title=f"Issue {i}",
+                description="Backlog",
+                submitted_by=student,
+                priority=["LOW", "URGENT", "HIGH"][i % 3],
+            )
+            for i in range(9)
+        ]
+
+    def test_most_urgent_first_until_capacity(self):
+        assigned, unrouted = auto_assign_issues(self.admin, batch_size=2)
+
+        self.assertEqual(
+            sorted(issue.priority for issue in assigned),
+            ["HIGH", "URGENT", "URGENT", "URGENT"],
+        )
+        # Every other issue is examined once and reported unrouted
+        self.assertEqual(len(unrouted), 5)
+        self.assertEqual(
+            set(unrouted) | {issue.id for issue in assigned},
+            {issue.id for issue in self.issues},
+        )
+
+    def test_capacity_is_read_under_lock(self):
+        with CaptureQueriesContext(connection) as queries:
+            auto_assign_issues(self.admin)
+        workload_reads = [
+            query["sql"]
+            for query in queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "issues_facultyworkload"' in query["sql"]
+            and "open_issues" in query["sql"]
+        ]
+        self.assertTrue(workload_reads)
+        self.assertTrue(all("FOR UPDATE" in sql for sql in workload_reads))
+
+    @skipUnless(connection.vendor == "postgresql", "EXPLAIN plans are PostgreSQL's")
+    def test_backlog_order_comes_from_the_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Issue._meta.db_table}")
+            cursor.execute("SET enable_seqscan = off")
+            cursor.execute("SET enable_sort = off")
+        plan = (
+            Issue.objects.filter(current_status="SUBMITTED", assigned_to__isnull=True)
+            .order_by(*BACKLOG_ORDER)[:500]
+            .explain()
+        )
+        self.assertIn("issue_backlog_idx", plan)
+        self.assertNotIn("Sort", plan)
+
+
+@override_settings(
+    ISSUE_SLA_HOURS={"URGENT": 24, "HIGH": 72, "MEDIUM": 168, "LOW": 336}
+)
+class SlaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+
+    def create_issue(self, **kwargs):
+        return Issue.objects.create(
+            title="Waiting", description="On staff", submitted_by=self.student, **kwargs
+        )
+
+    def test_due_at_follows_the_priority(self):
+        before = timezone.now()
+        issue = self.create_issue(priority="HIGH")
+        self.assertGreaterEqual(issue.due_at, before + timedelta(hours=72))
+        self.assertLessEqual(issue.due_at, timezone.now() + timedelta(hours=72))
+
+    def test_priority_change_keeps_the_clock_start(self):
+        issue = self.create_issue(priority="LOW")
+        started = issue.due_at - timedelta(hours=336)
+
+        issue = Issue.objects.get(pk=issue.pk)
+        issue.priority = "URGENT"
+        issue.save()
+        issue.refresh_from_db()
+        self.assertEqual(issue.due_at, started + timedelta(hours=24))
+
+    def test_clock_stops_outside_sla_statuses(self):
+        issue = self.create_issue()
+        for status in ("PENDING_INFO", "RESOLVED", "CLOSED"):
+            with self.subTest(status=status):
+                issue.set_status(status, self.admin)
+                issue.save()
+                issue.refresh_from_db()
+                self.assertIsNone(issue.due_at)
+
+        # Reopening starts a new clock
+        issue.set_status("IN_PROGRESS", self.admin)
+        issue.save()
+        issue.refresh_from_db()
+        self.assertGreater(issue.due_at, timezone.now() + timedelta(hours=167))
+
+    def test_sweeper_escalates_overdue_issues_once(self):
+        overdue = self.create_issue(priority="URGENT")
+        on_time = self.create_issue(priority="URGENT")
+        Issue.objects.filter(pk=overdue.pk).update(
+            due_at=timezone.now() - timedelta(minutes=1)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(escalate_overdue_issues(self.admin), 1)
+            self.assertEqual(escalate_overdue_issues(self.admin), 0)
+
+        overdue.refresh_from_db()
+        self.assertEqual(overdue.current_status, "ESCALATED")
+        self.assertIsNone(overdue.due_at)
+        self.assertEqual(
+            list(overdue.statuses.values_list("status", flat=True)), ["ESCALATED"]
+        )
+        self.assertEqual(
+            Notification.objects.filter(
+                user=self.admin, notification_type="ISSUE_ESCALATED"
+            ).count(),
+            1,
+        )
+        on_time.refresh_from_db()
+        self.assertEqual(on_time.current_status, "SUBMITTED")
+
+    def test_migration_backfill_starts_open_clocks_now(self):
+        migration = importlib.import_module("issues.migrations.0014_issue_due_at")
+        open_issue = self.create_issue(priority="MEDIUM")
+        closed_issue = self.create_issue(current_status="CLOSED")
+        Issue.objects.update(due_at=None)
+
+        before = timezone.now()
+        migration.backfill_due_at(apps, None)
+
+        open_issue.refresh_from_db()
+        closed_issue.refresh_from_db()
+        self.assertGreaterEqual(open_issue.due_at, before + timedelta(hours=168))
+        self.assertIsNone(closed_issue.due_at)
+
+
+class DuplicateDetectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.original = cls.create_issue(
+            "Exam results missing",
+            "I cannot see my exam results for CS101 on the student portal",
+        )
+        cls.near_duplicate = cls.create_issue(
+            "Exam results missing",
+            "I cannot see my exam results for CS 101 on the student portal yet",
+        )
+        cls.unrelated = cls.create_issue(
+            "Library fine",
+            "I was charged a library fine twice for a book I returned on time",
+        )
+
+    @classmethod
+    def create_issue(cls, title, description):
+        return Issue.objects.create(
+            title=title, description=description, submitted_by=cls.student
+        )
+
+    def test_signatures(self):
+        self.assertIsNone(duplicates.text_signature("", "!!"))
+        signature = duplicates.text_signature("Exam results", "Missing")
+        self.assertEqual(len(signature), duplicates.BANDS * duplicates.ROWS_PER_BAND)
+        self.assertEqual(
+            signature, duplicates.text_signature("exam RESULTS", "missing")
+        )
+        self.assertEqual(len(set(duplicates.band_keys(signature))), duplicates.BANDS)
+
+    def test_near_duplicates_share_bands_and_others_do_not(self):
+        def signature(issue):
+            return duplicates.text_signature(issue.title, issue.description)
+
+        original = signature(self.original)
+        near = signature(self.near_duplicate)
+        unrelated = signature(self.unrelated)
+        self.assertGreaterEqual(
+            duplicates.similarity(original, near), duplicates.DUPLICATE_THRESHOLD
+        )
+        self.assertTrue(
+            set(duplicates.band_keys(original)) & set(duplicates.band_keys(near))
+        )
+        self.assertLess(
+            duplicates.similarity(original, unrelated), duplicates.DUPLICATE_THRESHOLD
+        )
+        self.assertEqual(IssueSignatureBand.objects.count(), 3 * duplicates.BANDS)
+
+    def test_possible_duplicates(self):
+        client = APIClient()
+        client.force_authenticate(self.student)
+        response = client.get(
+            "/api/issues/possible_duplicates/",
+            {
+                "title": "Exam results missing",
+                "description": (
+                    "I cannot see my CS101 exam results on the student portal"
+                ),
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {hit["id"] for hit in response.data},
+            {self.original.id, self.near_duplicate.id},
+        )
+        self.assertTrue(all(hit["similarity"] >= 0.4 for hit in response.data))
+
+    def test_clusters_group_only_near_duplicates(self):
+        self.assertEqual(
+            duplicates.duplicate_clusters(Issue.objects.all()),
+            [sorted([self.original.id, self.near_duplicate.id])],
+        )
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.get("/api/issues/duplicate_clusters/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([cluster["size"] for cluster in response.data], [2])
+
+    def test_oversized_buckets_are_skipped(self):
+        for _ in range(2):
+            self.create_issue(
+                "Exam results missing",
+                "I cannot see my exam results for CS101 on the student portal",
+            )
+        with mock.patch.object(duplicates, "MAX_BUCKET_SIZE", 2):
+            clusters = duplicates.duplicate_clusters(Issue.objects.all())
+        # The three identical issues share every band, each bucket past the cap
+        self.assertEqual(clusters, [])
+
+
+class ArchivingTests(TemporaryMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = student = User.objects.create_user(email="student@example.com")
+        cls.issue = Issue.objects.create(
+            title="Done", description="Archived", submitted_by=student
+        )
+        Comment.objects.create(issue=cls.issue, user=student, content="Thanks")
+        IssueActivity.objects.create(
+            issue=cls.issue, user=student, activity_type="VIEW", data={"seen": True}
+        )
+        Issue.objects.filter(pk=cls.issue.pk).update(
+            current_status="CLOSED", closed_at=timezone.now() - timedelta(days=400)
+        )
+
+    def test_moves_the_issue_with_its_history(self):
+        self.assertEqual(archive_closed_issues(365), 1)
+
+        self.assertFalse(Issue.objects.filter(pk=self.issue.pk).exists())
+        archived = ArchivedIssue.objects.get(pk=self.issue.pk)
+        self.assertEqual(archived.comment_count, 1)
+        self.assertEqual(ArchivedComment.objects.filter(issue=archived).count(), 1)
+        self.assertEqual(
+            list(
+                ArchivedIssueActivity.objects.filter(issue=archived).values_list(
+                    "activity_type", "data"
+                )
+            ),
+            [("VIEW", {"seen": True})],
+        )
+
+    def test_recently_closed_issues_stay(self):
+        self.assertEqual(archive_closed_issues(500), 0)
+        self.assertTrue(Issue.objects.filter(pk=self.issue.pk).exists())
+
+    def test_reopened_issue_is_kept_until_its_latest_closure_ages(self):
+        issue = Issue.objects.create(
+            title="Reopened", description="Closed twice", submitted_by=self.student
+        )
+        long_ago = timezone.now() - timedelta(days=400)
+        issue.set_status("CLOSED", self.admin, when=long_ago)
+        issue.save()
+        issue.set_status("IN_PROGRESS", self.admin)
+        issue.save()
+        self.assertIsNone(issue.closed_at)
+        issue.set_status("CLOSED", self.admin)
+        issue.save()
+
+        self.assertEqual(archive_closed_issues(365), 1)
+        self.assertTrue(Issue.objects.filter(pk=issue.pk).exists())
+
+    def test_notifications_point_at_the_archived_issue(self):
+        notification = Notification.objects.create(
+            user=self.student, content_object=self.issue, message="Closed"
+        )
+        archive_closed_issues(365)
+
+        notification.refresh_from_db()
+        self.assertEqual(
+            notification.content_object, ArchivedIssue.objects.get(pk=self.issue.pk)
+        )
+
+    def test_deleting_archived_attachments_releases_their_blobs(self):
+        data = b"transcript"
+        blob = uploads.store_blob(
+            hashlib.sha256(data).hexdigest(), len(data), ContentFile(data), "t.pdf"
+        )
+        Attachment.objects.create(
+            issue=self.issue,
+            file=blob.file.name,
+            filename="t.pdf",
+            uploaded_by=self.student,
+            blob=blob,
+        )
+        archive_closed_issues(365)
+        # Archived attachments are still served, so they keep the blob
+        self.assertEqual(AttachmentBlob.objects.get().ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ArchivedIssue.objects.get(pk=self.issue.pk).delete()
+        self.assertFalse(AttachmentBlob.objects.exists())
@@ -0,0 +1,100 @@
+import base64
+import binascii
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+
+from django.db.models import Q
+
+from realtime.models import IssueActivity
+from realtime.serializers import IssueActivitySerializer
+from .models import Attachment, Comment, IssueStatus
+from .serializers import AttachmentSerializer, CommentSerializer, IssueStatusSerializer
+
+# Entry type -> (model, timestamp field, related rows to join, serializer). The
+# order breaks ties between entries of different types with equal timestamps.
+TIMELINE_SOURCES = {
+    "status": (IssueStatus, "created_at", ["updated_by"], IssueStatusSerializer),
+    "comment": (Comment, "created_at", ["user"], CommentSerializer),
+    "attachment": (
+        Attachment,
+        "created_at",
+        ["uploaded_by", "blob"],
+        AttachmentSerializer,
+    ),
+    "activity": (IssueActivity, "timestamp", ["user"], IssueActivitySerializer),
+}
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(positions):
+    data = json.dumps(
+        {
+            name: [timestamp.isoformat(), pk]
+            for name, (timestamp, pk) in positions.items()
+        },
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """``{entry type: (timestamp, id)}`` of the last entries already returned."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return {
+            name: (datetime.fromisoformat(timestamp), int(pk))
+            for name, (timestamp, pk) in data.items()
+            if name in TIMELINE_SOURCES
+        }
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def _source_page(issue, name, position, size):
+    model, field, related, _ = TIMELINE_SOURCES[name]
+    queryset = model.objects.filter(issue=issue)
+    if position is not None:
+        timestamp, pk = position
+        queryset = queryset.filter(
+            Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "pk__gt": pk})
+        )
+    return list(queryset.select_related(*related).order_by(field, "pk")[:size])
+
+
+def timeline_page(issue, positions, size, context):
+    """
+    One page of an issue's status changes, comments, attachments and
+    realtime activity, oldest first, after the ``positions`` of a cursor.
+
+    Each source is read with a keyset seek on its ``(issue, timestamp, id)``
+    index for at most ``size + 1`` rows, and the sorted streams are merged
+    lazily; a page costs the same at any depth of the history. Returns the
+    serialized entries and the next positions, or None on the last page.
+    """
+    streams = []
+    for rank, (name, (_, field, _, _)) in enumerate(TIMELINE_SOURCES.items()):
+        rows = _source_page(issue, name, positions.get(name), size + 1)
+        streams.append([(getattr(row, field), rank, row.pk, name, row) for row in rows])
+
+    merged = heapq.merge(*streams, key=lambda entry: entry[:3])
+    page = list(islice(merged, size + 1))
+    page, has_more = page[:size], len(page) > size
+
+    next_positions = dict(positions)
+    entries = []
+    for timestamp, _, pk, name, row in page:
+        next_positions[name] = (timestamp, pk)
+        serializer = TIMELINE_SOURCES[name][3]
+        entries.append(
+            {
+                "type": name,
+                "timestamp": timestamp,
+                "data": serializer(row, context=context).data,
+            }
+        )
+    return entries, next_positions if has_more else None
@@ -0,0 +1,235 @@
+import hashlib
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Attachment, AttachmentBlob, AttachmentUpload
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# upload id -> (sha256 of the first ``offset`` bytes, offset). Lets each chunk
+# extend the digest instead of re-reading the partial file; another worker
+# process rebuilds it from disk on first use.
+_hashers = {}
+
+
+class UploadError(Exception):
+    """A chunk or finalize request that does not fit the upload's state."""
+
+
+def file_sha256(content):
+    """Hex SHA-256 of an uploaded or stored file, read chunk by chunk."""
+    hasher = hashlib.sha256()
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    content.seek(0)
+    return hasher.hexdigest()
+
+
+def store_blob(digest, size, content, filename):
+    """
+    Return the blob holding ``digest`` with one more reference. ``content`` is
+    written to storage only when no attachment has these bytes yet.
+    """
+    with transaction.atomic():
+        blob = AttachmentBlob.objects.select_for_update().filter(sha256=digest).first()
+        if blob is not None:
+            AttachmentBlob.objects.filter(pk=blob.pk).update(
+                ref_count=F("ref_count") + 1
+            )
+            return blob
+
+        blob = AttachmentBlob(sha256=digest, size=size, ref_count=1)
+        blob.file.save(filename, content, save=False)
+        try:
+            with transaction.atomic():
+                blob.save()
+        except IntegrityError:
+            # Stored concurrently by another upload of the same bytes
+            blob.file.delete(save=False)
+            return store_blob(digest, size, content, filename)
+    return blob
+
+
+def release_blob(blob_id):
+    """Drop one reference to a blob, deleting it and its files at zero."""
+    with transaction.atomic():
+        blob = AttachmentBlob.objects.select_for_update().filter(pk=blob_id).first()
+        if blob is None:
+            return
+        if blob.ref_count > 1:
+            blob.ref_count -= 1
+            blob.save(update_fields=["ref_count"])
+            return
+        storage = blob.file.storage
+        names = [
+            field.name for field in (blob.file, blob.thumbnail, blob.preview) if field
+        ]
+        blob.delete()
+
+        def delete_files():
+            for name in names:
+                storage.delete(name)
+
+        transaction.on_commit(delete_files)
+
+
+def start_upload(issue, user, filename, size):
+    """Register a new upload of ``size`` bytes and create its empty partial file."""
+    if size > settings.ATTACHMENT_UPLOAD_MAX_SIZE:
+        raise UploadError(
+            f"Attachments are limited to {settings.ATTACHMENT_UPLOAD_MAX_SIZE} bytes"
+        )
+    upload = AttachmentUpload.objects.create(
+        issue=issue, uploaded_by=user, filename=os.path.basename(filename), size=size
+    )
+    os.makedirs(settings.ATTACHMENT_UPLOAD_TEMP_DIR, exist_ok=True)
+    open(upload.partial_path, "wb").close()
+    return upload
+
+
+def _hasher_for(upload):
+    cached = _hashers.get(upload.id)
+    if cached and cached[1] == upload.offset:
+        return cached[0].copy()
+
+    hasher = hashlib.sha256()
+    remaining = upload.offset
+    with open(upload.partial_path, "rb") as partial:
+        while remaining:
+            block = partial.read(min(READ_BLOCK_SIZE, remaining))
+            if not block:
+                raise UploadError("Partial upload is missing data; restart it")
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _check_chunk(upload, offset, length):
+    if offset != upload.offset:
+        raise UploadError(f"Expected offset {upload.offset}")
+    if offset + length > upload.size:
+        raise UploadError("Chunk extends past the declared upload size")
+
+
+def write_chunk(upload_id, offset, stream, length):
+    """
+    Append ``length`` bytes read from ``stream`` at ``offset``, which must be
+    the number of bytes already received. Returns the updated upload.
+
+    The body is first streamed from the client into a file of its own, with
+    no transaction open, so a slow client holds neither a connection's
+    transaction nor a row lock. The upload row is then locked only while the
+    received bytes are copied into the partial file and the offset advanced,
+    so concurrent retries of the same chunk are applied once. Bytes left past
+    ``offset`` by an interrupted request are overwritten.
+    """
+    if length > settings.ATTACHMENT_UPLOAD_CHUNK_SIZE:
+        raise UploadError(
+            f"Chunks are limited to {settings.ATTACHMENT_UPLOAD_CHUNK_SIZE} bytes"
+        )
+    _check_chunk(AttachmentUpload.objects.get(pk=upload_id), offset, length)
+
+    chunk_path = os.path.join(
+        settings.ATTACHMENT_UPLOAD_TEMP_DIR, f"{upload_id}.{uuid.uuid4().hex}.chunk"
+    )
+    try:
+        received = 0
+        with open(chunk_path, "wb") as chunk:
+            while received < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - received))
+                if not block:
+                    break
+                chunk.write(block)
+                received += len(block)
+        if received != length:
+            raise UploadError("Chunk body is shorter than its Content-Length")
+
+        with transaction.atomic():
+            upload = AttachmentUpload.objects.select_for_update().get(pk=upload_id)
+            # Another request may have applied this chunk while we streamed
+            _check_chunk(upload, offset, length)
+
+            hasher = _hasher_for(upload)
+            with open(chunk_path, "rb") as chunk, open(
+                upload.partial_path, "r+b"
+            ) as partial:
+                partial.seek(offset)
+                while block := chunk.read(READ_BLOCK_SIZE):
+                    partial.write(block)
+                    hasher.update(block)
+                partial.truncate()
+
+            upload.offset += received
+            upload.save(update_fields=["offset", "updated_at"])
+            _hashers[upload.id] = (hasher, upload.offset)
+    finally:
+        if os.path.exists(chunk_path):
+            os.remove(chunk_path)
+    return upload
+
+
+def finalize_upload(upload_id, checksum=None):
+    """
+    Turn a complete upload into an Attachment, verifying ``checksum`` (a hex
+    SHA-256) when the client supplies one. Content that is already stored is
+    shared and the partial file is dropped.
+
+    The partial file is copied into storage rather than moved, and removed
+    only once the attachment is committed. If anything fails before then,
+    the copy is deleted again and the upload can simply be finalized anew.
+    """
+    blob = None
+    try:
+        with transaction.atomic():
+            upload = (
+                AttachmentUpload.objects.select_for_update(of=("self",))
+                .select_related("issue", "uploaded_by")
+                .get(pk=upload_id)
+            )
+            if upload.offset != upload.size:
+                raise UploadError(
+                    f"Upload is incomplete: {upload.offset}/{upload.size} bytes"
+                )
+
+            digest = _hasher_for(upload).hexdigest()
+            if checksum and checksum.lower() != digest:
+                raise UploadError("Checksum does not match the uploaded data")
+
+            with open(upload.partial_path, "rb") as partial:
+                blob = store_blob(digest, upload.size, File(partial), upload.filename)
+            attachment = Attachment.objects.create(
+                issue=upload.issue,
+                uploaded_by=upload.uploaded_by,
+                file=blob.file.name,
+                filename=upload.filename,
+                size=upload.size,
+                sha256=digest,
+                blob=blob,
+            )
+            discard_upload(upload)
+    except Exception:
+        # A blob stored by this call was rolled back with it; its file was not
+        if blob is not None and not (
+            AttachmentBlob.objects.filter(file=blob.file.name).exists()
+        ):
+            blob.file.storage.delete(blob.file.name)
+        raise
+    return attachment
+
+
+def discard_upload(upload):
+    """Delete an upload, and its partial file once the deletion commits."""
+    _hashers.pop(upload.id, None)
+    partial_path = upload.partial_path
+    upload.delete()
+
+    def delete_partial():
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+    transaction.on_commit(delete_partial)
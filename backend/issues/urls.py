@@ -5,11 +5,15 @@ from .views import (
     IssueStatusViewSet,
     CommentViewSet,
     AttachmentViewSet,
+    AttachmentUploadViewSet,
+    ArchivedIssueViewSet,
     my_issues,
     resolve_issue,
 )
 
 router = DefaultRouter()
+# Registered first so "archive/" is not taken for an issue id
+router.register(r"archive", ArchivedIssueViewSet, basename="archived-issues")
 router.register(r"", IssueViewSet, basename="issues")
 
 urlpatterns = [
@@ -31,4 +35,26 @@ urlpatterns = [
         AttachmentViewSet.as_view({"get": "list", "post": "create"}),
         name="issue_attachments",
     ),
+    path(
+        "<int:issue_pk>/attachments/<int:pk>/download/",
+        AttachmentViewSet.as_view({"get": "download"}),
+        name="issue_attachment_download",
+    ),
+    path(
+        "<int:issue_pk>/attachments/uploads/",
+        AttachmentUploadViewSet.as_view({"post": "create"}),
+        name="issue_attachment_uploads",
+    ),
+    path(
+        "<int:issue_pk>/attachments/uploads/<uuid:pk>/",
+        AttachmentUploadViewSet.as_view(
+            {"get": "retrieve", "put": "update", "delete": "destroy"}
+        ),
+        name="issue_attachment_upload",
+    ),
+    path(
+        "<int:issue_pk>/attachments/uploads/<uuid:pk>/finalize/",
+        AttachmentUploadViewSet.as_view({"post": "finalize"}),
+        name="issue_attachment_upload_finalize",
+    ),
 ]
@@ -2,24 +2,71 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.decorators import action
 from rest_framework.views import APIView
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.utils.urls import replace_query_param
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
-from .models import Issue, IssueStatus, Comment, Attachment
+from django.http import StreamingHttpResponse
+from .models import (
+    Issue,
+    IssueStatus,
+    Comment,
+    Attachment,
+    AttachmentUpload,
+    ArchivedIssue,
+    ArchivedIssueStatus,
+    ArchivedComment,
+    ArchivedAttachment,
+    OPEN_STATUSES,
+)
 from .serializers import (
     IssueSerializer,
+    IssueListSerializer,
+    IssueSearchSerializer,
+    IssueDuplicateSerializer,
     IssueStatusSerializer,
     CommentSerializer,
     AttachmentSerializer,
+    AttachmentUploadSerializer,
+    ArchivedIssueSerializer,
+    ArchivedIssueListSerializer,
+    latest_children,
 )
-from notifications.models import (
-    Notification,
-)  # Import from notifications app, not issues
-from django.db.models import Q
+from notifications.services import notify, notify_admins
+from django.db import transaction
+from django.db.models import Q, Prefetch
 from .permissions import IsRegistrar, IsAssignedFaculty
+from .search import search_issues
+from .timeline import InvalidCursor, decode_cursor, encode_cursor, timeline_page
+from .duplicates import duplicate_clusters, find_duplicates
+from .assignment import bulk_assign_issues
+from .autoassign import auto_assign_issues
+from .uploads import (
+    UploadError,
+    discard_upload,
+    finalize_upload,
+    start_upload,
+    write_chunk,
+)
+from .downloads import attachment_response
+from .renditions import RENDITIONS
+from .importing import IMPORT_FORMATS, import_issues, iter_records
+from .exporting import (
+    CSVExportRenderer,
+    NDJSONExportRenderer,
+    stream_csv,
+    stream_ndjson,
+)
+from .caching import (
+    conditional_response,
+    issue_detail_validators,
+    issue_list_validators,
+)
+from users.directory import AmbiguousFacultyName, find_faculty
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
+from utils.pagination import NewestFirstCursorPagination, OldestFirstCursorPagination
 import logging
 
 # Set up logging
@@ -28,15 +75,59 @@ logger = logging.getLogger(__name__)
 User = get_user_model()
 
 
+def issues_visible_to(user, queryset=None):
+    """Issues (hot, or the given archived queryset) the user may read."""
+    if queryset is None:
+        queryset = Issue.objects.all()
+    if user.role == "STUDENT":
+        queryset = queryset.filter(submitted_by=user)
+    elif user.role == "FACULTY":
+        queryset = queryset.filter(Q(assigned_to=user) | Q(submitted_by=user))
+    # Admins can see all issues
+    return queryset
+
+
+def issue_child_prefetches(*names):
+    """
+    Build prefetches for the nested issue collections, joining the users the
+    nested serializers render so each collection costs a single query. Only
+    the embedded children are loaded, into ``latest_<name>`` attributes.
+    """
+    querysets = {
+        "comments": Comment.objects.select_related("user"),
+        "statuses": IssueStatus.objects.select_related("updated_by"),
+        "attachments": Attachment.objects.select_related("blob"),
+    }
+    return [
+        Prefetch(
+            name,
+            queryset=latest_children(queryset),
+            to_attr=f"latest_{name}",
+        )
+        for name, queryset in querysets.items()
+        if not names or name in names
+    ]
+
+
+def issues_with_details(queryset):
+    """Load everything IssueSerializer renders in a constant number of queries."""
+    return queryset.select_related("submitted_by", "assigned_to").prefetch_related(
+        *issue_child_prefetches()
+    )
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def my_issues(request):
     user = request.user
 
     # Filter issues assigned to the logged-in user
-    issues = Issue.objects.filter(assigned_to=user)
-    serializer = IssueSerializer(issues, many=True)
-    return Response(serializer.data)
+    issues = issues_with_details(Issue.objects.filter(assigned_to=user))
+    return conditional_response(
+        request,
+        issue_list_validators(issues, user),
+        lambda: Response(IssueSerializer(issues, many=True).data),
+    )
 
 
 @api_view(["POST"])
@@ -71,27 +162,17 @@ def resolve_issue(request, issue_id):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Mark the issue as resolved
-        issue.current_status = "RESOLVED"
-        issue.save()
-
-        # Create a status update
-        status_update = IssueStatus.objects.create(
-            issue=issue,
-            status="RESOLVED",
-            updated_by=user,
-            notes=request.data.get("notes", "Issue resolved by faculty."),
-        )
+        with transaction.atomic():
+            # Mark the issue as resolved
+            issue.set_status("RESOLVED", user)
+            issue.save()
 
-        # Create notification for the issue submitter
-        if issue.submitted_by != user:
-            Notification.objects.create(
-                user=issue.submitted_by,
-                content_type=ContentType.objects.get_for_model(Issue),
-                object_id=issue.id,
-                message=f"Your issue '{issue.title}' has been resolved",
-                notification_type="ISSUE_RESOLVED",
-                is_read=False,
+            # Create a status update; its handler notifies the submitter
+            IssueStatus.objects.create(
+                issue=issue,
+                status="RESOLVED",
+                updated_by=user,
+                notes=request.data.get("notes", "Issue resolved by faculty."),
             )
 
         return Response(
@@ -113,20 +194,124 @@ class IssueViewSet(viewsets.ModelViewSet):
 
     queryset = Issue.objects.all()
     serializer_class = IssueSerializer
+    pagination_class = NewestFirstCursorPagination
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return IssueListSerializer
+        return IssueSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        queryset = Issue.objects.all()
+        queryset = issues_visible_to(self.request.user).select_related(
+            "submitted_by", "assigned_to"
+        )
 
-        # Filter by user role
-        if user.role == "STUDENT":
-            queryset = queryset.filter(submitted_by=user)
-        elif user.role == "FACULTY":
-            queryset = queryset.filter(Q(assigned_to=user) | Q(submitted_by=user))
-        # Admins can see all issues
+        if self.action == "list":
+            expand = IssueListSerializer.get_expand(self.request)
+            if expand:
+                queryset = queryset.prefetch_related(*issue_child_prefetches(*expand))
+            return queryset
+
+        if self.action in ("retrieve", "update", "partial_update"):
+            return queryset.prefetch_related(*issue_child_prefetches())
 
         return queryset
 
+    def retrieve(self, request, *args, **kwargs):
+        validators = issue_detail_validators(self.get_queryset(), kwargs["pk"])
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+        return conditional_response(
+            request,
+            validators,
+            lambda: super(IssueViewSet, self).retrieve(request, *args, **kwargs),
+        )
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        Full-text search over issue titles, descriptions and comments.
+        """
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            return Response(
+                {"error": "Query parameter 'q' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(int(request.query_params.get("limit", 20)), 100)
+        except ValueError:
+            limit = 20
+
+        issues = search_issues(self.get_queryset(), text)[:limit]
+        serializer = IssueSearchSerializer(
+            issues, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"])
+    def possible_duplicates(self, request):
+        """
+        Open issues, among those visible to the caller, whose text nearly
+        matches a draft's title and description.
+        """
+        title = request.query_params.get("title", "")
+        description = request.query_params.get("description", "")
+        if not title.strip() and not description.strip():
+            return Response(
+                {"error": "Query parameter 'title' or 'description' is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 50)
+        except ValueError:
+            limit = 10
+
+        issues = find_duplicates(
+            self.get_queryset().filter(current_status__in=OPEN_STATUSES),
+            title,
+            description,
+            limit=limit,
+        )
+        serializer = IssueDuplicateSerializer(
+            issues, many=True, context=self.get_serializer_context()
+        )
+        return Response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        permission_classes=[IsAuthenticated, IsRegistrar],
+    )
+    def duplicate_clusters(self, request):
+        """
+        Group open issues into clusters of near duplicates, largest first.
+        """
+        try:
+            min_size = max(int(request.query_params.get("min_size", 2)), 2)
+            limit = min(int(request.query_params.get("limit", 50)), 200)
+        except ValueError:
+            return Response(
+                {"error": "min_size and limit must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.get_queryset().filter(current_status__in=OPEN_STATUSES)
+        clusters = duplicate_clusters(queryset, min_size)[:limit]
+        issues = queryset.in_bulk(
+            [issue_id for cluster in clusters for issue_id in cluster]
+        )
+        data = []
+        for cluster in clusters:
+            members = [issues[issue_id] for issue_id in cluster if issue_id in issues]
+            serializer = IssueListSerializer(
+                members, many=True, context=self.get_serializer_context()
+            )
+            data.append({"size": len(members), "issues": serializer.data})
+        return Response(data)
+
     @action(detail=True, methods=["post"])
     def add_status(self, request, pk=None):
         """
@@ -149,6 +334,33 @@ class IssueViewSet(viewsets.ModelViewSet):
         serializer = IssueStatusSerializer(statuses, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def timeline(self, request, pk=None):
+        """
+        Status changes, comments, attachments and realtime activity of an
+        issue in one stream, oldest first, paged with ``?cursor=``.
+        """
+        issue = self.get_object()
+        cursor = request.query_params.get("cursor")
+        try:
+            positions = decode_cursor(cursor) if cursor else {}
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            page_size = min(int(request.query_params.get("page_size", 50)), 100)
+        except ValueError:
+            page_size = 50
+
+        entries, next_positions = timeline_page(
+            issue, positions, max(page_size, 1), self.get_serializer_context()
+        )
+        next_url = None
+        if next_positions is not None:
+            next_url = replace_query_param(
+                request.build_absolute_uri(), "cursor", encode_cursor(next_positions)
+            )
+        return Response({"next": next_url, "results": entries})
+
     @action(
         detail=True, methods=["post"], permission_classes=[IsAuthenticated, IsRegistrar]
     )
@@ -163,16 +375,17 @@ class IssueViewSet(viewsets.ModelViewSet):
 
         # Handle unassignment
         if faculty_id is None and faculty_name is None:
-            issue.assigned_to = None
-            issue.current_status = "SUBMITTED"  # Or appropriate status
-            issue.save()
-
-            IssueStatus.objects.create(
-                issue=issue,
-                status=issue.current_status,
-                notes="Issue unassigned",
-                updated_by=request.user,
-            )
+            with transaction.atomic():
+                issue.assigned_to = None
+                issue.set_status("SUBMITTED", request.user)  # Or appropriate status
+                issue.save()
+
+                IssueStatus.objects.create(
+                    issue=issue,
+                    status=issue.current_status,
+                    notes="Issue unassigned",
+                    updated_by=request.user,
+                )
 
             return Response(
                 {"message": "Issue unassigned successfully"}, status=status.HTTP_200_OK
@@ -183,16 +396,16 @@ class IssueViewSet(viewsets.ModelViewSet):
 
         # Handle assignment by faculty name
         if faculty_name:
-            # Try to find faculty by name and department
-            faculty_query = Q(first_name__icontains=faculty_name.split()[0])
-
-            if len(faculty_name.split()) > 1:
-                faculty_query |= Q(last_name__icontains=faculty_name.split()[1])
-
-            if department:
-                faculty_query &= Q(department__iexact=department)
-
-            faculty = User.objects.filter(faculty_query, role="FACULTY").first()
+            try:
+                faculty = find_faculty(faculty_name, department)
+            except AmbiguousFacultyName:
+                return Response(
+                    {
+                        "error": f"Faculty name '{faculty_name}' matches several "
+                        "faculty members; give their department or ID"
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
             if not faculty:
                 return Response(
@@ -211,18 +424,17 @@ class IssueViewSet(viewsets.ModelViewSet):
             if isinstance(faculty_id, str) and "-" in faculty_id:
                 parts = faculty_id.split("-")
                 if len(parts) >= 2:
-                    # Try to find faculty by name parts
-                    first_name = parts[0].capitalize()
-                    last_name = parts[1].capitalize()
-                    dept = parts[2].upper() if len(parts) > 2 else None
-
-                    faculty_query = Q(first_name__icontains=first_name) & Q(
-                        last_name__icontains=last_name
-                    )
-                    if dept:
-                        faculty_query &= Q(department__iexact=dept)
-
-                    faculty = User.objects.filter(faculty_query, role="FACULTY").first()
+                    dept = parts[2] if len(parts) > 2 else None
+                    try:
+                        faculty = find_faculty(f"{parts[0]} {parts[1]}", dept)
+                    except AmbiguousFacultyName:
+                        return Response(
+                            {
+                                "error": f"Faculty ID {faculty_id} matches several "
+                                "faculty members"
+                            },
+                            status=status.HTTP_400_BAD_REQUEST,
+                        )
 
                     if not faculty:
                         return Response(
@@ -258,34 +470,197 @@ class IssueViewSet(viewsets.ModelViewSet):
                         status=status.HTTP_404_NOT_FOUND,
                     )
 
-        # Assign the issue to the faculty
-        issue.assigned_to = faculty
-        issue.current_status = "ASSIGNED"
-        issue.save()
-
-        # Create status update
-        IssueStatus.objects.create(
-            issue=issue,
-            status="ASSIGNED",
-            notes=f"Assigned to {faculty.first_name} {faculty.last_name}",
-            updated_by=request.user,
+        with transaction.atomic():
+            # Assign the issue to the faculty
+            issue.assigned_to = faculty
+            issue.set_status("ASSIGNED", request.user)
+            issue.save()
+
+            # Create status update
+            status_update = IssueStatus.objects.create(
+                issue=issue,
+                status="ASSIGNED",
+                notes=f"Assigned to {faculty.first_name} {faculty.last_name}",
+                updated_by=request.user,
+            )
+
+            notify(
+                [faculty],
+                "ISSUE_ASSIGNED",
+                f"You have been assigned to issue: {issue.title}",
+                target=issue,
+                dedupe_key=f"status:{status_update.pk}",
+            )
+
+        return Response(
+            {"message": f"Issue assigned to {faculty.email}", "success": True},
+            status=status.HTTP_200_OK,
         )
 
-        # Create notification for faculty
-        Notification.objects.create(
-            user=faculty,
-            content_type=ContentType.objects.get_for_model(Issue),
-            object_id=issue.id,
-            message=f"You have been assigned to issue: {issue.title}",
-            notification_type="ISSUE_ASSIGNED",
-            is_read=False,
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsRegistrar],
+    )
+    def bulk_assign(self, request):
+        """
+        Assign many issues to a faculty member in one request.
+        """
+        issue_ids = request.data.get("issue_ids")
+        faculty_id = request.data.get("faculty_id")
+
+        if not isinstance(issue_ids, list) or not issue_ids:
+            return Response(
+                {"error": "issue_ids must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            issue_ids = {int(issue_id) for issue_id in issue_ids}
+            faculty_id = int(faculty_id)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "issue_ids and faculty_id must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            faculty = User.objects.get(id=faculty_id, role="FACULTY")
+        except User.DoesNotExist:
+            return Response(
+                {
+                    "error": f"Faculty with ID {faculty_id} not found or is not a faculty member"
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        issues = bulk_assign_issues(issue_ids, faculty, request.user)
+        assigned_ids = sorted(issue.id for issue in issues)
+
+        return Response(
+            {
+                "message": f"{len(assigned_ids)} issues assigned to {faculty.email}",
+                "assigned": assigned_ids,
+                "not_found": sorted(issue_ids - set(assigned_ids)),
+                "success": True,
+            },
+            status=status.HTTP_200_OK,
         )
 
+    @action(
+        detail=True,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsRegistrar],
+    )
+    def auto_assign(self, request, pk=None):
+        """
+        Assign a newly submitted issue to the least loaded eligible faculty member.
+        """
+        issue = self.get_object()
+        if issue.current_status != "SUBMITTED" or issue.assigned_to_id:
+            return Response(
+                {"error": "Only unassigned submitted issues can be auto-assigned"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assigned, _ = auto_assign_issues(request.user, issue_ids=[issue.id])
+        if not assigned:
+            return Response(
+                {"error": "No faculty member is available for this issue"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        faculty = assigned[0].assigned_to
         return Response(
-            {"message": f"Issue assigned to {faculty.email}", "success": True},
+            {
+                "message": f"Issue assigned to {faculty.email}",
+                "assigned_to": faculty.id,
+                "success": True,
+            },
             status=status.HTTP_200_OK,
         )
 
+    @action(
+        detail=False,
+        methods=["post"],
+        permission_classes=[IsAuthenticated, IsRegistrar],
+    )
+    def auto_assign_backlog(self, request):
+        """
+        Auto-assign the unassigned submitted backlog, most urgent first.
+        """
+        limit = request.data.get("limit")
+        try:
+            limit = int(limit) if limit is not None else None
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "limit must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assigned, unrouted = auto_assign_issues(request.user, limit=limit)
+        return Response(
+            {
+                "message": f"{len(assigned)} issues assigned",
+                "assigned": sorted(issue.id for issue in assigned),
+                "unassigned": sorted(unrouted),
+                "success": True,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+        permission_classes=[IsAuthenticated, IsRegistrar],
+    )
+    def import_issues(self, request):
+        """
+        Import issues from an uploaded CSV or NDJSON file.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "A CSV or NDJSON file is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fmt = request.data.get("format") or (
+            "csv" if upload.name.endswith(".csv") else "ndjson"
+        )
+        if fmt not in IMPORT_FORMATS:
+            return Response(
+                {"error": f"Unsupported format: {fmt}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Uploads above FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk and
+        # read back incrementally, one chunk of rows at a time.
+        summary = import_issues(iter_records(upload.open("rb"), fmt), request.user)
+        return Response(summary, status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[CSVExportRenderer, NDJSONExportRenderer],
+    )
+    def export(self, request):
+        """
+        Stream the issues visible to the user as CSV or NDJSON (?format=).
+        """
+        if request.accepted_renderer.format == "ndjson":
+            content, filename = stream_ndjson(self.get_queryset()), "issues.ndjson"
+        else:
+            content, filename = stream_csv(self.get_queryset()), "issues.csv"
+
+        response = StreamingHttpResponse(
+            content, content_type=f"{request.accepted_media_type}; charset=utf-8"
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     @action(detail=False, methods=["get"], permission_classes=[IsAuthenticated])
     def faculty_issues(self, request):
         """
@@ -298,9 +673,12 @@ class IssueViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        issues = Issue.objects.filter(assigned_to=user)
-        serializer = IssueSerializer(issues, many=True)
-        return Response(serializer.data)
+        issues = issues_with_details(Issue.objects.filter(assigned_to=user))
+        return conditional_response(
+            request,
+            issue_list_validators(issues, user),
+            lambda: Response(IssueSerializer(issues, many=True).data),
+        )
 
     @action(
         detail=True,
@@ -312,29 +690,23 @@ class IssueViewSet(viewsets.ModelViewSet):
         issue = self.get_object()
         reason = request.data.get("reason", "No reason provided")
 
-        issue.current_status = "ESCALATED"
-        issue.save()
+        with transaction.atomic():
+            issue.set_status("ESCALATED", request.user)
+            issue.save()
 
-        # Create status update
-        IssueStatus.objects.create(
-            issue=issue,
-            status="ESCALATED",
-            notes=f"Escalated: {reason}",
-            updated_by=request.user,
-        )
+            # Create status update
+            status_update = IssueStatus.objects.create(
+                issue=issue,
+                status="ESCALATED",
+                notes=f"Escalated: {reason}",
+                updated_by=request.user,
+            )
 
-        # Get ContentType for Issue model
-        issue_content_type = ContentType.objects.get_for_model(Issue)
-
-        # Create notification for admins
-        for admin in User.objects.filter(role="ADMIN"):
-            Notification.objects.create(
-                user=admin,
-                content_type=issue_content_type,
-                object_id=issue.id,
-                message=f"Issue escalated: {issue.title}",
-                notification_type="ISSUE_ESCALATED",
-                is_read=False,
+            notify_admins(
+                "ISSUE_ESCALATED",
+                f"Issue escalated: {issue.title}",
+                target=issue,
+                dedupe_key=f"status:{status_update.pk}",
             )
 
         return Response(
@@ -349,22 +721,26 @@ class IssueStatusViewSet(viewsets.ModelViewSet):
 
     serializer_class = IssueStatusSerializer
     permission_classes = [permissions.IsAuthenticated, IsAssignedFaculty]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         issue_id = self.kwargs.get("issue_pk")
-        return IssueStatus.objects.filter(issue_id=issue_id)
+        return IssueStatus.objects.filter(issue_id=issue_id).select_related(
+            "updated_by"
+        )
 
     def perform_create(self, serializer):
         issue_id = self.kwargs.get("issue_pk")
         issue = get_object_or_404(Issue, id=issue_id)
 
-        # Update the issue's current status
-        status_value = serializer.validated_data.get("status")
-        issue.current_status = status_value
-        issue.save()
+        with transaction.atomic():
+            # Update the issue's current status
+            status_value = serializer.validated_data.get("status")
+            issue.set_status(status_value, self.request.user)
+            issue.save()
 
-        # Save the status update
-        serializer.save(issue=issue, updated_by=self.request.user)
+            # Save the status update
+            serializer.save(issue=issue, updated_by=self.request.user)
 
 
 class CommentViewSet(viewsets.ModelViewSet):
@@ -374,37 +750,23 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OldestFirstCursorPagination
 
     def get_queryset(self):
         issue_id = self.kwargs.get("issue_pk")
-        return Comment.objects.filter(issue_id=issue_id)
+        return Comment.objects.filter(issue_id=issue_id).select_related("user")
 
     def perform_create(self, serializer):
         issue_id = self.kwargs.get("issue_pk")
         issue = get_object_or_404(Issue, id=issue_id)
 
-        # Save the comment
+        # Save the comment; its post_save handler notifies the submitter and assignee
         comment = serializer.save(issue=issue, user=self.request.user)
 
-        # Get ContentType for Issue model
-        issue_content_type = ContentType.objects.get_for_model(Issue)
-
-        # Create notification for the issue submitter and assignee
-        recipients = []
-        if issue.submitted_by != self.request.user:
-            recipients.append(issue.submitted_by)
-
-        if issue.assigned_to and issue.assigned_to != self.request.user:
-            recipients.append(issue.assigned_to)
-
-        for recipient in recipients:
-            Notification.objects.create(
-                user=recipient,
-                content_type=issue_content_type,
-                object_id=issue.id,
-                message=f"New comment on issue: {issue.title}",
-                notification_type="COMMENT_ADDED",
-                is_read=False,  # Use is_read instead of read
+        # The first comment from anyone but the submitter is the first response
+        if issue.first_response_at is None and issue.submitted_by != self.request.user:
+            Issue.objects.filter(pk=issue.pk, first_response_at__isnull=True).update(
+                first_response_at=comment.created_at
             )
 
 
@@ -415,22 +777,190 @@ class AttachmentViewSet(viewsets.ModelViewSet):
 
     serializer_class = AttachmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         issue_id = self.kwargs.get("issue_pk")
-        return Attachment.objects.filter(issue_id=issue_id)
+        return Attachment.objects.filter(issue_id=issue_id).select_related("blob")
 
     def perform_create(self, serializer):
         issue_id = self.kwargs.get("issue_pk")
         issue = get_object_or_404(Issue, id=issue_id)
         serializer.save(issue=issue, uploaded_by=self.request.user)
 
+    def download(self, request, *args, **kwargs):
+        """
+        Download an attachment of an issue the user can see, or one of its
+        image renditions with ?rendition=thumbnail|preview.
+        """
+        attachment = get_object_or_404(
+            Attachment.objects.select_related("blob"),
+            pk=self.kwargs["pk"],
+            issue_id=self.kwargs.get("issue_pk"),
+            issue__in=issues_visible_to(request.user),
+        )
+
+        rendition = request.query_params.get("rendition")
+        if rendition:
+            if rendition not in RENDITIONS:
+                return Response(
+                    {"error": f"Unknown rendition: {rendition}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if attachment.blob is None or not getattr(attachment.blob, rendition):
+                return Response(
+                    {"error": "Rendition not available"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+        return attachment_response(request, attachment, rendition)
+
+
+class AttachmentUploadViewSet(viewsets.GenericViewSet):
+    """
+    Resumable attachment uploads: create the upload, PUT raw chunks at the
+    offset reported by the server, then finalize it into an attachment.
+    """
+
+    serializer_class = AttachmentUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return AttachmentUpload.objects.filter(
+            issue_id=self.kwargs.get("issue_pk"), uploaded_by=self.request.user
+        )
+
+    def upload_response(self, upload, status_code=status.HTTP_200_OK):
+        response = Response(self.get_serializer(upload).data, status=status_code)
+        response["Upload-Offset"] = upload.offset
+        return response
+
+    def create(self, request, *args, **kwargs):
+        issue = get_object_or_404(
+            issues_visible_to(request.user), id=self.kwargs.get("issue_pk")
+        )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            upload = start_upload(
+                issue,
+                request.user,
+                serializer.validated_data["filename"],
+                serializer.validated_data["size"],
+            )
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return self.upload_response(upload, status.HTTP_201_CREATED)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.upload_response(self.get_object())
+
+    def update(self, request, *args, **kwargs):
+        """
+        Append the raw request body at the ``Upload-Offset`` header (or
+        ``?offset=``). The body is streamed to disk, never buffered whole.
+        """
+        upload = self.get_object()
+        try:
+            offset = int(
+                request.headers.get("Upload-Offset")
+                or request.query_params.get("offset", "")
+            )
+            length = int(request.headers.get("Content-Length", ""))
+        except ValueError:
+            return Response(
+                {"error": "Upload-Offset and Content-Length headers are required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            upload = write_chunk(upload.pk, offset, request.stream, length)
+        except UploadError as e:
+            upload.refresh_from_db()
+            return Response(
+                {"error": str(e), "offset": upload.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return self.upload_response(upload)
+
+    def destroy(self, request, *args, **kwargs):
+        discard_upload(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, *args, **kwargs):
+        """
+        Create the attachment from a complete upload, optionally checking the
+        client's SHA-256 in ``checksum``.
+        """
+        upload = self.get_object()
+        try:
+            attachment = finalize_upload(upload.pk, request.data.get("checksum"))
+        except UploadError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            AttachmentSerializer(
+                attachment, context=self.get_serializer_context()
+            ).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ArchivedIssueViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Read-only access to archived issues, scoped by role like live issues.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NewestFirstCursorPagination
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return ArchivedIssueListSerializer
+        return ArchivedIssueSerializer
+
+    def get_queryset(self):
+        queryset = issues_visible_to(
+            self.request.user, ArchivedIssue.objects.all()
+        ).select_related("submitted_by", "assigned_to")
+        if self.action == "retrieve":
+            children = {
+                "comments": ArchivedComment.objects.select_related("user"),
+                "statuses": ArchivedIssueStatus.objects.select_related("updated_by"),
+                "attachments": ArchivedAttachment.objects.all(),
+            }
+            queryset = queryset.prefetch_related(
+                *[
+                    Prefetch(
+                        name,
+                        queryset=latest_children(children_queryset),
+                        to_attr=f"latest_{name}",
+                    )
+                    for name, children_queryset in children.items()
+                ]
+            )
+        return queryset
+
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"attachments/(?P<attachment_pk>\d+)/download",
+        url_name="attachment-download",
+    )
+    def download_attachment(self, request, pk=None, attachment_pk=None):
+        """
+        Download an attachment of an archived issue.
+        """
+        attachment = get_object_or_404(
+            ArchivedAttachment, pk=attachment_pk, issue=self.get_object()
+        )
+        return attachment_response(request, attachment)
+
 
 class MyIssuesAPIView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
         user = request.user
-        my_issues = Issue.objects.filter(submitted_by=user)
+        my_issues = issues_with_details(Issue.objects.filter(submitted_by=user))
         serializer = IssueSerializer(my_issues, many=True)
         return Response(serializer.data)
@@ -0,0 +1,85 @@
+from collections import Counter, defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, F
+from django.db.models.functions import Greatest
+
+from .models import OPEN_STATUSES, FacultyWorkload, Issue
+
+User = get_user_model()
+
+
+def workload_changes(changes):
+    """
+    Net per-user change in open issues for ``(owner_before, owner_after)``
+    pairs, as returned by Issue.workload_owner().
+    """
+    deltas = Counter()
+    for before, after in changes:
+        if before != after:
+            if before is not None:
+                deltas[before] -= 1
+            if after is not None:
+                deltas[after] += 1
+    return {user_id: delta for user_id, delta in deltas.items() if delta}
+
+
+def adjust_workloads(deltas):
+    """Apply ``{user_id: delta}`` to the open issue counters."""
+    if not deltas:
+        return
+    FacultyWorkload.objects.bulk_create(
+        [FacultyWorkload(faculty_id=user_id) for user_id in deltas],
+        ignore_conflicts=True,
+    )
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        FacultyWorkload.objects.filter(faculty_id__in=user_ids).update(
+            open_issues=Greatest(F("open_issues") + delta, 0)
+        )
+
+
+def ensure_faculty_workloads():
+    """Create the missing workload rows of faculty members."""
+    FacultyWorkload.objects.bulk_create(
+        [
+            FacultyWorkload(faculty_id=user_id)
+            for user_id in User.objects.filter(
+                role="FACULTY", workload__isnull=True
+            ).values_list("id", flat=True)
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def recount_workloads():
+    """
+    Recompute every open issue counter from the issues table, to repair
+    counters after writes that bypass the handlers. Returns the number of
+    corrected counters.
+    """
+    with transaction.atomic():
+        ensure_faculty_workloads()
+        counts = dict(
+            Issue.objects.filter(
+                current_status__in=OPEN_STATUSES, assigned_to__isnull=False
+            )
+            .order_by()
+            .values_list("assigned_to")
+            .annotate(count=Count("id"))
+        )
+        stored = dict(
+            FacultyWorkload.objects.select_for_update().values_list(
+                "faculty_id", "open_issues"
+            )
+        )
+        deltas = {
+            user_id: counts.get(user_id, 0) - stored.get(user_id, 0)
+            for user_id in counts.keys() | stored.keys()
+        }
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        adjust_workloads(deltas)
+    return len(deltas)
@@ -4,8 +4,8 @@ from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
-from .models import Notification
 from .serializers import NotificationSerializer
+from .services import ADMIN_GROUP, mark_read, unread_counts
 
 User = get_user_model()
 
@@ -40,6 +40,11 @@ class NotificationConsumer(AsyncWebsocketConsumer):
                 self.notification_group, self.channel_name
             )
 
+            # Admins also receive notifications broadcast to all of them
+            if self.user.role == "ADMIN":
+                self.admin_group = ADMIN_GROUP
+                await self.channel_layer.group_add(self.admin_group, self.channel_name)
+
             await self.accept()
 
             # Send initial unread count
@@ -60,32 +65,22 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             await self.channel_layer.group_discard(
                 self.notification_group, self.channel_name
             )
+        if hasattr(self, "admin_group"):
+            await self.channel_layer.group_discard(self.admin_group, self.channel_name)
 
     async def receive(self, text_data):
         try:
             data = json.loads(text_data)
             message_type = data.get("type")
 
+            # The new unread count is pushed to the notification group
             if message_type == "mark_as_read":
                 notification_id = data.get("id")
                 if notification_id:
                     await self.mark_as_read(notification_id)
 
-                    # Send updated unread count
-                    unread_count = await self.get_unread_count()
-                    await self.send(
-                        text_data=json.dumps(
-                            {"type": "unread_count", "count": unread_count}
-                        )
-                    )
-
             elif message_type == "mark_all_as_read":
                 await self.mark_all_as_read()
-
-                # Send updated unread count
-                await self.send(
-                    text_data=json.dumps({"type": "unread_count", "count": 0})
-                )
         except json.JSONDecodeError:
             pass
         except Exception as e:
@@ -99,6 +94,24 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             )
         )
 
+    async def broadcast_notification_message(self, event):
+        # Send this user's copy of a notification broadcast to their group
+        notification_id = event["ids"].get(str(self.user.id))
+        if notification_id is None:
+            return
+        notification = dict(
+            event["notification"], id=notification_id, user=self.user.id
+        )
+        await self.send(
+            text_data=json.dumps(
+                {"type": "notification_message", "notification": notification}
+            )
+        )
+        unread_count = await self.get_unread_count()
+        await self.send(
+            text_data=json.dumps({"type": "unread_count", "count": unread_count})
+        )
+
     async def unread_count_message(self, event):
         # Send unread count to WebSocket
         await self.send(
@@ -114,23 +127,15 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_unread_count(self):
-        # Updated to use is_read
-        return Notification.objects.filter(user=self.user, is_read=False).count()
+        return unread_counts([self.user.id])[self.user.id]
 
     @database_sync_to_async
     def mark_as_read(self, notification_id):
-        try:
-            notification = Notification.objects.get(id=notification_id, user=self.user)
-            notification.is_read = True  # Updated to use is_read
-            notification.save(update_fields=["is_read"])  # Updated to use is_read
-            return True
-        except Notification.DoesNotExist:
-            return False
+        return mark_read(self.user, [notification_id]) > 0
 
     @database_sync_to_async
     def mark_all_as_read(self):
-        # Updated to use is_read
-        Notification.objects.filter(user=self.user, is_read=False).update(is_read=True)
+        mark_read(self.user)
         return True
 
 
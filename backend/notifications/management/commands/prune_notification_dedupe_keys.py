@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from notifications.services import prune_dedupe_keys
+
+
+class Command(BaseCommand):
+    help = "Deletes expired notification dedupe keys; run it periodically"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of keys deleted per transaction",
+        )
+
+    def handle(self, *args, **options):
+        deleted = prune_dedupe_keys(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} dedupe keys"))
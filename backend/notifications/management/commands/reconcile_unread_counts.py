@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifications.services import reconcile_unread_counts
+
+
+class Command(BaseCommand):
+    help = "Recomputes the unread notification counters from the notifications table"
+
+    def handle(self, *args, **options):
+        corrected = reconcile_unread_counts()
+        self.stdout.write(self.style.SUCCESS(f"Corrected {corrected} counters"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-18 10:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0008_notification_event_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='unreadcounter',
+            name='read_up_to',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2 on 2026-10-18 10:57
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_dedupe_keys(apps, schema_editor):
+    Notification = apps.get_model("notifications", "Notification")
+    NotificationDedupeKey = apps.get_model("notifications", "NotificationDedupeKey")
+    NotificationDedupeKey.objects.bulk_create(
+        [
+            NotificationDedupeKey(notification_id=pk, user_id=user_id, key=key)
+            for pk, user_id, key in Notification.objects.exclude(
+                dedupe_key=""
+            ).values_list("pk", "user_id", "dedupe_key")
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0009_unreadcounter_read_up_to'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationDedupeKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=100)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notificationdedupekey',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dedupe_keys', to='notifications.notification'),
+        ),
+        migrations.AddField(
+            model_name='notificationdedupekey',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationdedupekey',
+            constraint=models.UniqueConstraint(fields=('user', 'key'), name='notification_dedupe_user_key_uniq'),
+        ),
+        migrations.RunPython(copy_dedupe_keys, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name='notification',
+            name='notification_user_dedupe_key_uniq',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='dedupe_key',
+        ),
+    ]
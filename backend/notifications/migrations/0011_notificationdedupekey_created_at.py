@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 14:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0010_notificationdedupekey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notificationdedupekey',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -29,13 +29,72 @@ class Notification(models.Model):
     )
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Number of events merged into this notification by coalescing
+    event_count = models.PositiveIntegerField(default=1, editable=False)
 
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["user", "is_read", "created_at"]),
+            models.Index(fields=["user", "created_at", "id"]),
             models.Index(fields=["content_type", "object_id"]),
         ]
 
     def __str__(self):
         return f"Notification for {self.user.email}: {self.message[:50]}"
+
+
+class NotificationDedupeKey(models.Model):
+    """
+    The key of an event a user was notified of, so each recipient gets it
+    once. A notification has one per keyed event it carries, several when
+    coalescing merged events into it.
+
+    Keys are only needed while the event can still be reported again, so
+    prune_dedupe_keys() deletes those older than
+    NOTIFICATION_DEDUPE_SECONDS to keep the table and its unique index small.
+    """
+
+    notification = models.ForeignKey(
+        Notification, on_delete=models.CASCADE, related_name="dedupe_keys"
+    )
+    # Copied from the notification for the uniqueness constraint
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    key = models.CharField(max_length=100)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "key"], name="notification_dedupe_user_key_uniq"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key}"
+
+
+class UnreadCounter(models.Model):
+    """
+    A user's number of unread notifications, kept in step by
+    notifications.services so badge counts are a primary key lookup, and
+    their read watermark.
+
+    A notification is read when it is flagged is_read or was created at or
+    before ``read_up_to``, so marking everything read is a write to this row
+    rather than to each notification.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="unread_counter",
+    )
+    count = models.PositiveIntegerField(default=0)
+    read_up_to = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.user.email}: {self.count} unread"
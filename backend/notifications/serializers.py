@@ -5,6 +5,7 @@ from django.contrib.contenttypes.models import ContentType
 
 class NotificationSerializer(serializers.ModelSerializer):
     content_type_str = serializers.SerializerMethodField()
+    is_read = serializers.SerializerMethodField()
 
     class Meta:
         model = Notification
@@ -17,6 +18,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "message",
             "notification_type",
             "is_read",
+            "event_count",
             "created_at",
         ]
         read_only_fields = [
@@ -27,6 +29,8 @@ class NotificationSerializer(serializers.ModelSerializer):
             "object_id",
             "message",
             "notification_type",
+            "is_read",
+            "event_count",
             "created_at",
         ]
 
@@ -34,3 +38,9 @@ class NotificationSerializer(serializers.ModelSerializer):
         if obj.content_type:
             return f"{obj.content_type.app_label}.{obj.content_type.model}"
         return None
+
+    def get_is_read(self, obj):
+        # Rows at or before the recipient's read watermark (passed in the
+        # context as "read_up_to") are read without being flagged
+        read_up_to = self.context.get("read_up_to")
+        return obj.is_read or (read_up_to is not None and obj.created_at <= read_up_to)
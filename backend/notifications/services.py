@@ -0,0 +1,462 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import Notification, NotificationDedupeKey, UnreadCounter
+from .serializers import NotificationSerializer
+
+User = get_user_model()
+
+# WebSocket group every connected admin joins, for notifications sent to all
+# of them
+ADMIN_GROUP = "notifications_admins"
+
+# Notification type -> message of a notification merging several events,
+# formatted with the event count and the target
+COALESCED_MESSAGES = {
+    "COMMENT_ADDED": "{count} new comments on issue: {target.title}",
+}
+# Priorities whose notifications are never merged
+COALESCE_BYPASS_PRIORITIES = {"URGENT"}
+
+
+def notify(
+    recipients,
+    notification_type,
+    message,
+    target=None,
+    dedupe_key="",
+    exclude=None,
+    group=None,
+):
+    """
+    Notify each distinct user in ``recipients`` (users or ids) of an event,
+    except ``exclude`` (usually whoever caused it).
+
+    ``dedupe_key`` identifies the event: recipients already notified under
+    it are skipped and a NotificationDedupeKey records it for the others, so
+    the event is notified once however many code paths report it within
+    NOTIFICATION_DEDUPE_SECONDS. The rows are bulk created and pushed over
+    the WebSocket once per recipient after commit, or in one message to
+    ``group`` when the recipients are its members.
+
+    Events of a type in COALESCED_MESSAGES are merged into a recipient's
+    unread notification of the same type about the same target from within
+    NOTIFICATION_COALESCE_SECONDS, except for urgent issues. Returns the
+    created and merged notifications.
+    """
+    user_ids = {getattr(user, "pk", user) for user in recipients}
+    user_ids -= {None, getattr(exclude, "pk", exclude)}
+    if dedupe_key and user_ids:
+        user_ids -= set(
+            NotificationDedupeKey.objects.filter(
+                user_id__in=user_ids, key=dedupe_key
+            ).values_list("user_id", flat=True)
+        )
+    if not user_ids:
+        return []
+
+    content_type = None
+    if target is not None:
+        content_type = ContentType.objects.get_for_model(target)
+    try:
+        with transaction.atomic():
+            notifications = []
+            if _coalesces(notification_type, target):
+                notifications = _coalesce(user_ids, notification_type, target)
+            new_user_ids = user_ids - {n.user_id for n in notifications}
+            if new_user_ids:
+                notifications += create_notifications(
+                    [
+                        Notification(
+                            user_id=user_id,
+                            content_type=content_type,
+                            object_id=target.pk if target is not None else None,
+                            message=message,
+                            notification_type=notification_type,
+                        )
+                        for user_id in sorted(new_user_ids)
+                    ],
+                    group=group,
+                )
+            if dedupe_key:
+                NotificationDedupeKey.objects.bulk_create(
+                    [
+                        NotificationDedupeKey(
+                            notification=notification,
+                            user_id=notification.user_id,
+                            key=dedupe_key,
+                        )
+                        for notification in notifications
+                    ],
+                    batch_size=500,
+                )
+            return notifications
+    except IntegrityError:
+        # The same event was notified concurrently; skip who got it
+        return notify(
+            user_ids, notification_type, message, target, dedupe_key, group=group
+        )
+
+
+def _coalesces(notification_type, target):
+    return (
+        settings.NOTIFICATION_COALESCE_SECONDS > 0
+        and notification_type in COALESCED_MESSAGES
+        and target is not None
+        and getattr(target, "priority", None) not in COALESCE_BYPASS_PRIORITIES
+    )
+
+
+def _coalesce(user_ids, notification_type, target):
+    """
+    Merge an event into each recipient's newest unread notification of the
+    same type about ``target`` inside the coalescing window, found with a
+    range scan of the ``(user, is_read, created_at)`` index. The merged rows
+    keep their id, position and the dedupe keys of the events already in
+    them, and are pushed again after commit without an unread count update
+    as they were already unread. Returns them.
+    """
+    since = timezone.now() - timedelta(seconds=settings.NOTIFICATION_COALESCE_SECONDS)
+    with transaction.atomic():
+        # Locked so a concurrent mark-all cannot read the row being merged into
+        watermarks = read_watermarks(user_ids, lock=True)
+        latest = {}
+        for notification in (
+            Notification.objects.select_for_update()
+            .filter(
+                user_id__in=user_ids,
+                is_read=False,
+                created_at__gte=since,
+                notification_type=notification_type,
+                content_type=ContentType.objects.get_for_model(target),
+                object_id=target.pk,
+            )
+            .order_by("created_at", "id")
+        ):
+            read_up_to = watermarks.get(notification.user_id)
+            if read_up_to is None or notification.created_at > read_up_to:
+                latest[notification.user_id] = notification
+        if not latest:
+            return []
+
+        merged = list(latest.values())
+        for notification in merged:
+            notification.event_count += 1
+            notification.message = COALESCED_MESSAGES[notification_type].format(
+                count=notification.event_count, target=target
+            )
+        Notification.objects.bulk_update(merged, ["event_count", "message"])
+    transaction.on_commit(lambda: push_notifications(merged, with_counts=False))
+    return merged
+
+
+def prune_dedupe_keys(batch_size=5000):
+    """
+    Delete the dedupe keys older than NOTIFICATION_DEDUPE_SECONDS, a range of
+    the ``created_at`` index, in batches so no transaction holds many row
+    locks. Returns the number of deleted keys.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.NOTIFICATION_DEDUPE_SECONDS)
+    deleted = 0
+    while True:
+        ids = list(
+            NotificationDedupeKey.objects.filter(created_at__lt=cutoff)
+            .order_by("created_at")
+            .values_list("id", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += NotificationDedupeKey.objects.filter(id__in=ids).delete()[0]
+
+
+def notify_admins(notification_type, message, target=None, dedupe_key="", exclude=None):
+    """
+    Notify every admin of an event with one WebSocket broadcast, so the cost
+    of an escalation does not grow with the admin team.
+    """
+    return notify(
+        User.objects.filter(role="ADMIN").values_list("id", flat=True),
+        notification_type,
+        message,
+        target=target,
+        dedupe_key=dedupe_key,
+        exclude=exclude,
+        group=ADMIN_GROUP,
+    )
+
+
+def create_notifications(notifications, group=None):
+    """
+    Bulk create ``notifications``, bump their recipients' unread counters in
+    the same transaction and push them over the WebSocket after commit.
+    ``notifications`` of one event sent to members of ``group`` are pushed
+    as a single broadcast. Returns the created notifications.
+    """
+    with transaction.atomic():
+        notifications = Notification.objects.bulk_create(
+            notifications, batch_size=500
+        )
+        count_unread(notifications)
+    if group is None:
+        transaction.on_commit(lambda: push_notifications(notifications))
+    else:
+        transaction.on_commit(lambda: broadcast_notifications(group, notifications))
+    return notifications
+
+
+def count_unread(notifications):
+    """
+    Bump the recipients' unread counters for new ``notifications``, leaving
+    out those created at or before a recipient's read watermark.
+
+    The watermarks are read under the counter row locks, which
+    mark_read() also takes. A mark-all that committed while these
+    notifications were being created is therefore seen, and its zeroed
+    counter is not bumped for notifications it already covers.
+    """
+    created = defaultdict(list)
+    for notification in notifications:
+        if not notification.is_read:
+            created[notification.user_id].append(notification.created_at)
+    if not created:
+        return
+    with transaction.atomic():
+        watermarks = read_watermarks(created, lock=True)
+        adjust_unread(
+            {
+                user_id: sum(
+                    watermarks.get(user_id) is None or when > watermarks[user_id]
+                    for when in times
+                )
+                for user_id, times in created.items()
+            }
+        )
+
+
+def adjust_unread(deltas):
+    """Apply ``{user_id: delta}`` to the unread notification counters."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    # A missing counter reads as zero, so only increments need a row
+    UnreadCounter.objects.bulk_create(
+        [
+            UnreadCounter(user_id=user_id)
+            for user_id, delta in deltas.items()
+            if delta > 0
+        ],
+        ignore_conflicts=True,
+    )
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        UnreadCounter.objects.filter(user_id__in=user_ids).update(
+            count=Greatest(F("count") + delta, 0)
+        )
+
+
+def unread_counts(user_ids):
+    """``{user_id: unread notifications}`` for ``user_ids``, from the counters."""
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(
+        UnreadCounter.objects.filter(user_id__in=counts).values_list(
+            "user_id", "count"
+        )
+    )
+    return counts
+
+
+def read_watermarks(user_ids, lock=False):
+    """
+    ``{user_id: read_up_to}`` for those of ``user_ids`` with a watermark.
+    With ``lock``, the counter rows are created if missing and locked until
+    the end of the transaction.
+    """
+    if not lock:
+        return dict(
+            UnreadCounter.objects.filter(
+                user_id__in=user_ids, read_up_to__isnull=False
+            ).values_list("user_id", "read_up_to")
+        )
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    return {
+        user_id: read_up_to
+        for user_id, read_up_to in UnreadCounter.objects.select_for_update()
+        .filter(user_id__in=user_ids)
+        .order_by("user_id")
+        .values_list("user_id", "read_up_to")
+        if read_up_to is not None
+    }
+
+
+def unread_notifications(user):
+    """
+    ``user``'s unread notifications: those not flagged read and created
+    after their read watermark, a range of the ``(user, is_read,
+    created_at)`` index.
+    """
+    queryset = Notification.objects.filter(user=user, is_read=False)
+    read_up_to = read_watermarks([user.pk]).get(user.pk)
+    if read_up_to is not None:
+        queryset = queryset.filter(created_at__gt=read_up_to)
+    return queryset
+
+
+def is_unread(notification):
+    if notification.is_read:
+        return False
+    read_up_to = read_watermarks([notification.user_id]).get(notification.user_id)
+    return read_up_to is None or notification.created_at > read_up_to
+
+
+def mark_read(user, notification_ids=None):
+    """
+    Mark ``user``'s notifications (all of them, or those in
+    ``notification_ids``) as read and push the new unread count after
+    commit. Returns the number of notifications that became read.
+
+    Marking all of them moves the user's read watermark to now and zeroes
+    their counter, a single-row write however long the backlog. Marking
+    some flags just those rows, among the ones above the watermark.
+    """
+    with transaction.atomic():
+        if notification_ids is None:
+            counter, _ = UnreadCounter.objects.select_for_update().get_or_create(
+                user=user
+            )
+            updated = counter.count
+            counter.count = 0
+            counter.read_up_to = timezone.now()
+            counter.save(update_fields=["count", "read_up_to"])
+        else:
+            updated = (
+                unread_notifications(user)
+                .filter(id__in=notification_ids)
+                .update(is_read=True)
+            )
+            adjust_unread({user.pk: -updated})
+    if updated:
+        transaction.on_commit(lambda: push_unread_counts([user.pk]))
+    return updated
+
+
+def reconcile_unread_counts():
+    """
+    Recompute every unread counter from the notifications table, to repair
+    counters after writes that bypass notifications.services. Returns the
+    number of corrected counters.
+    """
+    with transaction.atomic():
+        counts = dict(
+            Notification.objects.filter(is_read=False)
+            .filter(
+                Q(user__unread_counter__read_up_to__isnull=True)
+                | Q(created_at__gt=F("user__unread_counter__read_up_to"))
+            )
+            .order_by()
+            .values_list("user")
+            .annotate(count=Count("id"))
+        )
+        stored = dict(
+            UnreadCounter.objects.select_for_update().values_list("user_id", "count")
+        )
+        deltas = {
+            user_id: counts.get(user_id, 0) - stored.get(user_id, 0)
+            for user_id in counts.keys() | stored.keys()
+        }
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        adjust_unread(deltas)
+    return len(deltas)
+
+
+def push_unread_counts(user_ids):
+    """Push the current unread count of each of ``user_ids`` over the WebSocket."""
+    try:
+        channel_layer = get_channel_layer()
+        for user_id, count in unread_counts(user_ids).items():
+            async_to_sync(channel_layer.group_send)(
+                f"notifications_{user_id}",
+                {"type": "unread_count_message", "count": count},
+            )
+    except Exception as e:
+        print(f"Error sending unread count via WebSocket: {str(e)}")
+
+
+def push_notifications(notifications, with_counts=True):
+    """
+    Push bulk-created notifications over the WebSocket.
+
+    bulk_create skips the post_save handler, so instead of one message per
+    row each recipient gets a single message with their newest notification
+    and, unless ``with_counts`` is false, a single unread count update.
+    """
+    latest = {}
+    for notification in notifications:
+        current = latest.get(notification.user_id)
+        if current is None or notification.created_at >= current.created_at:
+            latest[notification.user_id] = notification
+
+    if not latest:
+        return
+
+    counts = unread_counts(latest) if with_counts else {}
+
+    try:
+        channel_layer = get_channel_layer()
+        for user_id, notification in latest.items():
+            notification_group = f"notifications_{user_id}"
+            async_to_sync(channel_layer.group_send)(
+                notification_group,
+                {
+                    "type": "notification_message",
+                    "notification": NotificationSerializer(notification).data,
+                },
+            )
+            if with_counts:
+                async_to_sync(channel_layer.group_send)(
+                    notification_group,
+                    {
+                        "type": "unread_count_message",
+                        "count": counts[user_id],
+                    },
+                )
+    except Exception as e:
+        print(f"Error sending notification via WebSocket: {str(e)}")
+
+
+def broadcast_notifications(group, notifications):
+    """
+    Push the notifications of one event, one row per member of ``group``, as
+    a single group message. The message carries the first row and maps each
+    recipient to the id of their own row; consumers of other members ignore
+    it and each consumer reads its own unread count.
+    """
+    if not notifications:
+        return
+    try:
+        channel_layer = get_channel_layer()
+        async_to_sync(channel_layer.group_send)(
+            group,
+            {
+                "type": "broadcast_notification_message",
+                "notification": NotificationSerializer(notifications[0]).data,
+                # String keys: the Redis channel layer's msgpack decoder
+                # rejects integer map keys
+                "ids": {str(n.user_id): n.id for n in notifications},
+            },
+        )
+    except Exception as e:
+        print(f"Error broadcasting notification via WebSocket: {str(e)}")
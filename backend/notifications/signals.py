@@ -1,90 +1,59 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 from .models import Notification
-from .serializers import NotificationSerializer
+from .services import adjust_unread, count_unread, is_unread, notify
 from issues.models import Comment, IssueStatus
-from django.contrib.contenttypes.models import ContentType
-
-
-@receiver(post_save, sender=Notification)
-def notification_created(sender, instance, created, **kwargs):
-    """
-    Send notification to user via WebSocket when a new notification is created.
-    """
-    if created:
-        try:
-            channel_layer = get_channel_layer()
-            notification_group = f"notifications_{instance.user.id}"
-
-            # Serialize notification
-            serializer = NotificationSerializer(instance)
-
-            # Send notification to user's notification group
-            async_to_sync(channel_layer.group_send)(
-                notification_group,
-                {"type": "notification_message", "notification": serializer.data},
-            )
-
-            # Also send updated unread count
-            unread_count = Notification.objects.filter(
-                user=instance.user, read=False
-            ).count()
-            async_to_sync(channel_layer.group_send)(
-                notification_group,
-                {"type": "unread_count_message", "count": unread_count},
-            )
-        except Exception as e:
-            print(f"Error sending notification via WebSocket: {str(e)}")
 
 
 @receiver(post_save, sender=Comment)
 def comment_added_notification(sender, instance, created, **kwargs):
     """
-    Create notification when a comment is added to an issue.
+    Notify the issue's submitter and assignee when a comment is added.
     """
     if created:
         issue = instance.issue
-
-        # Notify the issue submitter if they didn't add the comment
-        if issue.submitted_by != instance.user:
-            content_type = ContentType.objects.get_for_model(issue)
-            Notification.objects.create(
-                user=issue.submitted_by,
-                content_type=content_type,
-                object_id=issue.id,
-                message=f"New comment on issue: {issue.title}",
-                notification_type="COMMENT_ADDED",
-            )
-
-        # Notify the assigned user if they didn't add the comment
-        if issue.assigned_to and issue.assigned_to != instance.user:
-            content_type = ContentType.objects.get_for_model(issue)
-            Notification.objects.create(
-                user=issue.assigned_to,
-                content_type=content_type,
-                object_id=issue.id,
-                message=f"New comment on issue: {issue.title}",
-                notification_type="COMMENT_ADDED",
-            )
+        notify(
+            [issue.submitted_by_id, issue.assigned_to_id],
+            "COMMENT_ADDED",
+            f"New comment on issue: {issue.title}",
+            target=issue,
+            dedupe_key=f"comment:{instance.pk}",
+            exclude=instance.user_id,
+        )
 
 
 @receiver(post_save, sender=IssueStatus)
 def status_updated_notification(sender, instance, created, **kwargs):
     """
-    Create notification when an issue status is updated.
+    Notify the issue submitter when an issue status is updated.
     """
     if created:
         issue = instance.issue
+        notify(
+            [issue.submitted_by_id],
+            "STATUS_UPDATED",
+            f"Status updated to {instance.get_status_display()} for your issue: "
+            f"{issue.title}",
+            target=issue,
+            dedupe_key=f"status:{instance.pk}",
+            exclude=instance.updated_by_id,
+        )
+
+
+@receiver(post_save, sender=Notification)
+def notification_created_unread_handler(sender, instance, created, **kwargs):
+    """
+    Count a notification saved on its own as unread; bulk writers go through
+    services.create_notifications instead.
+    """
+    if created:
+        count_unread([instance])
+
 
-        # Notify the issue submitter if they didn't update the status
-        if issue.submitted_by != instance.updated_by:
-            content_type = ContentType.objects.get_for_model(issue)
-            Notification.objects.create(
-                user=issue.submitted_by,
-                content_type=content_type,
-                object_id=issue.id,
-                message=f"Status updated to {instance.get_status_display()} for your issue: {issue.title}",
-                notification_type="STATUS_UPDATED",
-            )
+@receiver(post_delete, sender=Notification)
+def notification_deleted_unread_handler(sender, instance, **kwargs):
+    """
+    Uncount an unread notification when it is deleted.
+    """
+    if is_unread(instance):
+        adjust_unread({instance.user_id: -1})
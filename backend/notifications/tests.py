@@ -1,3 +1,450 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from issues.models import Comment, Issue
+from .consumers import NotificationConsumer
+from .models import Notification, NotificationDedupeKey, UnreadCounter
+from .services import (
+    ADMIN_GROUP,
+    count_unread,
+    create_notifications,
+    mark_read,
+    notify,
+    prune_dedupe_keys,
+    reconcile_unread_counts,
+    unread_counts,
+)
+
+User = get_user_model()
+
+
+class NotificationPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="student@example.com")
+        other = User.objects.create_user(email="other@example.com")
+        Notification.objects.bulk_create(
+            [Notification(user=cls.user, message=f"m{i}") for i in range(17)]
+            + [Notification(user=other, message="not yours")]
+        )
+        # Equal timestamps, so pages must break ties on id
+        Notification.objects.filter(user=cls.user).update(created_at=timezone.now())
+
+    def test_pages_have_no_gaps_or_duplicates(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        ids, url = [], "/api/notifications/?page_size=5"
+        while url:
+            response = client.get(url)
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(
+            ids,
+            list(
+                Notification.objects.filter(user=self.user)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+            ),
+        )
+
+
+class NotificationPipelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        cls.issue = Issue.objects.create(
+            title="Watched",
+            description="Notified",
+            submitted_by=cls.student,
+            assigned_to=cls.faculty,
+        )
+
+    def received(self, user):
+        return list(
+            Notification.objects.filter(user=user).values_list(
+                "notification_type", flat=True
+            )
+        )
+
+    def test_comment_notifies_everyone_but_its_author(self):
+        client = APIClient()
+        client.force_authenticate(self.faculty)
+        client.post(
+            f"/api/issues/{self.issue.id}/comments/",
+            {"content": "Looking into it", "issue": self.issue.id},
+            format="json",
+        )
+        self.assertEqual(self.received(self.student), ["COMMENT_ADDED"])
+        self.assertEqual(self.received(self.faculty), [])
+
+    def test_status_change_reported_twice_is_notified_once(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post(
+            f"/api/issues/{self.issue.id}/assign/",
+            {"faculty_id": self.faculty.id},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        # The view and the IssueStatus handler both report the status change
+        self.assertEqual(self.received(self.student), ["STATUS_UPDATED"])
+        self.assertEqual(self.received(self.faculty), ["ISSUE_ASSIGNED"])
+
+    def test_dedupe_key(self):
+        first = notify(
+            [self.student, self.student.id, None],
+            "STATUS_UPDATED",
+            "Updated",
+            target=self.issue,
+            dedupe_key="status:1",
+        )
+        again = notify(
+            [self.student, self.faculty],
+            "STATUS_UPDATED",
+            "Updated",
+            target=self.issue,
+            dedupe_key="status:1",
+        )
+        self.assertEqual(len(first), 1)
+        self.assertEqual([n.user for n in again], [self.faculty])
+        self.assertEqual(self.received(self.student), ["STATUS_UPDATED"])
+
+    @override_settings(NOTIFICATION_DEDUPE_SECONDS=3600)
+    def test_dedupe_keys_are_pruned_after_they_expire(self):
+        for i in range(20):
+            notify(
+                [self.student, self.faculty],
+                "STATUS_UPDATED",
+                "Updated",
+                target=self.issue,
+                dedupe_key=f"status:{i}",
+            )
+        NotificationDedupeKey.objects.update(
+            created_at=timezone.now() - timedelta(hours=2)
+        )
+        notify(
+            [self.student],
+            "STATUS_UPDATED",
+            "Updated",
+            target=self.issue,
+            dedupe_key="status:20",
+        )
+
+        self.assertEqual(prune_dedupe_keys(batch_size=7), 40)
+        # Only the keys of events that may still be reported again are kept
+        self.assertEqual(
+            list(NotificationDedupeKey.objects.values_list("key", flat=True)),
+            ["status:20"],
+        )
+        again = notify(
+            [self.student],
+            "STATUS_UPDATED",
+            "Updated",
+            target=self.issue,
+            dedupe_key="status:20",
+        )
+        self.assertEqual(again, [])
+
+
+class UnreadCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="student@example.com")
+        cls.other = User.objects.create_user(email="other@example.com")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertUnread(self, expected):
+        self.assertEqual(
+            Notification.objects.filter(user=self.user, is_read=False).count(),
+            expected,
+        )
+        response = self.client.get("/api/notifications/unread-count/")
+        self.assertEqual(response.data, {"count": expected})
+
+    def test_counter_follows_writes(self):
+        self.assertUnread(0)
+        single = Notification.objects.create(user=self.user, message="Saved")
+        create_notifications(
+            [Notification(user=self.user, message=f"Bulk {i}") for i in range(3)]
+            + [Notification(user=self.other, message="Not yours")]
+            + [Notification(user=self.user, message="Read", is_read=True)]
+        )
+        self.assertUnread(4)
+
+        response = self.client.post(f"/api/notifications/{single.id}/read/")
+        self.assertEqual(response.status_code, 200)
+        self.assertUnread(3)
+        # Marking it again does not count twice
+        self.client.post(f"/api/notifications/{single.id}/read/")
+        self.assertUnread(3)
+
+        # Deleting a read notification leaves the counter alone
+        Notification.objects.get(pk=single.pk).delete()
+        self.assertUnread(3)
+        Notification.objects.filter(user=self.user, message="Bulk 0").delete()
+        self.assertUnread(2)
+        Notification.objects.filter(user=self.user).delete()
+        self.assertUnread(0)
+
+    def test_reconcile_repairs_drifted_counters(self):
+        create_notifications(
+            [Notification(user=self.user, message=f"m{i}") for i in range(2)]
+        )
+        UnreadCounter.objects.filter(user=self.user).update(count=50)
+        UnreadCounter.objects.create(user=self.other, count=3)
+
+        self.assertEqual(reconcile_unread_counts(), 2)
+        self.assertUnread(2)
+        self.assertEqual(UnreadCounter.objects.get(user=self.other).count, 0)
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+)
+class AdminBroadcastTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admins = [
+            User.objects.create_user(email=f"admin{i}@example.com", role="ADMIN")
+            for i in range(5)
+        ]
+        student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        cls.issue = Issue.objects.create(
+            title="Stuck",
+            description="Escalated",
+            submitted_by=student,
+            assigned_to=cls.faculty,
+            current_status="ASSIGNED",
+        )
+
+    def listen(self, *groups):
+        layer = get_channel_layer()
+        channel = async_to_sync(layer.new_channel)()
+        for group in groups:
+            async_to_sync(layer.group_add)(group, channel)
+        return channel
+
+    def received(self, channel):
+        layer = get_channel_layer()
+
+        async def drain():
+            messages = []
+            while True:
+                try:
+                    messages.append(
+                        await asyncio.wait_for(layer.receive(channel), 0.1)
+                    )
+                except asyncio.TimeoutError:
+                    return messages
+
+        return async_to_sync(drain)()
+
+    def test_escalation_is_one_group_message(self):
+        admin = self.admins[0]
+        channel = self.listen(ADMIN_GROUP, f"notifications_{admin.id}")
+        client = APIClient()
+        client.force_authenticate(self.faculty)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                f"/api/issues/{self.issue.id}/escalate/",
+                {"reason": "Needs the registrar"},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        rows = dict(
+            Notification.objects.filter(
+                notification_type="ISSUE_ESCALATED"
+            ).values_list("user_id", "id")
+        )
+        self.assertEqual(set(rows), {admin.id for admin in self.admins})
+        messages = self.received(channel)
+        self.assertEqual(
+            [message["type"] for message in messages],
+            ["broadcast_notification_message"],
+        )
+        self.assertEqual(
+            messages[0]["ids"], {str(user_id): pk for user_id, pk in rows.items()}
+        )
+
+
+class NotificationConsumerTests(TransactionTestCase):
+    """Not wrapped in a transaction: database_sync_to_async closes connections."""
+
+    def test_sends_only_its_users_copy_of_a_broadcast(self):
+        admin, other = (
+            User.objects.create_user(email=f"admin{i}@example.com", role="ADMIN")
+            for i in range(2)
+        )
+        notification = Notification.objects.create(user=admin, message="Escalated")
+        event = {
+            "type": "broadcast_notification_message",
+            "notification": {"id": 0, "user": 0, "message": "Escalated"},
+            "ids": {str(admin.id): notification.id},
+        }
+        consumer = NotificationConsumer()
+        sent = []
+
+        async def send(text_data):
+            sent.append(json.loads(text_data))
+
+        consumer.send = send
+        consumer.user = other
+        async_to_sync(consumer.broadcast_notification_message)(event)
+        self.assertEqual(sent, [])
+
+        consumer.user = admin
+        async_to_sync(consumer.broadcast_notification_message)(event)
+        self.assertEqual(
+            sent[0]["notification"],
+            {"id": notification.id, "user": admin.id, "message": "Escalated"},
+        )
+        self.assertEqual(sent[1], {"type": "unread_count", "count": 1})
+
+
+class CoalescingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user(email="student@example.com")
+        cls.faculty = User.objects.create_user(
+            email="faculty@example.com", role="FACULTY"
+        )
+        cls.issue = Issue.objects.create(
+            title="Chatty",
+            description="Coalesced",
+            submitted_by=cls.student,
+            assigned_to=cls.faculty,
+            priority="LOW",
+        )
+
+    def comment(self, issue=None):
+        return Comment.objects.create(
+            issue=issue or self.issue, user=self.faculty, content="Update"
+        )
+
+    def received(self):
+        return list(
+            Notification.objects.filter(user=self.student)
+            .order_by("created_at", "id")
+            .values_list("event_count", "message")
+        )
+
+    def test_comments_merge_into_one_unread_notification(self):
+        for _ in range(3):
+            self.comment()
+        self.assertEqual(self.received(), [(3, "3 new comments on issue: Chatty")])
+        self.assertEqual(unread_counts([self.student.id]), {self.student.id: 1})
+
+    def test_merged_events_keep_their_dedupe_keys(self):
+        comments = [self.comment() for _ in range(3)]
+        for comment in comments:
+            sent = notify(
+                [self.student],
+                "COMMENT_ADDED",
+                "Again",
+                target=self.issue,
+                dedupe_key=f"comment:{comment.pk}",
+            )
+            self.assertEqual(sent, [])
+        self.assertEqual(self.received(), [(3, "3 new comments on issue: Chatty")])
+
+    def test_read_notifications_are_not_merged_into(self):
+        self.comment()
+        mark_read(self.student)
+        self.comment()
+        self.assertEqual([count for count, _ in self.received()], [1, 1])
+        self.assertEqual(unread_counts([self.student.id]), {self.student.id: 1})
+
+    def test_urgent_issues_are_not_merged(self):
+        urgent = Issue.objects.create(
+            title="Urgent",
+            description="Coalesced",
+            submitted_by=self.student,
+            assigned_to=self.faculty,
+            priority="URGENT",
+        )
+        for _ in range(2):
+            self.comment(urgent)
+        self.assertEqual(len(self.received()), 2)
+
+    @override_settings(NOTIFICATION_COALESCE_SECONDS=0)
+    def test_coalescing_can_be_disabled(self):
+        for _ in range(2):
+            self.comment()
+        self.assertEqual(len(self.received()), 2)
+
+
+class ReadWatermarkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email="student@example.com")
+        create_notifications(
+            [Notification(user=cls.user, message=f"Old {i}") for i in range(5)]
+        )
+        cls.old = Notification.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def unread(self):
+        return unread_counts([self.user.id])[self.user.id]
+
+    def test_mark_all_moves_the_watermark_without_touching_rows(self):
+        response = self.client.post("/api/notifications/mark-all-read/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread(), 0)
+        self.assertFalse(Notification.objects.filter(is_read=True).exists())
+        listed = self.client.get("/api/notifications/").data["results"]
+        self.assertEqual({row["is_read"] for row in listed}, {True})
+
+    def test_notifications_after_the_watermark_are_unread(self):
+        mark_read(self.user)
+        new = Notification.objects.create(user=self.user, message="New")
+        self.assertEqual(self.unread(), 1)
+
+        # Below the watermark: already read, so neither changes the counter
+        self.client.post(f"/api/notifications/{self.old.id}/read/")
+        self.old.delete()
+        self.assertEqual(self.unread(), 1)
+
+        self.client.post(f"/api/notifications/{new.id}/read/")
+        self.assertEqual(self.unread(), 0)
+
+    def test_late_increment_below_the_watermark_is_ignored(self):
+        mark_read(self.user)
+        # Created before the mark-all, but counted after it committed
+        late = Notification(
+            user=self.user,
+            message="Late",
+            created_at=timezone.now() - timedelta(seconds=1),
+        )
+        count_unread([late])
+        self.assertEqual(self.unread(), 0)
+
+    def test_reconcile_counts_only_above_the_watermark(self):
+        mark_read(self.user)
+        Notification.objects.create(user=self.user, message="New")
+        UnreadCounter.objects.filter(user=self.user).update(count=9)
+        reconcile_unread_counts()
+        self.assertEqual(self.unread(), 1)
@@ -5,8 +5,8 @@ from .views import NotificationViewSet, unread_count
 router = DefaultRouter()
 router.register(r"", NotificationViewSet, basename="notifications")
 
+# Before the router, whose detail route would otherwise match "unread-count/"
 urlpatterns = [
-    path("", include(router.urls)),
     path("unread-count/", unread_count, name="unread_count"),
     path(
         "<int:pk>/read/",
@@ -18,4 +18,5 @@ urlpatterns = [
         NotificationViewSet.as_view({"post": "mark_all_as_read"}),
         name="mark_all_as_read",
     ),
+    path("", include(router.urls)),
 ]
@@ -6,13 +6,15 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from .models import Notification
 from .serializers import NotificationSerializer
+from .services import mark_read, read_watermarks, unread_counts
+from utils.pagination import NewestFirstCursorPagination
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def unread_count(request):
     user = request.user
-    count = Notification.objects.filter(user=user, is_read=False).count()
+    count = unread_counts([user.pk])[user.pk]
     return Response({"count": count})
 
 
@@ -23,6 +25,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
 
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = NewestFirstCursorPagination
 
     def get_queryset(self):
         """
@@ -30,14 +33,20 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         return Notification.objects.filter(user=self.request.user)
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        user = self.request.user
+        if user.is_authenticated:
+            context["read_up_to"] = read_watermarks([user.pk]).get(user.pk)
+        return context
+
     @action(detail=True, methods=["post"])
     def mark_as_read(self, request, pk=None):
         """
         Mark a notification as read.
         """
         notification = self.get_object()
-        notification.is_read = True
-        notification.save(update_fields=["is_read"])
+        mark_read(request.user, [notification.pk])
         return Response({"message": "Notification marked as read"})
 
     @action(detail=False, methods=["post"])
@@ -45,9 +54,7 @@ class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
         """
         Mark all notifications as read.
         """
-        Notification.objects.filter(user=request.user, is_read=False).update(
-            is_read=True
-        )
+        mark_read(request.user)
         return Response({"message": "All notifications marked as read"})
 
     @action(detail=False, methods=["get"])
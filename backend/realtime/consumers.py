@@ -6,6 +6,7 @@ from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import TokenError
 from .models import OnlineUser, IssueActivity, TypingStatus
 from issues.models import Issue
+from notifications.services import ADMIN_GROUP, mark_read, unread_counts
 from django.utils import timezone
 from datetime import timedelta
 
@@ -41,6 +42,11 @@ class EnhancedNotificationConsumer(AsyncWebsocketConsumer):
                 self.notification_group, self.channel_name
             )
 
+            # Admins also receive notifications broadcast to all of them
+            if self.user.role == "ADMIN":
+                self.admin_group = ADMIN_GROUP
+                await self.channel_layer.group_add(self.admin_group, self.channel_name)
+
             # Add user to the global group
             self.global_group = "global_notifications"
             await self.channel_layer.group_add(self.global_group, self.channel_name)
@@ -93,6 +99,8 @@ class EnhancedNotificationConsumer(AsyncWebsocketConsumer):
             await self.channel_layer.group_discard(
                 self.notification_group, self.channel_name
             )
+        if hasattr(self, "admin_group"):
+            await self.channel_layer.group_discard(self.admin_group, self.channel_name)
 
         if hasattr(self, "global_group"):
             await self.channel_layer.group_discard(self.global_group, self.channel_name)
@@ -133,6 +141,30 @@ class EnhancedNotificationConsumer(AsyncWebsocketConsumer):
             )
         )
 
+    async def broadcast_notification_message(self, event):
+        # Send this user's copy of a notification broadcast to their group
+        notification_id = event["ids"].get(str(self.user.id))
+        if notification_id is None:
+            return
+        notification = dict(
+            event["notification"], id=notification_id, user=self.user.id
+        )
+        await self.send(
+            text_data=json.dumps(
+                {"type": "notification_message", "notification": notification}
+            )
+        )
+        unread_count = await self.get_unread_count()
+        await self.send(
+            text_data=json.dumps({"type": "unread_count", "count": unread_count})
+        )
+
+    async def unread_count_message(self, event):
+        # Send unread count to WebSocket
+        await self.send(
+            text_data=json.dumps({"type": "unread_count", "count": event["count"]})
+        )
+
     async def user_status(self, event):
         # Send user status update to WebSocket
         await self.send(
@@ -211,22 +243,16 @@ class EnhancedNotificationConsumer(AsyncWebsocketConsumer):
             return None
 
     @database_sync_to_async
-    def mark_as_read(self, notification_id):
-        from notifications.models import Notification
+    def get_unread_count(self):
+        return unread_counts([self.user.id])[self.user.id]
 
-        try:
-            notification = Notification.objects.get(id=notification_id, user=self.user)
-            notification.read = True
-            notification.save()
-            return True
-        except Notification.DoesNotExist:
-            return False
+    @database_sync_to_async
+    def mark_as_read(self, notification_id):
+        return mark_read(self.user, [notification_id]) > 0
 
     @database_sync_to_async
     def mark_all_as_read(self):
-        from notifications.models import Notification
-
-        Notification.objects.filter(user=self.user, read=False).update(read=True)
+        mark_read(self.user)
         return True
 
 
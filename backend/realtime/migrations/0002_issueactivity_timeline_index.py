@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-18 10:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0016_timeline_indexes'),
+        ('realtime', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issueactivity',
+            index=models.Index(fields=['issue', 'timestamp', 'id'], name='realtime_is_issue_i_b3af98_idx'),
+        ),
+    ]
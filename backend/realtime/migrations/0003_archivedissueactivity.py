@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-18 10:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0018_role_scoped_keyset_indexes'),
+        ('realtime', '0002_issueactivity_timeline_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedIssueActivity',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('activity_type', models.CharField(max_length=50)),
+                ('timestamp', models.DateTimeField()),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('issue', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='realtime_activities', to='issues.archivedissue')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Archived Issue Activities',
+                'ordering': ['-timestamp'],
+            },
+        ),
+    ]
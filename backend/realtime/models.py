@@ -1,6 +1,6 @@
 from django.db import models
 from django.conf import settings
-from issues.models import Issue
+from issues.models import ArchivedIssue, Issue
 
 
 class OnlineUser(models.Model):
@@ -30,6 +30,31 @@ class IssueActivity(models.Model):
 
     class Meta:
         ordering = ["-timestamp"]
+        indexes = [
+            models.Index(fields=["issue", "timestamp", "id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.issue.title} - {self.activity_type} by {self.user.email}"
+
+
+class ArchivedIssueActivity(models.Model):
+    """Activity on an archived issue, moved here by issues.archiving."""
+
+    id = models.BigIntegerField(primary_key=True)
+    issue = models.ForeignKey(
+        ArchivedIssue, on_delete=models.CASCADE, related_name="realtime_activities"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+"
+    )
+    activity_type = models.CharField(max_length=50)
+    timestamp = models.DateTimeField()
+    data = models.JSONField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-timestamp"]
+        verbose_name_plural = "Archived Issue Activities"
 
     def __str__(self):
         return f"{self.issue.title} - {self.activity_type} by {self.user.email}"
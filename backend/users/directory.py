@@ -0,0 +1,88 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.utils.text import slugify
+
+from .models import User, build_directory_key
+
+# The directory is kept in the configured cache, so with a shared backend a
+# save in any worker invalidates it everywhere; this bounds staleness when a
+# change bypasses User.save() (queryset updates).
+DIRECTORY_CACHE_KEY = "users:faculty_directory"
+DIRECTORY_CACHE_TTL = 300
+# Minimum trigram similarity of a misspelt name, and how far ahead of the
+# runner-up the best match must be to be taken
+TRIGRAM_THRESHOLD = 0.5
+TRIGRAM_MARGIN = 0.1
+
+
+class AmbiguousFacultyName(Exception):
+    """A faculty name matches several faculty members equally well."""
+
+
+def invalidate_faculty_directory():
+    """Drop the cached faculty directory."""
+    cache.delete(DIRECTORY_CACHE_KEY)
+
+
+def get_faculty_directory():
+    """
+    Return the directory of active faculty as a list of dicts, loading it at
+    most once per cache lifetime.
+    """
+    entries = cache.get(DIRECTORY_CACHE_KEY)
+    if entries is None:
+        entries = list(
+            User.objects.filter(role="FACULTY", is_active=True)
+            .order_by("last_name", "first_name")
+            .values("id", "first_name", "last_name", "department", "directory_key")
+        )
+        cache.set(DIRECTORY_CACHE_KEY, entries, DIRECTORY_CACHE_TTL)
+    return entries
+
+
+def find_faculty(name, department=None):
+    """
+    Resolve an active faculty member from a display name ("Maria Namusoke")
+    or a slug-style id ("maria-namusoke-cs"). Only members of ``department``
+    are considered when it is given.
+
+    Lookups go through the indexed ``directory_key``: an exact key match,
+    then a prefix match on the name part, then a trigram similarity match
+    for misspellings. Returns None when nothing is close enough, and raises
+    AmbiguousFacultyName when the name does not single out one member.
+    """
+    faculty = User.objects.filter(role="FACULTY", is_active=True)
+    if department:
+        faculty = faculty.filter(department__iexact=department)
+    name_key = slugify(name)
+    if not name_key:
+        return None
+
+    keys = [name_key]
+    if department:
+        keys.insert(0, build_directory_key(name, "", department))
+    for key in keys:
+        matches = list(faculty.filter(directory_key=key)[:2])
+        if len(matches) > 1:
+            raise AmbiguousFacultyName(name)
+        if matches:
+            return matches[0]
+
+    matches = list(faculty.filter(directory_key__startswith=f"{name_key}-")[:2])
+    if len(matches) > 1:
+        raise AmbiguousFacultyName(name)
+    if matches:
+        return matches[0]
+
+    search_key = build_directory_key(name, "", department or "")
+    matches = list(
+        faculty.filter(directory_key__trigram_similar=search_key)
+        .annotate(similarity=TrigramSimilarity("directory_key", search_key))
+        .filter(similarity__gte=TRIGRAM_THRESHOLD)
+        .order_by("-similarity", "id")[:2]
+    )
+    if len(matches) > 1 and (
+        matches[0].similarity - matches[1].similarity < TRIGRAM_MARGIN
+    ):
+        raise AmbiguousFacultyName(name)
+    return matches[0] if matches else None
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 10:02
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def backfill_directory_keys(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    users = list(User.objects.only("first_name", "last_name", "department"))
+    for user in users:
+        parts = (user.first_name, user.last_name, user.department)
+        user.directory_key = slugify(" ".join(part for part in parts if part))[:255]
+    User.objects.bulk_update(users, ["directory_key"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0002_alter_user_department_alter_user_role'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='user',
+            name='directory_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_directory_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='user',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['directory_key'], name='user_directory_key_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
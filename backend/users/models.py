@@ -1,7 +1,17 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
+DIRECTORY_KEY_FIELDS = {"first_name", "last_name", "department"}
+
+
+def build_directory_key(first_name, last_name, department):
+    """Normalized faculty lookup key, e.g. "maria-namusoke-cs"."""
+    parts = (first_name, last_name, department)
+    return slugify(" ".join(part for part in parts if part))[:255]
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -50,11 +60,33 @@ class User(AbstractUser):
     email = models.EmailField(_("email address"), unique=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default="STUDENT")
     department = models.CharField(max_length=100, blank=True, default="General")
+    # Slug of name and department used by the faculty directory lookups
+    directory_key = models.CharField(
+        max_length=255, blank=True, db_index=True, editable=False
+    )
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            GinIndex(
+                fields=["directory_key"],
+                name="user_directory_key_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ]
+
     def __str__(self):
         return self.email
+
+    def save(self, *args, **kwargs):
+        self.directory_key = build_directory_key(
+            self.first_name, self.last_name, self.department
+        )
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and DIRECTORY_KEY_FIELDS & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "directory_key"}
+        super().save(*args, **kwargs)
@@ -0,0 +1,25 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import User, DIRECTORY_KEY_FIELDS
+from .directory import invalidate_faculty_directory
+
+DIRECTORY_FIELDS = DIRECTORY_KEY_FIELDS | {"role", "is_active"}
+
+
+@receiver(post_save, sender=User)
+def user_saved_handler(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalidate the faculty directory cache when directory data may have changed.
+    """
+    if update_fields and not DIRECTORY_FIELDS & set(update_fields):
+        return
+    invalidate_faculty_directory()
+
+
+@receiver(post_delete, sender=User)
+def user_deleted_handler(sender, instance, **kwargs):
+    """
+    Invalidate the faculty directory cache when a user is removed.
+    """
+    invalidate_faculty_directory()
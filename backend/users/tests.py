@@ -1,3 +1,95 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from issues.models import Issue
+from .directory import AmbiguousFacultyName, find_faculty, get_faculty_directory
+from .models import User
+
+
+class FacultyDirectoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.maria = User.objects.create_user(
+            email="maria@example.com",
+            role="FACULTY",
+            first_name="Maria",
+            last_name="Namusoke",
+            department="CS",
+        )
+        cls.john = User.objects.create_user(
+            email="john@example.com",
+            role="FACULTY",
+            first_name="John",
+            last_name="Okello",
+            department="Math",
+        )
+        User.objects.create_user(
+            email="john.okello@example.com",
+            role="FACULTY",
+            first_name="John",
+            last_name="Okello",
+            department="Physics",
+        )
+
+    def test_exact_match(self):
+        self.assertEqual(find_faculty("Maria Namusoke", "CS"), self.maria)
+        self.assertEqual(find_faculty("maria-namusoke-cs"), self.maria)
+
+    def test_prefix_match(self):
+        self.assertEqual(find_faculty("Maria Namusoke"), self.maria)
+        self.assertEqual(find_faculty("Maria"), self.maria)
+
+    def test_misspelt_name(self):
+        self.assertEqual(find_faculty("Maria Namusokee", "CS"), self.maria)
+
+    def test_department_mismatch(self):
+        self.assertIsNone(find_faculty("Maria Namusoke", "Math"))
+        self.assertIsNone(find_faculty("Maria Namusoke", "Physics"))
+
+    def test_ambiguous_name(self):
+        with self.assertRaises(AmbiguousFacultyName):
+            find_faculty("John Okello")
+        self.assertEqual(find_faculty("John Okello", "Math"), self.john)
+
+    def test_no_match(self):
+        self.assertIsNone(find_faculty("Peter Mugisha"))
+        self.assertIsNone(find_faculty("John Okello", "CS"))
+        self.assertIsNone(find_faculty(""))
+
+    def test_inactive_faculty_are_not_found(self):
+        self.maria.is_active = False
+        self.maria.save(update_fields=["is_active"])
+        self.assertIsNone(find_faculty("Maria Namusoke", "CS"))
+
+    def test_directory_follows_user_saves(self):
+        self.assertEqual(len(get_faculty_directory()), 3)
+        self.maria.last_name = "Nakato"
+        self.maria.save(update_fields=["last_name"])
+        self.john.is_active = False
+        self.john.save(update_fields=["is_active"])
+        self.assertEqual(
+            [entry["department"] for entry in get_faculty_directory()],
+            ["CS", "Physics"],
+        )
+
+    def test_assign_rejects_unclear_names(self):
+        admin = User.objects.create_user(email="admin@example.com", role="ADMIN")
+        issue = Issue.objects.create(
+            title="Grades", description="Missing", submitted_by=admin
+        )
+        client = APIClient()
+        client.force_authenticate(admin)
+        url = f"/api/issues/{issue.id}/assign/"
+
+        response = client.post(
+            url, {"faculty_name": "John Okello"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        response = client.post(
+            url, {"faculty_name": "Maria Namusoke", "department": "Math"}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
+        response = client.post(url, {"faculty_id": "maria-namusoke-cs"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        issue.refresh_from_db()
+        self.assertEqual(issue.assigned_to, self.maria)
@@ -6,6 +6,7 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from .models import User
 from django.http import JsonResponse
 from django.contrib.auth import get_user_model
+from .directory import get_faculty_directory
 from .serializers import (
     UserSerializer,
     UserRegistrationSerializer,
@@ -17,10 +18,15 @@ User = get_user_model()
 
 def get_faculty_list(request):
     try:
-        faculty = User.objects.filter(role="FACULTY").values(
-            "first_name", "last_name", "department"
-        )
-        return JsonResponse(list(faculty), safe=False)
+        faculty = [
+            {
+                "first_name": entry["first_name"],
+                "last_name": entry["last_name"],
+                "department": entry["department"],
+            }
+            for entry in get_faculty_directory()
+        ]
+        return JsonResponse(faculty, safe=False)
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
 
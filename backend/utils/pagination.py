@@ -0,0 +1,53 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination that seeks on the ordering columns instead of using
+    OFFSET, so deep pages cost the same as the first one and no COUNT(*) is
+    issued.
+
+    Clients that still send ``?page=`` (the paged dashboard tables) fall back
+    to page number pagination with a total count.
+    """
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    page_number_query_param = "page"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_number_pagination = None
+        if self.page_number_query_param in request.query_params:
+            self.page_number_pagination = PageNumberPagination()
+            return self.page_number_pagination.paginate_queryset(
+                queryset, request, view
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.page_number_pagination is not None:
+            return self.page_number_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.page_number_pagination is not None:
+            return self.page_number_pagination.to_html()
+        return super().to_html()
+
+
+class NewestFirstCursorPagination(KeysetPagination):
+    """Keyset pagination over ``(created_at, id)``, newest first."""
+
+    ordering = ("-created_at", "-id")
+
+
+class OldestFirstCursorPagination(KeysetPagination):
+    """Keyset pagination over ``(created_at, id)``, oldest first."""
+
+    ordering = ("created_at", "id")
+
+
+class TimestampCursorPagination(KeysetPagination):
+    """Keyset pagination over ``(timestamp, id)``, newest first."""
+
+    ordering = ("-timestamp", "-id")